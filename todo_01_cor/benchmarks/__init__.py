@@ -0,0 +1 @@
+"""Synthetic-load benchmarks for the todo-weather-cli store and selector."""
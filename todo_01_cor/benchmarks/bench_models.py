@@ -0,0 +1,115 @@
+"""Time and memory per N tasks for the Task model: slotted + hand-written vs asdict-based.
+
+    python -m benchmarks.bench_models --count 100000 --out models.json
+
+The "before" variant mirrors the original models (plain dataclasses serialised with
+dataclasses.asdict, which deep-copies and then re-converts nested objects).
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.synthetic import make_task
+from src.models.task import Task
+
+
+@dataclass
+class _CandidateBefore:
+    date: str
+    precipitation_probability: Optional[float] = None
+    temperature: Optional[float] = None
+    reason: Optional[str] = None
+
+
+@dataclass
+class _LocationBefore:
+    name: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    timezone: Optional[str] = None
+
+
+@dataclass
+class _TaskBefore:
+    id: int
+    title: str
+    completed: bool = False
+    priority: str = "中"
+    location: Optional[_LocationBefore] = None
+    due_date: Optional[str] = None
+    candidate_dates: List[_CandidateBefore] = field(default_factory=list)
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    updated_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        if self.location:
+            d["location"] = asdict(self.location)
+        d["candidate_dates"] = [asdict(c) for c in self.candidate_dates]
+        return d
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> "_TaskBefore":
+        loc = _LocationBefore(**d["location"]) if d.get("location") else None
+        cands = [_CandidateBefore(**c) for c in d.get("candidate_dates", [])]
+        return _TaskBefore(
+            id=d["id"], title=d.get("title", ""), completed=d.get("completed", False),
+            priority=d.get("priority", "中"), location=loc, due_date=d.get("due_date"),
+            candidate_dates=cands,
+            created_at=d.get("created_at", datetime.utcnow().isoformat()),
+            updated_at=d.get("updated_at", datetime.utcnow().isoformat()),
+        )
+
+
+def _measure(from_dict: Callable, dicts: List[Dict]) -> Dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    objs = [from_dict(d) for d in dicts]
+    load_s = time.perf_counter() - t0
+    mem, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    t0 = time.perf_counter()
+    for o in objs:
+        o.to_dict()
+    dump_s = time.perf_counter() - t0
+    return {
+        "from_dict_ms": round(load_s * 1000, 2),
+        "to_dict_ms": round(dump_s * 1000, 2),
+        "objects_mb": round(mem / (1024 * 1024), 2),
+    }
+
+
+def run(count: int) -> Dict:
+    rng = random.Random(0)
+    today = date.today()
+    dicts = [make_task(i, rng, today) for i in range(1, count + 1)]
+    return {
+        "meta": {"count": count, "python": sys.version.split()[0]},
+        "before": _measure(_TaskBefore.from_dict, dicts),
+        "after": _measure(Task.from_dict, dicts),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="bench_models")
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--out")
+    args = parser.parse_args(argv)
+    text = json.dumps(run(args.count), indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Timed scenarios over synthetic stores; prints/writes machine-readable JSON.
+
+    python -m benchmarks.bench_store --sizes 1000 10000 100000 --out bench.json
+    python -m benchmarks.bench_store --sizes 1000 --writers 4 --writes 25
+
+--writers N also measures add throughput with N processes writing one store.
+
+Network services are replaced by local stubs, so only store, selector and
+rendering code is measured.
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.synthetic import make_store, make_task
+from src.scheduler import candidate_selector
+from src.storage.store import Store
+from src.utils.calendar_renderer import render_range
+
+SCENARIOS = ["add", "update", "remove", "show", "list", "calendar", "select"]
+ROOT = Path(__file__).resolve().parents[1]
+
+# one writer process of the concurrency run: next_id() outside the write lock, like cmd_add
+WRITER = """
+import sys
+from src.storage.store import Store
+store = Store(sys.argv[1])
+for i in range(int(sys.argv[3])):
+    store.add_task({"id": store.next_id(), "title": f"{sys.argv[2]}-{i}"})
+"""
+
+
+def stub_weather(lat, lon, start, end, timezone="UTC"):
+    """Deterministic offline forecast for every day in [start, end]."""
+    out = {}
+    d = start
+    while d <= end:
+        out[d.isoformat()] = {"precipitation_probability": (d.toordinal() * 37) % 100, "temperature": 15.0}
+        d += timedelta(days=1)
+    return out
+
+
+def _time(fn: Callable[[], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return samples
+
+
+def run_size(n: int, repeat: int, workdir: Path, codec: Optional[str] = None, scenarios: Optional[List[str]] = None) -> List[Dict]:
+    path = workdir / f"tasks_{n}.json"
+    store = make_store(path, n, codec=codec)
+    rng = random.Random(n)
+    ids = iter(range(n + 1, n + 10 * repeat + 10))
+    today = date.today()
+    due_iso = f"{(today + timedelta(days=14)).isoformat()}T09:00:00+09:00"
+    loc = {"latitude": 35.6895, "longitude": 139.6917, "timezone": "Asia/Tokyo"}
+
+    # each scenario mirrors one CLI command; show/list/calendar open a fresh Store like a new process would
+    plans = {
+        "add": lambda: store.add_task(make_task(next(ids), rng, today)),
+        "update": lambda: store.update_task(rng.randrange(1, n + 1), {"title": "updated"}),
+        "remove": lambda: store.remove_task(rng.randrange(1, n + 1)),
+        "show": lambda: Store(path, codec=codec).get_task(rng.randrange(1, n + 1)),
+        "list": lambda: Store(path, codec=codec).list_tasks(),
+        "calendar": lambda: render_range((today.year, 1), (today.year, 12), Store(path, codec=codec).list_tasks(), timezone="Asia/Tokyo"),
+        "select": lambda: candidate_selector.select_candidate_dates(due_iso, loc, store=store),
+    }
+    results = []
+    for name in scenarios or SCENARIOS:
+        samples = _time(plans[name], repeat)
+        results.append({
+            "size": n,
+            "scenario": name,
+            "repeat": repeat,
+            "min_ms": round(min(samples), 3),
+            "median_ms": round(statistics.median(samples), 3),
+            "mean_ms": round(statistics.fmean(samples), 3),
+            "file_bytes": path.stat().st_size,
+        })
+    return results
+
+
+def run_writers(workers: int, per_worker: int, workdir: Path) -> Dict:
+    """Add throughput with `workers` processes adding `per_worker` tasks each to one store."""
+    path = workdir / "concurrent.json"
+    Store(path)
+    t0 = time.perf_counter()
+    procs = [
+        subprocess.Popen([sys.executable, "-c", WRITER, str(path), f"w{w}", str(per_worker)], cwd=ROOT)
+        for w in range(workers)
+    ]
+    for p in procs:
+        if p.wait() != 0:
+            raise RuntimeError(f"writer process exited with {p.returncode}")
+    elapsed = time.perf_counter() - t0
+    total = workers * per_worker
+    return {
+        "workers": workers,
+        "adds": total,
+        "elapsed_ms": round(elapsed * 1000.0, 3),
+        "adds_per_s": round(total / elapsed, 1),
+        "stored": len(Store(path).list_tasks()),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        res = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=Path(__file__).parent)
+        return res.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run(sizes: List[int], repeat: int = 5, codec: Optional[str] = None, scenarios: Optional[List[str]] = None, writers: int = 0, writes: int = 25) -> Dict:
+    original = candidate_selector.get_daily_weather
+    candidate_selector.get_daily_weather = stub_weather
+    concurrency = None
+    try:
+        results = []
+        with tempfile.TemporaryDirectory() as tmp:
+            for n in sizes:
+                d = Path(tmp) / str(n)
+                d.mkdir()
+                results.extend(run_size(n, repeat, d, codec=codec, scenarios=scenarios))
+            if writers:
+                concurrency = run_writers(writers, writes, Path(tmp))
+    finally:
+        candidate_selector.get_daily_weather = original
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "codec": codec or "json",
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+    if concurrency is not None:
+        report["concurrency"] = concurrency
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="bench_store")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--codec", choices=["json", "compact", "msgpack"])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS)
+    parser.add_argument("--writers", type=int, default=0, help="also measure add throughput with this many concurrent processes")
+    parser.add_argument("--writes", type=int, default=25, help="adds per writer process")
+    parser.add_argument("--out", help="write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+    report = run(args.sizes, args.repeat, codec=args.codec, scenarios=args.scenarios, writers=args.writers, writes=args.writes)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
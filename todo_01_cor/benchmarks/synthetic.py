@@ -0,0 +1,54 @@
+import random
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.storage.store import Store
+
+TITLES = ["会議", "買い物", "公園清掃", "散歩", "ジョギング", "洗車", "引っ越し準備", "通院"]
+PLACES = [
+    ("東京", 35.6895, 139.6917, "Asia/Tokyo"),
+    ("大阪", 34.6937, 135.5023, "Asia/Tokyo"),
+    ("札幌", 43.0621, 141.3544, "Asia/Tokyo"),
+    ("福岡", 33.5904, 130.4017, "Asia/Tokyo"),
+]
+
+
+def make_task(tid: int, rng: random.Random, today: Optional[date] = None, span_days: int = 365) -> Dict:
+    """Build one task dict shaped like cmd_add output, with 0-3 candidate dates."""
+    today = today or date.today()
+    due = today + timedelta(days=rng.randrange(span_days))
+    name, lat, lon, tz = rng.choice(PLACES)
+    cands = []
+    for _ in range(rng.randrange(4)):
+        d = due - timedelta(days=rng.randrange(7))
+        cands.append({"date": d.isoformat(), "precipitation_probability": rng.randrange(100), "temperature": round(rng.uniform(-5, 35), 1), "reason": "降水確率が低いため"})
+    stamp = "2026-01-01T00:00:00"
+    return {
+        "id": tid,
+        "title": f"{rng.choice(TITLES)} {tid}",
+        "completed": False,
+        "priority": rng.choice(["高", "中", "低"]),
+        "location": {"name": name, "latitude": lat, "longitude": lon, "timezone": tz},
+        "due_date": f"{due.isoformat()}T09:00:00+09:00",
+        "candidate_dates": cands,
+        "created_at": stamp,
+        "updated_at": stamp,
+    }
+
+
+def make_tasks(n: int, seed: int = 0) -> List[Dict]:
+    rng = random.Random(seed)
+    today = date.today()
+    return [make_task(i, rng, today) for i in range(1, n + 1)]
+
+
+def make_store(path: Path, n: int, seed: int = 0, codec: Optional[str] = None) -> Store:
+    """Write a store with `n` synthetic tasks in one go and return a Store on it.
+
+    The journal base checkpoint is written up front so scenarios measure steady-state
+    mutations rather than the one-off first checkpoint.
+    """
+    store = Store(path, codec=codec)
+    store.add_tasks(make_tasks(n, seed), op="seed")
+    return store
@@ -1,22 +1,49 @@
 import argparse
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 from src.storage.store import Store
 from src.models.task import Task, Location, CandidateDate
-from src.services.geocoding import geocode_place
-from src.services.timezone import timezone_for
-from src.scheduler.candidate_selector import select_candidate_dates
-from src.utils.parse_date import parse_date, to_iso
+from src.utils.cache import set_cache_dir
 from src.utils.errors import ParseError, ServiceError, StorageError
 from src.utils.logging import setup_logging, get_logger
-import traceback
-from src.utils.calendar_renderer import render_month
-from zoneinfo import ZoneInfo
-from datetime import datetime
+
+# Heavy dependencies (geopy, timezonefinder, requests, dateparser) are imported
+# by the wrappers below only when a subcommand actually needs them, so
+# read-only commands such as `list` and `show` start quickly.
 
 logger = get_logger(__name__)
 
 
+def geocode_place(name):
+    from src.services.geocoding import geocode_place as _geocode_place
+
+    return _geocode_place(name)
+
+
+def timezone_for(lat, lon):
+    from src.services.timezone import timezone_for as _timezone_for
+
+    return _timezone_for(lat, lon)
+
+
+def select_candidate_dates(due_iso, location, max_candidates=1, store=None):
+    from src.scheduler.candidate_selector import select_candidate_dates as _select
+
+    return _select(due_iso, location, max_candidates=max_candidates, store=store)
+
+
+def parse_date(text, timezone=None):
+    from src.utils.parse_date import parse_date as _parse_date
+
+    return _parse_date(text, timezone=timezone)
+
+
+def to_iso(dt):
+    from src.utils.parse_date import to_iso as _to_iso
+
+    return _to_iso(dt)
+
+
 def _validate_priority(p: str) -> str:
     allowed = ["高", "中", "低"]
     if p not in allowed:
@@ -24,8 +51,15 @@ def _validate_priority(p: str) -> str:
     return p
 
 
+def _open_store(args) -> Store:
+    store = Store(Path(args.store) if args.store else None, codec=getattr(args, "store_format", None))
+    # forecast/geocode caches live next to the store the command works on
+    set_cache_dir(store.path.parent / "cache")
+    return store
+
+
 def cmd_add(args):
-    store = Store(Path(args.store) if args.store else None)
+    store = _open_store(args)
     nid = store.next_id()
     loc = None
     if args.location:
@@ -67,7 +101,7 @@ def cmd_add(args):
     # candidate selection if possible
     try:
         if task.due_date and task.location and task.location.latitude and task.location.longitude:
-            cands = select_candidate_dates(task.due_date, {"latitude": task.location.latitude, "longitude": task.location.longitude, "timezone": task.location.timezone or "UTC"}, max_candidates=1)
+            cands = select_candidate_dates(task.due_date, {"latitude": task.location.latitude, "longitude": task.location.longitude, "timezone": task.location.timezone or "UTC"}, max_candidates=1, store=store)
             for c in cands:
                 task.candidate_dates.append(CandidateDate(date=c["date"], precipitation_probability=c.get("precipitation_probability"), temperature=c.get("temperature"), reason=c.get("reason")))
     except ServiceError as e:
@@ -77,26 +111,23 @@ def cmd_add(args):
         print("候補日の自動選定で予期せぬエラーが発生しました。ログを確認してください。")
         logger.exception("unexpected candidate selection error")
 
-    store.add_task(task.to_dict())
-    print(f"タスクを追加しました (ID: {nid})")
+    saved = store.add_task(task.to_dict())
+    print(f"タスクを追加しました (ID: {saved['id']})")
 
 
 def cmd_list(args):
-    store = Store(Path(args.store) if args.store else None)
+    store = _open_store(args)
     tasks = store.list_tasks()
     if not tasks:
         print("タスクはありません。")
         return
-    # sort by due_date if present
-    def key_fn(t):
-        return t.get("due_date") or ""
-    tasks = sorted(tasks, key=key_fn)
+    # the store keeps tasks in due-date order
     for t in tasks:
         print(f"ID:{t.get('id')}  タイトル:{t.get('title')}  期限:{t.get('due_date')}  候補:{len(t.get('candidate_dates', []))}")
 
 
 def cmd_show(args):
-    store = Store(Path(args.store) if args.store else None)
+    store = _open_store(args)
     t = store.get_task(int(args.id))
     if not t:
         print(f"ID {args.id} のタスクが見つかりません。")
@@ -105,7 +136,7 @@ def cmd_show(args):
 
 
 def cmd_delete(args):
-    store = Store(Path(args.store) if args.store else None)
+    store = _open_store(args)
     ok = store.remove_task(int(args.id))
     if ok:
         print(f"タスク {args.id} を削除しました。")
@@ -120,7 +151,7 @@ def json_pretty(d):
 
 
 def cmd_update(args):
-    store = Store(Path(args.store) if args.store else None)
+    store = _open_store(args)
     tid = int(args.id)
     updates = {}
     if args.title:
@@ -151,7 +182,7 @@ def cmd_update(args):
 
 
 def cmd_complete(args):
-    store = Store(Path(args.store) if args.store else None)
+    store = _open_store(args)
     tid = int(args.id)
     ok = store.remove_task(tid)
     if ok:
@@ -160,24 +191,65 @@ def cmd_complete(args):
         print(f"タスク {tid} が見つかりませんでした。")
 
 
-def cmd_calendar(args):
-    store = Store(Path(args.store) if args.store else None)
-    # parse month arg YYYY-MM
-    if args.month:
-        try:
-            parts = args.month.split("-")
-            year = int(parts[0])
-            month = int(parts[1])
-        except Exception:
-            print("月指定は YYYY-MM の形式でお願いします。例: 2026-01")
-            return
+def cmd_import(args):
+    from src.services.importer import import_tasks, read_rows
+
+    store = _open_store(args)
+    try:
+        rows = read_rows(Path(args.file), fmt=args.format)
+    except FileNotFoundError:
+        print(f"ファイルが見つかりません: {args.file}")
+        return
+    except ParseError as e:
+        print(f"入力エラー: {e}")
+        return
+    added, errors = import_tasks(store, rows)
+    for lineno, msg in errors:
+        if lineno:
+            print(f"{lineno} 件目をスキップしました: {msg}")
+        else:
+            print(f"警告: {msg}")
+    if added:
+        print(f"{len(added)} 件のタスクを追加しました (ID: {added[0]['id']}-{added[-1]['id']})")
     else:
-        now = datetime.now(ZoneInfo("Asia/Tokyo"))
-        year = now.year
-        month = now.month
+        print("追加されたタスクはありません。")
+
+
+def _parse_year_month(text: str):
+    parts = text.split("-")
+    year, month = int(parts[0]), int(parts[1])
+    if not 1 <= month <= 12:
+        raise ValueError(text)
+    return year, month
+
+
+def cmd_calendar(args):
+    store = _open_store(args)
+    from zoneinfo import ZoneInfo
+
+    now = datetime.now(ZoneInfo("Asia/Tokyo"))
+    # parse month args YYYY-MM
+    try:
+        if args.year:
+            start, end = (int(args.year), 1), (int(args.year), 12)
+        elif args.from_month or args.to_month:
+            start = _parse_year_month(args.from_month) if args.from_month else (now.year, now.month)
+            end = _parse_year_month(args.to_month) if args.to_month else start
+        elif args.month:
+            start = end = _parse_year_month(args.month)
+        else:
+            start = end = (now.year, now.month)
+    except Exception:
+        print("月指定は YYYY-MM の形式でお願いします。例: 2026-01")
+        return
+    if end < start:
+        print("--to は --from 以降の月を指定してください。")
+        return
+
+    from src.utils.calendar_renderer import render_range
 
     tasks = store.list_tasks()
-    out = render_month(year, month, tasks, timezone="Asia/Tokyo")
+    out = render_range(start, end, tasks, timezone="Asia/Tokyo")
     print(out)
 
 
@@ -185,6 +257,7 @@ def main(argv=None):
     setup_logging()
     parser = argparse.ArgumentParser(prog="todo")
     parser.add_argument("--store", help="ストアファイルのパス（省略時デフォルト）")
+    parser.add_argument("--store-format", choices=["json", "compact", "msgpack"], help="ストアの保存形式（省略時は既存ファイルの形式、新規は json。読み込み時は自動判別）")
     sub = parser.add_subparsers(dest="cmd")
 
     p_add = sub.add_parser("add", help="タスクを追加")
@@ -216,8 +289,16 @@ def main(argv=None):
     p_complete.add_argument("id")
     p_complete.set_defaults(func=cmd_complete)
 
+    p_import = sub.add_parser("import", help="CSV/JSONL からタスクを一括追加")
+    p_import.add_argument("file", help="title,due,priority,location 列を持つ CSV または JSONL")
+    p_import.add_argument("--format", choices=["csv", "jsonl"], help="入力形式（省略時は拡張子で判定）")
+    p_import.set_defaults(func=cmd_import)
+
     p_calendar = sub.add_parser("calendar", help="月次カレンダー表示 (YYYY-MM)")
     p_calendar.add_argument("month", nargs="?", help="対象月を YYYY-MM 形式で指定（省略時は今月）")
+    p_calendar.add_argument("--from", dest="from_month", help="表示開始月 (YYYY-MM)")
+    p_calendar.add_argument("--to", dest="to_month", help="表示終了月 (YYYY-MM)")
+    p_calendar.add_argument("--year", help="指定年の 12 か月を表示 (YYYY)")
     p_calendar.set_defaults(func=cmd_calendar)
 
     args = parser.parse_args(argv)
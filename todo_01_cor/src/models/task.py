@@ -1,25 +1,54 @@
-from dataclasses import dataclass, field, asdict
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
 
 
-@dataclass
+def _utc_now_iso() -> str:
+    # naive UTC ISO string, the format stored since the first release
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+@dataclass(slots=True)
 class CandidateDate:
     date: str  # ISO date
     precipitation_probability: Optional[float] = None
     temperature: Optional[float] = None
     reason: Optional[str] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "date": self.date,
+            "precipitation_probability": self.precipitation_probability,
+            "temperature": self.temperature,
+            "reason": self.reason,
+        }
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> "CandidateDate":
+        return CandidateDate(d["date"], d.get("precipitation_probability"), d.get("temperature"), d.get("reason"))
+
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     name: str
     latitude: Optional[float] = None
     longitude: Optional[float] = None
     timezone: Optional[str] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "timezone": self.timezone,
+        }
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> "Location":
+        return Location(d["name"], d.get("latitude"), d.get("longitude"), d.get("timezone"))
+
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     id: int
     title: str
@@ -28,34 +57,40 @@ class Task:
     location: Optional[Location] = None
     due_date: Optional[str] = None  # ISO datetime with tz if available
     candidate_dates: List[CandidateDate] = field(default_factory=list)
-    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    created_at: str = field(default_factory=_utc_now_iso)
+    updated_at: str = field(default_factory=_utc_now_iso)
 
     def to_dict(self) -> Dict[str, Any]:
-        d = asdict(self)
-        # convert nested dataclasses
-        if self.location:
-            d["location"] = asdict(self.location)
-        d["candidate_dates"] = [asdict(c) for c in self.candidate_dates]
-        return d
+        # hand-written: one pass, no recursive deep copy (values are immutable scalars)
+        return {
+            "id": self.id,
+            "title": self.title,
+            "completed": self.completed,
+            "priority": self.priority,
+            "location": self.location.to_dict() if self.location else None,
+            "due_date": self.due_date,
+            "candidate_dates": [c.to_dict() for c in self.candidate_dates],
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
 
     @staticmethod
     def from_dict(d: Dict[str, Any]) -> "Task":
-        loc = None
-        if d.get("location"):
-            locd = d["location"]
-            loc = Location(**locd)
-        cands = []
-        for c in d.get("candidate_dates", []):
-            cands.append(CandidateDate(**c))
+        locd = d.get("location")
+        created = d.get("created_at")
+        updated = d.get("updated_at")
+        if created is None or updated is None:
+            now = _utc_now_iso()
+            created = created or now
+            updated = updated or now
         return Task(
             id=d["id"],
             title=d.get("title", ""),
             completed=d.get("completed", False),
             priority=d.get("priority", "中"),
-            location=loc,
+            location=Location.from_dict(locd) if locd else None,
             due_date=d.get("due_date"),
-            candidate_dates=cands,
-            created_at=d.get("created_at", datetime.utcnow().isoformat()),
-            updated_at=d.get("updated_at", datetime.utcnow().isoformat()),
+            candidate_dates=[CandidateDate.from_dict(c) for c in d.get("candidate_dates") or ()],
+            created_at=created,
+            updated_at=updated,
         )
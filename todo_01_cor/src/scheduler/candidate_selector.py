@@ -1,28 +1,28 @@
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set, Tuple
 from src.services.weather import get_daily_weather
 from src.storage.store import Store
 
 
-def select_candidate_dates(due_iso: str, location: Dict, max_candidates: int = 1) -> List[Dict]:
-    """Select candidate dates within [today, due_date] based on lowest precipitation.
+FALLBACK_DAYS = 8  # days after the due date offered when the window is fully taken
 
-    location: {name, latitude, longitude, timezone}
-    returns list of candidate dicts with date, precipitation_probability, temperature, reason
-    """
+
+def candidate_window(due_iso: str, today: Optional[date] = None) -> Tuple[date, date]:
+    """Return the [today, due_date] window candidates are chosen from."""
     try:
         due_dt = datetime.fromisoformat(due_iso)
     except Exception:
         # fallback: treat as date
         due_dt = datetime.utcnow()
-    today = datetime.now()
-    start = today.date()
+    start = today or datetime.now().date()
     end = due_dt.date()
     if end < start:
         end = start
+    return start, end
 
-    weather = get_daily_weather(location["latitude"], location["longitude"], start, end, timezone=location.get("timezone", "UTC"))
 
+def rank_candidates(weather: Dict[str, Dict], existing: Set[str], max_candidates: int = 1) -> List[Dict]:
+    """Pick the driest days of `weather` not already in `existing` (YYYY-MM-DD keys)."""
     # produce scored list
     scored = []
     for d, info in weather.items():
@@ -33,16 +33,9 @@ def select_candidate_dates(due_iso: str, location: Dict, max_candidates: int = 1
 
     scored.sort(key=lambda x: (x[1], -(x[3] or 0)))
 
-    # check existing candidate conflicts
-    store = Store()
-    existing = set()
-    for t in store.list_tasks():
-        for c in t.get("candidate_dates", []):
-            existing.add(c.get("date"))
-
     out = []
     for d, score, p, t in scored:
-        if d in existing:
+        if d[:10] in existing:
             continue
         out.append({
             "date": d,
@@ -52,15 +45,63 @@ def select_candidate_dates(due_iso: str, location: Dict, max_candidates: int = 1
         })
         if len(out) >= max_candidates:
             break
+    return out
+
+
+def fallback_candidates(alt_weather: Dict[str, Dict], max_candidates: int = 1) -> List[Dict]:
+    """Offer the first days after the due date when nothing in the window was free."""
+    out = []
+    for d, info in alt_weather.items():
+        out.append({"date": d, "precipitation_probability": info.get("precipitation_probability"), "temperature": info.get("temperature"), "reason": "候補日が期限内に見つからなかったため予備日"})
+        if len(out) >= max_candidates:
+            break
+    return out
+
+
+def _slice(weather: Dict[str, Dict], start: date, end: date) -> Dict[str, Dict]:
+    lo, hi = start.isoformat(), end.isoformat()
+    return {d: info for d, info in weather.items() if lo <= d[:10] <= hi}
+
+
+def plan_candidates(due_iso: str, weather: Dict[str, Dict], existing: Set[str], max_candidates: int = 1, today: Optional[date] = None) -> List[Dict]:
+    """Choose candidates from an already fetched forecast covering the window and fallback days.
+
+    Used for batches: the caller fetches one forecast per location and passes the
+    occupied days; chosen dates are added to `existing` so later tasks avoid them.
+    """
+    start, end = candidate_window(due_iso, today)
+    out = rank_candidates(_slice(weather, start, end), existing, max_candidates)
+    if not out:
+        alt_start = end + timedelta(days=1)
+        out = fallback_candidates(_slice(weather, alt_start, alt_start + timedelta(days=FALLBACK_DAYS - 1)), max_candidates)
+    for c in out:
+        existing.add(c["date"][:10])
+    return out
+
+
+def select_candidate_dates(due_iso: str, location: Dict, max_candidates: int = 1, store: Optional[Store] = None) -> List[Dict]:
+    """Select candidate dates within [today, due_date] based on lowest precipitation.
+
+    location: {name, latitude, longitude, timezone}
+    store: Store used for conflict checks (pass the command's store; defaults to Store())
+    returns list of candidate dicts with date, precipitation_probability, temperature, reason
+    """
+    start, end = candidate_window(due_iso)
+
+    weather = get_daily_weather(location["latitude"], location["longitude"], start, end, timezone=location.get("timezone", "UTC"))
+
+    # check existing candidate conflicts via the store's date occupancy index
+    if store is None:
+        store = Store()
+    existing = store.occupied_dates(start, end)
+
+    out = rank_candidates(weather, existing, max_candidates)
 
     # if none found, suggest next available dates after due_date
     if not out:
         alt_start = end + timedelta(days=1)
-        alt_end = alt_start + timedelta(days=7)
+        alt_end = alt_start + timedelta(days=FALLBACK_DAYS - 1)
         alt_weather = get_daily_weather(location["latitude"], location["longitude"], alt_start, alt_end, timezone=location.get("timezone", "UTC"))
-        for d, info in alt_weather.items():
-            out.append({"date": d, "precipitation_probability": info.get("precipitation_probability"), "temperature": info.get("temperature"), "reason": "候補日が期限内に見つからなかったため予備日"})
-            if len(out) >= max_candidates:
-                break
+        out = fallback_candidates(alt_weather, max_candidates)
 
     return out
@@ -1,21 +1,119 @@
-from geopy.geocoders import Nominatim
-from typing import List, Dict
+import re
+import time
+import unicodedata
+from pathlib import Path
+from typing import List, Dict, Optional
 
+from src.utils.cache import JsonFileCache, cache_dir, env_float
 
-def geocode_place(name: str, limit: int = 3) -> List[Dict]:
-    """Return list of candidate places with name, latitude, longitude, display_name."""
-    geolocator = Nominatim(user_agent="todo-weather-cli")
+
+DEFAULT_TTL = 30 * 24 * 60 * 60  # seconds a resolved place stays cached
+NEGATIVE_TTL = 24 * 60 * 60  # "no such place" answers are kept for a shorter time
+# spellings that name the same place. Administrative suffixes are otherwise kept:
+# 京都府 / 京都市 and 大阪府 / 大阪市 are different places, and 北海道 is not 北海 + 道
+_ALIASES = {"東京都": "東京"}
+_WS = re.compile(r"\s+")
+
+_geolocator = None
+
+
+def normalize_query(name: str) -> str:
+    """Fold a place query to a cache key: NFKC, case- and whitespace-insensitive, aliases merged."""
+    s = unicodedata.normalize("NFKC", name or "").casefold()
+    s = _WS.sub("", s)
+    return _ALIASES.get(s, s)
+
+
+class GeocodeCache(JsonFileCache):
+    """Persistent cache of geocode results with hit/miss counters and expiry.
+
+    Layout: {"entries": {"<normalized>|<limit>": {"results": [...], "fetched_at": ts}},
+             "stats": {"hits": n, "misses": n}}
+    """
+
+    def __init__(self, path=None, ttl: Optional[float] = None, negative_ttl: Optional[float] = None):
+        super().__init__(path or cache_dir() / "geocode.json")
+        self.ttl = ttl if ttl is not None else env_float("TODO_GEOCODE_TTL", DEFAULT_TTL)
+        self.negative_ttl = negative_ttl if negative_ttl is not None else min(self.ttl, NEGATIVE_TTL)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return self.data.setdefault("stats", {"hits": 0, "misses": 0})
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[List[Dict]]:
+        now = time.time() if now is None else now
+        e = self.data.get("entries", {}).get(key)
+        ttl = self.ttl if e and e.get("results") else self.negative_ttl
+        if e is None or now - e.get("fetched_at", 0) > ttl:
+            self.misses += 1
+            self.stats["misses"] = self.stats.get("misses", 0) + 1
+            self.mark_dirty()
+            return None
+        self.hits += 1
+        self.stats["hits"] = self.stats.get("hits", 0) + 1
+        self.mark_dirty()
+        return [dict(r) for r in e["results"]]
+
+    def put(self, key: str, results: List[Dict], now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        entries = self.data.setdefault("entries", {})
+        entries[key] = {"results": results, "fetched_at": now}
+        # expire old entries while we are writing anyway
+        for k in [k for k, e in entries.items() if now - e.get("fetched_at", 0) > (self.ttl if e.get("results") else self.negative_ttl)]:
+            entries.pop(k, None)
+        self.mark_dirty()
+
+
+_default_caches: Dict[Path, GeocodeCache] = {}
+
+
+def default_geocode_cache() -> GeocodeCache:
+    """Return the shared cache for the current cache directory."""
+    path = cache_dir() / "geocode.json"
+    cache = _default_caches.get(path)
+    if cache is None:
+        cache = _default_caches[path] = GeocodeCache(path)
+    return cache
+
+
+def _get_geolocator():
+    global _geolocator
+    if _geolocator is None:
+        from geopy.geocoders import Nominatim
+
+        _geolocator = Nominatim(user_agent="todo-weather-cli")
+    return _geolocator
+
+
+def geocode_place(name: str, limit: int = 3, cache: Optional[GeocodeCache] = None, use_cache: bool = True) -> List[Dict]:
+    """Return list of candidate places with name, latitude, longitude, display_name.
+
+    Results are served from the persistent geocode cache when the normalised query
+    was resolved before; network failures are never cached.
+    """
+    key = f"{normalize_query(name)}|{limit}"
+    if use_cache:
+        cache = cache or default_geocode_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            cache.save()
+            return cached
     try:
-        results = geolocator.geocode(name, exactly_one=False, limit=limit, addressdetails=False)
+        results = _get_geolocator().geocode(name, exactly_one=False, limit=limit, addressdetails=False)
     except Exception:
-        return []
-    if not results:
+        if use_cache:
+            cache.save()
         return []
     out = []
-    for r in results:
+    for r in results or []:
         out.append({
             "name": r.raw.get("display_name", r.address),
             "latitude": float(r.latitude),
             "longitude": float(r.longitude),
         })
+    if use_cache:
+        cache.put(key, out)
+        cache.save()
     return out
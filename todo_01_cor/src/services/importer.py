@@ -0,0 +1,129 @@
+import csv
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.models.task import Task, Location, CandidateDate
+from src.scheduler.candidate_selector import FALLBACK_DAYS, candidate_window, plan_candidates
+from src.services.geocoding import geocode_place, normalize_query
+from src.services.timezone import timezone_for
+from src.services.weather import FORECAST_HORIZON_DAYS, get_daily_weather
+from src.storage.store import Store
+from src.utils.errors import ParseError
+from src.utils.logging import get_logger
+from src.utils.parse_date import parse_date, to_iso
+
+logger = get_logger(__name__)
+
+ALLOWED_PRIORITIES = ("高", "中", "低")
+
+
+def read_rows(path: Path, fmt: Optional[str] = None) -> List[Dict]:
+    """Read task rows from CSV (header: title,due,priority,location) or JSON Lines."""
+    path = Path(path)
+    fmt = fmt or ("jsonl" if path.suffix.lower() in (".jsonl", ".ndjson") else "csv")
+    rows = []
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if fmt == "csv":
+            for r in csv.DictReader(f):
+                rows.append({k.strip(): (v or "").strip() for k, v in r.items() if k})
+        elif fmt == "jsonl":
+            for i, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    obj = json.loads(line)
+                except ValueError as e:
+                    raise ParseError(f"{i} 行目の JSON を解析できません: {e}")
+                if not isinstance(obj, dict):
+                    raise ParseError(f"{i} 行目は JSON オブジェクトではありません。")
+                # same shape as CSV rows: string values, null as empty
+                rows.append({str(k): ("" if v is None else str(v)) for k, v in obj.items()})
+        else:
+            raise ParseError(f"未対応の形式です: {fmt}")
+    return rows
+
+
+def _resolve_locations(rows: List[Dict]) -> Dict[str, Location]:
+    """Geocode each distinct location once (keys are normalised queries)."""
+    names: Dict[str, str] = {}
+    for r in rows:
+        name = (r.get("location") or "").strip()
+        if name:
+            names.setdefault(normalize_query(name), name)
+    out = {}
+    for key, name in names.items():
+        candidates = geocode_place(name)
+        if candidates:
+            chosen = candidates[0]
+            tz = timezone_for(chosen["latitude"], chosen["longitude"]) or "UTC"
+            out[key] = Location(name=chosen.get("name", name), latitude=chosen.get("latitude"), longitude=chosen.get("longitude"), timezone=tz)
+        else:
+            out[key] = Location(name=name)
+    return out
+
+
+def import_tasks(store: Store, rows: List[Dict], max_candidates: int = 1) -> Tuple[List[dict], List[Tuple[int, str]]]:
+    """Create tasks for `rows` and commit them with one store write.
+
+    Locations are geocoded once each, one forecast range per location covers every
+    due date in the batch, and candidates are chosen in memory so tasks in the same
+    batch do not take each other's days.
+
+    Returns (added task dicts, [(row number, error message), ...]).
+    """
+    errors: List[Tuple[int, str]] = []
+    locations = _resolve_locations(rows)
+
+    tasks: List[Task] = []
+    nid = store.next_id()
+    for lineno, r in enumerate(rows, start=1):
+        title = (r.get("title") or "").strip()
+        priority = (r.get("priority") or "中").strip()
+        if not title:
+            errors.append((lineno, "タイトルがありません。"))
+            continue
+        if priority not in ALLOWED_PRIORITIES:
+            errors.append((lineno, f"優先度は {','.join(ALLOWED_PRIORITIES)} のいずれかで指定してください。 (受け取った: {priority})"))
+            continue
+        loc_name = (r.get("location") or "").strip()
+        loc = locations.get(normalize_query(loc_name)) if loc_name else None
+        due_iso = None
+        due_text = (r.get("due") or r.get("due_date") or "").strip()
+        if due_text:
+            dt = parse_date(due_text, timezone=(loc.timezone if loc else None))
+            if dt is None:
+                errors.append((lineno, f"期限を解析できません: {due_text}"))
+                continue
+            due_iso = to_iso(dt)
+        tasks.append(Task(id=nid, title=title, priority=priority, location=loc, due_date=due_iso))
+        nid += 1
+
+    # one forecast range per distinct location, covering all due dates plus fallback days
+    groups: Dict[Tuple[float, float, str], List[Task]] = {}
+    for t in tasks:
+        if t.due_date and t.location and t.location.latitude and t.location.longitude:
+            groups.setdefault((t.location.latitude, t.location.longitude, t.location.timezone or "UTC"), []).append(t)
+
+    if groups:
+        today = datetime.now().date()
+        # Open-Meteo rejects ranges past its horizon; fallback days only fit before it
+        horizon = today + timedelta(days=FORECAST_HORIZON_DAYS - 1)
+        ends = {k: min(max(candidate_window(t.due_date, today)[1] for t in g) + timedelta(days=FALLBACK_DAYS), horizon) for k, g in groups.items()}
+        existing = store.occupied_dates(today, max(ends.values()))
+        for (lat, lon, tz), group in groups.items():
+            try:
+                weather = get_daily_weather(lat, lon, today, ends[(lat, lon, tz)], timezone=tz)
+            except Exception as e:
+                logger.exception("forecast fetch failed during import")
+                for t in group:
+                    errors.append((0, f"ID {t.id}: 天気予報を取得できませんでした ({e})"))
+                continue
+            for t in sorted(group, key=lambda x: x.due_date):
+                for c in plan_candidates(t.due_date, weather, existing, max_candidates, today=today):
+                    t.candidate_dates.append(CandidateDate(date=c["date"], precipitation_probability=c.get("precipitation_probability"), temperature=c.get("temperature"), reason=c.get("reason")))
+
+    added = store.add_tasks([t.to_dict() for t in tasks])
+    return added, errors
@@ -1,11 +1,61 @@
-from timezonefinder import TimezoneFinder
+from collections import OrderedDict
+from threading import Lock
 from typing import Optional
 
+from src.utils.cache import env_float
 
-def timezone_for(lat: float, lon: float) -> Optional[str]:
-    tf = TimezoneFinder()
+
+DEFAULT_PRECISION = 4  # decimal places kept for memo keys (~11 m)
+DEFAULT_MEMO_SIZE = 1024
+
+_finder = None
+_finder_lock = Lock()
+_memo: "OrderedDict[tuple, Optional[str]]" = OrderedDict()
+_memo_lock = Lock()
+
+
+def get_finder(in_memory: Optional[bool] = None):
+    """Return the process-wide TimezoneFinder, creating it on first use.
+
+    in_memory loads the polygon data fully into RAM (slower start, faster lookups);
+    it only applies to the first call and defaults to env TODO_TZ_IN_MEMORY.
+    """
+    global _finder
+    if _finder is None:
+        with _finder_lock:
+            if _finder is None:
+                from timezonefinder import TimezoneFinder
+
+                if in_memory is None:
+                    in_memory = bool(env_float("TODO_TZ_IN_MEMORY", 0))
+                _finder = TimezoneFinder(in_memory=in_memory)
+    return _finder
+
+
+def clear_cache() -> None:
+    """Forget memoised lookups (the shared finder is kept)."""
+    with _memo_lock:
+        _memo.clear()
+
+
+def timezone_for(lat: float, lon: float, precision: Optional[int] = None) -> Optional[str]:
+    """Return the IANA timezone at (lat, lon), memoised on rounded coordinates."""
+    if precision is None:
+        precision = int(env_float("TODO_TZ_PRECISION", DEFAULT_PRECISION))
+    key = (round(lat, precision), round(lon, precision))
+    with _memo_lock:
+        if key in _memo:
+            _memo.move_to_end(key)
+            return _memo[key]
     try:
-        tz = tf.timezone_at(lng=lon, lat=lat)
-        return tz
+        tz = get_finder().timezone_at(lng=lon, lat=lat)
     except Exception:
+        # lookup failures are not memoised so a transient error can recover
         return None
+    with _memo_lock:
+        _memo[key] = tz
+        _memo.move_to_end(key)
+        limit = int(env_float("TODO_TZ_MEMO_SIZE", DEFAULT_MEMO_SIZE))
+        while len(_memo) > limit:
+            _memo.popitem(last=False)
+    return tz
@@ -1,13 +1,19 @@
 import requests
-from typing import Dict, Any, Optional
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import date, timedelta
 
+from src.utils.cache import JsonFileCache, cache_dir, env_float
 
-def get_daily_weather(lat: float, lon: float, start_date: date, end_date: date, timezone: str = "UTC") -> Dict[str, Dict[str, Optional[float]]]:
-    """Fetch daily precipitation probability max and temperature (mean) from Open-Meteo for date range.
 
-    Returns mapping date_str -> {"precipitation_probability": float (0-100), "temperature": float}
-    """
+DEFAULT_TTL = 3 * 60 * 60  # seconds a cached forecast day stays fresh
+DEFAULT_PRECISION = 2  # decimal places kept when quantizing coordinates (~1 km)
+FORECAST_HORIZON_DAYS = 16  # Open-Meteo serves at most this many days from today
+
+
+def _fetch_daily_weather(lat: float, lon: float, start_date: date, end_date: date, timezone: str = "UTC") -> Dict[str, Dict[str, Optional[float]]]:
+    """Request daily precipitation/temperature for [start_date, end_date] from Open-Meteo."""
     url = "https://api.open-meteo.com/v1/forecast"
     params = {
         "latitude": lat,
@@ -40,3 +46,107 @@ def get_daily_weather(lat: float, lon: float, start_date: date, end_date: date,
             "temperature": temp,
         }
     return out
+
+
+class ForecastCache(JsonFileCache):
+    """On-disk forecast cache keyed by quantized coordinates, timezone and date.
+
+    Layout: {"<lat>,<lon>|<tz>": {"YYYY-MM-DD": {"p", "t", "fetched_at"}}}.
+    Days the API was asked for but did not return are stored with "missing": true
+    so ranges beyond the forecast horizon are not re-requested until they expire.
+    """
+
+    def __init__(self, path=None, ttl: Optional[float] = None, precision: Optional[int] = None):
+        super().__init__(path or cache_dir() / "forecast.json")
+        self.ttl = ttl if ttl is not None else env_float("TODO_FORECAST_TTL", DEFAULT_TTL)
+        self.precision = precision if precision is not None else int(env_float("TODO_FORECAST_PRECISION", DEFAULT_PRECISION))
+
+    def key(self, lat: float, lon: float, timezone: str) -> str:
+        p = self.precision
+        return f"{round(lat, p):.{p}f},{round(lon, p):.{p}f}|{timezone}"
+
+    def _fresh(self, entry: Dict[str, Any], now: float) -> bool:
+        return now - entry.get("fetched_at", 0) <= self.ttl
+
+    def lookup(self, key: str, days: List[str], now: Optional[float] = None) -> Tuple[Dict[str, Dict[str, Optional[float]]], List[str]]:
+        """Split `days` into cached results and the days that still need fetching."""
+        now = time.time() if now is None else now
+        bucket = self.data.get(key, {})
+        hits: Dict[str, Dict[str, Optional[float]]] = {}
+        missing = []
+        for d in days:
+            e = bucket.get(d)
+            if e is None or not self._fresh(e, now):
+                missing.append(d)
+            elif not e.get("missing"):
+                hits[d] = {"precipitation_probability": e.get("p"), "temperature": e.get("t")}
+        return hits, missing
+
+    def store(self, key: str, requested: List[str], fetched: Dict[str, Dict[str, Optional[float]]], now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        bucket = self.data.setdefault(key, {})
+        for d in requested:
+            info = fetched.get(d)
+            if info is None:
+                bucket[d] = {"missing": True, "fetched_at": now}
+            else:
+                bucket[d] = {"p": info.get("precipitation_probability"), "t": info.get("temperature"), "fetched_at": now}
+        # drop expired days so the file does not grow without bound
+        for k in list(self.data):
+            b = self.data[k]
+            for d in [d for d, e in b.items() if not self._fresh(e, now)]:
+                b.pop(d, None)
+            if not b:
+                self.data.pop(k, None)
+        self.mark_dirty()
+
+
+_default_caches: Dict[Path, ForecastCache] = {}
+
+
+def default_forecast_cache() -> ForecastCache:
+    """Return the shared cache for the current cache directory."""
+    path = cache_dir() / "forecast.json"
+    cache = _default_caches.get(path)
+    if cache is None:
+        cache = _default_caches[path] = ForecastCache(path)
+    return cache
+
+
+def _days(start: date, end: date) -> List[str]:
+    out = []
+    d = start
+    while d <= end:
+        out.append(d.isoformat())
+        d += timedelta(days=1)
+    return out
+
+
+def get_daily_weather(lat: float, lon: float, start_date: date, end_date: date, timezone: str = "UTC", cache: Optional[ForecastCache] = None, use_cache: bool = True) -> Dict[str, Dict[str, Optional[float]]]:
+    """Fetch daily precipitation probability max and temperature (mean) from Open-Meteo for date range.
+
+    Days already in the forecast cache (and younger than its TTL) are served locally;
+    otherwise one request covers the missing days, widened to the forecast horizon so
+    later calls for the same place hit the cache.
+
+    Returns mapping date_str -> {"precipitation_probability": float (0-100), "temperature": float}
+    """
+    if not use_cache:
+        return _fetch_daily_weather(lat, lon, start_date, end_date, timezone=timezone)
+    cache = cache or default_forecast_cache()
+    key = cache.key(lat, lon, timezone)
+    days = _days(start_date, end_date)
+    hits, missing = cache.lookup(key, days)
+    if missing:
+        fetch_start = date.fromisoformat(missing[0])
+        fetch_end = date.fromisoformat(missing[-1])
+        horizon_end = date.today() + timedelta(days=FORECAST_HORIZON_DAYS - 1)
+        if fetch_start >= date.today() and fetch_end < horizon_end:
+            fetch_end = horizon_end
+        fetched = _fetch_daily_weather(lat, lon, fetch_start, fetch_end, timezone=timezone)
+        cache.store(key, _days(fetch_start, fetch_end), fetched)
+        cache.save()
+        for d in missing:
+            if d in fetched:
+                hits[d] = fetched[d]
+    return {d: hits[d] for d in days if d in hits}
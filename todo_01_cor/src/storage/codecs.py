@@ -0,0 +1,112 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.utils.errors import StorageError
+
+
+class Codec:
+    """Serialise the store dict to bytes and back."""
+
+    name = ""
+
+    def encode(self, data: dict) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, raw: bytes) -> dict:
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    """Human-readable JSON (the default on-disk format)."""
+
+    name = "json"
+
+    def encode(self, data: dict) -> bytes:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+    def decode(self, raw: bytes) -> dict:
+        return json.loads(raw.decode("utf-8-sig"))
+
+
+class CompactJsonCodec(JsonCodec):
+    """Minified JSON: no indentation or spaces after separators."""
+
+    name = "compact"
+
+    def encode(self, data: dict) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class MsgpackCodec(Codec):
+    """Binary msgpack; only available when the optional `msgpack` package is installed."""
+
+    name = "msgpack"
+
+    def __init__(self):
+        try:
+            import msgpack
+        except ImportError as e:
+            raise StorageError("msgpack 形式を使うには msgpack パッケージをインストールしてください。") from e
+        self._msgpack = msgpack
+
+    def encode(self, data: dict) -> bytes:
+        return self._msgpack.packb(data, use_bin_type=True)
+
+    def decode(self, raw: bytes) -> dict:
+        return self._msgpack.unpackb(raw, raw=False, strict_map_key=False)
+
+
+CODECS: Dict[str, type] = {
+    JsonCodec.name: JsonCodec,
+    CompactJsonCodec.name: CompactJsonCodec,
+    MsgpackCodec.name: MsgpackCodec,
+}
+DEFAULT_CODEC = JsonCodec.name
+
+
+def get_codec(name: Optional[str] = None) -> Codec:
+    """Return a codec instance by name (default: env TODO_STORE_CODEC, then 'json')."""
+    name = name or os.environ.get("TODO_STORE_CODEC") or DEFAULT_CODEC
+    cls = CODECS.get(name)
+    if cls is None:
+        raise StorageError(f"不明なストア形式です: {name} ({', '.join(CODECS)})")
+    return cls()
+
+
+def detect_codec(raw: bytes) -> Codec:
+    """Guess the codec of existing file content.
+
+    JSON documents start with '{' (after optional BOM/whitespace); indented JSON has a
+    line break right after it, compact JSON does not. A msgpack map starts with a
+    fixmap (0x80-0x8f) or map16/map32 (0xde/0xdf) marker byte.
+    """
+    body = raw.lstrip(b"\xef\xbb\xbf \t\r\n")
+    head = body[:1]
+    if head in (b"{", b"["):
+        if body[1:2] in (b"\n", b"\r"):
+            return JsonCodec()
+        return CompactJsonCodec()
+    if head and (0x80 <= head[0] <= 0x8F or head[0] in (0xDE, 0xDF)):
+        return MsgpackCodec()
+    raise StorageError("ストアファイルの形式を判別できません。")
+
+
+def atomic_write_bytes(path: Path, payload: bytes) -> None:
+    """Write `payload` to `path` via a temp file in the same directory, fsync and rename."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
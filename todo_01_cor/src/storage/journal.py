@@ -0,0 +1,254 @@
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+JOURNAL_NAME = "journal.jsonl"
+CHECKPOINT_EVERY = 200  # operations between checkpoint snapshots
+KEEP_CHECKPOINTS = 2  # older checkpoints (and their journal entries) are compacted away
+
+_MISSING = object()
+
+
+def task_delta(before: Optional[dict], after: Optional[dict]) -> Dict[str, Optional[dict]]:
+    """Return only the fields that differ between two versions of a task.
+
+    A key listed in `fields` but missing from one side means the key was absent there.
+    """
+    before = before or {}
+    after = after or {}
+    fields = sorted(k for k in set(before) | set(after) if before.get(k, _MISSING) != after.get(k, _MISSING))
+    return {
+        "fields": fields,
+        "before": {k: before[k] for k in fields if k in before},
+        "after": {k: after[k] for k in fields if k in after},
+    }
+
+
+class Journal:
+    """Append-only log of per-operation task deltas with periodic checkpoints.
+
+    Each line of `journal.jsonl` is one operation:
+        {"seq", "ts", "op", "task_id", "fields", "before", "after"}
+    For add/remove the missing side is null; for update only changed fields are stored.
+    Batch operations (e.g. import) store one line with the per-task deltas in `entries`.
+    `checkpoint_<seq>.json` holds the full store as of `seq`, so any state can be
+    rebuilt by replaying the entries after the nearest checkpoint.
+    """
+
+    def __init__(self, directory: Path, checkpoint_every: int = CHECKPOINT_EVERY, keep_checkpoints: int = KEEP_CHECKPOINTS):
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.dir / JOURNAL_NAME
+        self.checkpoint_every = checkpoint_every
+        self.keep_checkpoints = max(1, keep_checkpoints)
+
+    # -- reading -------------------------------------------------------------
+
+    def entries(self, since: int = 0) -> List[dict]:
+        """Return journal entries with seq > since, oldest first."""
+        if not self.path.exists():
+            return []
+        out = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    e = json.loads(line)
+                except ValueError:
+                    # a torn trailing line from an interrupted append
+                    continue
+                if e.get("seq", 0) > since:
+                    out.append(e)
+        return out
+
+    def _last_line(self) -> bytes:
+        """Return the final non-empty line, scanning backwards in blocks for its start."""
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            # ignore trailing newlines
+            while end > 0:
+                f.seek(end - 1)
+                if f.read(1) not in (b"\n", b"\r"):
+                    break
+                end -= 1
+            start = 0
+            pos = end
+            while pos > 0:
+                step = min(65536, pos)
+                pos -= step
+                f.seek(pos)
+                nl = f.read(step).rfind(b"\n")
+                if nl != -1:
+                    start = pos + nl + 1
+                    break
+            f.seek(start)
+            return f.read(end - start)
+
+    def last_entry(self) -> Optional[dict]:
+        """Read the final journal line without scanning the whole file."""
+        if not self.path.exists():
+            return None
+        raw = self._last_line()
+        if not raw:
+            return None
+        try:
+            return json.loads(raw.decode("utf-8"))
+        except ValueError:
+            # torn trailing line: fall back to the last complete entry
+            entries = self.entries()
+            return entries[-1] if entries else None
+
+    def last_seq(self) -> int:
+        e = self.last_entry()
+        if e is not None:
+            return e.get("seq", 0)
+        cps = self.checkpoints()
+        return cps[-1][0] if cps else 0
+
+    def checkpoints(self) -> List[tuple]:
+        """Return [(seq, path), ...] sorted by seq."""
+        out = []
+        for p in self.dir.glob("checkpoint_*.json"):
+            try:
+                out.append((int(p.stem.split("_", 1)[1]), p))
+            except ValueError:
+                continue
+        return sorted(out)
+
+    # -- writing -------------------------------------------------------------
+
+    def append(self, op: str, task_id: Optional[int], before: Optional[dict], after: Optional[dict], **extra) -> dict:
+        """Append one operation and return the written entry."""
+        seq = self.last_seq() + 1
+        entry = {
+            "seq": seq,
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "op": op,
+            "task_id": task_id,
+        }
+        if op == "update":
+            entry.update(task_delta(before, after))
+        else:
+            entry.update({"before": before, "after": after})
+        entry.update(extra)
+        line = (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        with open(self.path, "a+b") as f:
+            # terminate a torn line left by an interrupted append so this entry stays parseable
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+        return entry
+
+    def needs_base(self) -> bool:
+        """True when no checkpoint exists yet to anchor replay."""
+        return not self.checkpoints()
+
+    def checkpoint(self, data: dict, seq: Optional[int] = None) -> Path:
+        """Write a full snapshot as of `seq` (default: last journal seq) and compact."""
+        if seq is None:
+            seq = self.last_seq()
+        path = self.dir / f"checkpoint_{seq:08d}.json"
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"seq": seq, "snapshot": data}, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+        self.compact()
+        return path
+
+    def maybe_checkpoint(self, data: dict, seq: int) -> Optional[Path]:
+        if self.checkpoint_every and seq % self.checkpoint_every == 0:
+            return self.checkpoint(data, seq)
+        return None
+
+    def compact(self) -> None:
+        """Drop checkpoints beyond `keep_checkpoints` and journal entries they cover."""
+        cps = self.checkpoints()
+        if len(cps) <= self.keep_checkpoints:
+            return
+        drop, keep = cps[: -self.keep_checkpoints], cps[-self.keep_checkpoints:]
+        for _, p in drop:
+            p.unlink(missing_ok=True)
+        oldest = keep[0][0]
+        remaining = self.entries(since=oldest)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for e in remaining:
+                f.write(json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n")
+        os.replace(tmp, self.path)
+
+    # -- replay --------------------------------------------------------------
+
+    def state_at(self, seq: Optional[int] = None) -> dict:
+        """Rebuild the store contents as of `seq` (default: latest) from the journal."""
+        cps = self.checkpoints()
+        if seq is None:
+            seq = self.last_seq()
+        base = [(s, p) for s, p in cps if s <= seq]
+        if not base:
+            raise ValueError(f"no checkpoint at or before seq {seq}")
+        base_seq, base_path = base[-1]
+        with open(base_path, "r", encoding="utf-8") as f:
+            data = json.load(f)["snapshot"]
+        tasks = {t.get("id"): t for t in data.get("tasks", [])}
+        order = [t.get("id") for t in data.get("tasks", [])]
+        for e in self.entries(since=base_seq):
+            if e["seq"] > seq:
+                break
+            apply_entry(tasks, order, e)
+        data["tasks"] = [tasks[i] for i in order if i in tasks]
+        # derived index; the Store rebuilds it when missing
+        data.pop("occupancy", None)
+        return data
+
+
+def invert_entry(e: dict) -> dict:
+    """Return the delta that undoes `e` (task_id/fields/before/after or nested entries)."""
+    if "entries" in e:
+        return {"task_id": e.get("task_id"), "entries": [invert_entry(sub) for sub in reversed(e["entries"])]}
+    inv = {"task_id": e.get("task_id"), "before": e.get("after"), "after": e.get("before")}
+    if "fields" in e:
+        inv["fields"] = e["fields"]
+        inv["before"] = inv["before"] or {}
+        inv["after"] = inv["after"] or {}
+    return inv
+
+
+def apply_entry(tasks: Dict[int, dict], order: List[int], e: dict, reverse: bool = False) -> None:
+    """Apply (or, with reverse=True, undo) one journal entry to an id->task mapping.
+
+    Batch entries carry their per-task deltas in `entries` and are applied in order.
+    """
+    if reverse:
+        e = invert_entry(e)
+    if "entries" in e:
+        for sub in e["entries"]:
+            apply_entry(tasks, order, sub)
+        return
+    tid = e.get("task_id")
+    before, after = e.get("before"), e.get("after")
+    if "fields" in e:
+        t = tasks.get(tid)
+        if t is None:
+            return
+        for k in e.get("fields", []):
+            if k in (after or {}):
+                t[k] = after[k]
+            else:
+                t.pop(k, None)
+        return
+    if after is None:
+        tasks.pop(tid, None)
+        if tid in order:
+            order.remove(tid)
+    else:
+        tasks[tid] = dict(after)
+        if tid not in order:
+            order.append(tid)
@@ -0,0 +1,84 @@
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: no shared locks, fall back to filelock's exclusive lock
+    fcntl = None
+
+
+class RWFileLock:
+    """Inter-process reader/writer lock on a lock file.
+
+    On POSIX this uses flock(): any number of processes may hold the shared lock,
+    while the exclusive lock waits for all of them. Where flock is unavailable both
+    modes map to filelock.FileLock, which is correct but serialises readers.
+
+    The lock is re-entrant within one instance, so Store helpers can take it again
+    inside a transaction. Taking the exclusive lock while only holding the shared
+    one is refused instead of deadlocking.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._guard = threading.RLock()
+        self._depth = 0
+        self._exclusive = False
+        self._fd = None
+        self._fallback = None
+
+    @property
+    def held(self) -> bool:
+        return self._depth > 0
+
+    def _acquire(self, exclusive: bool) -> None:
+        if fcntl is not None:
+            fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            except BaseException:
+                os.close(fd)
+                raise
+            self._fd = fd
+        else:
+            from filelock import FileLock
+
+            self._fallback = FileLock(str(self.path))
+            self._fallback.acquire()
+
+    def _release(self) -> None:
+        if self._fd is not None:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+        if self._fallback is not None:
+            self._fallback.release()
+            self._fallback = None
+
+    @contextmanager
+    def _hold(self, exclusive: bool):
+        with self._guard:
+            if self._depth:
+                if exclusive and not self._exclusive:
+                    raise RuntimeError("cannot upgrade a shared store lock to exclusive")
+            else:
+                self._acquire(exclusive)
+                self._exclusive = exclusive
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if not self._depth:
+                    self._release()
+                    self._exclusive = False
+
+    def shared(self):
+        return self._hold(exclusive=False)
+
+    def exclusive(self):
+        return self._hold(exclusive=True)
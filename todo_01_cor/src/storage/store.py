@@ -1,139 +1,368 @@
-import json
+import bisect
+from contextlib import contextmanager
+from datetime import date, timedelta
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 import os
-from filelock import FileLock
+
+from src.storage.codecs import atomic_write_bytes, detect_codec, get_codec
+from src.storage.journal import Journal, apply_entry, invert_entry
+from src.storage.locking import RWFileLock
 
 
 DEFAULT_PATH = Path(os.path.expandvars(r"%USERPROFILE%")) / ".todo_weather_cli" / "tasks.json"
 DEFAULT_LOCK = DEFAULT_PATH.with_suffix(".lock")
+# layout 2: tasks kept sorted by due date with derived display fields stored per task
+STORE_LAYOUT = 2
 
 
 class Store:
-    def __init__(self, path: Optional[Path] = None):
+    def __init__(self, path: Optional[Path] = None, codec: Optional[str] = None):
         self.path = Path(path) if path else DEFAULT_PATH
+        # on-disk format used for writes; reads detect the format of the existing file,
+        # which is kept for writes unless a format was chosen explicitly
+        self._codec_explicit = bool(codec or os.environ.get("TODO_STORE_CODEC"))
+        self.codec = get_codec(codec)
         self.lock_path = self.path.with_suffix(".lock")
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        # backups directory for undo/history
+        # shared for readers, exclusive for the whole read-modify-write of a mutation
+        self._lock = RWFileLock(self.lock_path)
+        # backups directory for undo/history: append-only journal + checkpoints,
+        # one subdirectory per store file so stores sharing a directory stay apart
         self.backups_dir = self.path.parent / "backups"
-        self.backups_dir.mkdir(parents=True, exist_ok=True)
+        self.journal_dir = self.backups_dir / self.path.stem
+        self.journal = Journal(self.journal_dir)
+        # in-process snapshot of the parsed file, keyed on its (mtime, size, inode) stamp
+        self._snapshot: Optional[dict] = None
+        self._stamp: Optional[Tuple[int, int, int]] = None
+        self._index: Dict[int, dict] = {}
+        self._max_id = 0
         # initialize file if missing
         if not self.path.exists():
-            self._write_data({"tasks": []})
+            with self._lock.exclusive():
+                if not self.path.exists():
+                    self._write_data({"layout": STORE_LAYOUT, "tasks": [], "occupancy": {}})
+
+    def _file_stamp(self) -> Tuple[int, int, int]:
+        st = os.stat(self.path)
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _decode_file(self) -> dict:
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        detected = detect_codec(raw)
+        if not self._codec_explicit:
+            self.codec = detected
+        return detected.decode(raw)
 
     def _read_data(self) -> dict:
-        lock = FileLock(str(self.lock_path))
-        with lock:
-            with open(self.path, "r", encoding="utf-8") as f:
-                return json.load(f)
+        with self._lock.shared():
+            return self._decode_file()
 
     def _write_data(self, data: dict) -> None:
-        lock = FileLock(str(self.lock_path))
-        with lock:
-            # write atomically
-            with open(self.path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+        try:
+            with self._lock.exclusive():
+                # write atomically: temp file + fsync + rename
+                atomic_write_bytes(self.path, self.codec.encode(data))
+                stamp = self._file_stamp()
+        except Exception:
+            # callers mutate the snapshot in place; never keep it if the write failed
+            self.invalidate()
+            raise
+        # what we just wrote is the current file content; keep it as the snapshot
+        self._set_snapshot(data, stamp)
 
-    def list_tasks(self) -> List[dict]:
-        data = self._read_data()
-        tasks = data.get("tasks", [])
+    def _set_snapshot(self, data: dict, stamp: Optional[Tuple[int, int, int]]) -> None:
+        self._snapshot = data
+        self._stamp = stamp
+        self._index = {}
+        for t in data.get("tasks", []):
+            tid = t.get("id")
+            if tid is not None:
+                self._index[tid] = t
+        self._max_id = max((t.get("id", 0) for t in data.get("tasks", [])), default=0)
+        if data.get("layout") != STORE_LAYOUT or not isinstance(data.get("occupancy"), dict):
+            # older or hand-edited files: normalise once, persisted on next write
+            self._normalize(data)
 
-        # Enrich each task with a simple candidate summary for CLI display
+    def _normalize(self, data: dict) -> None:
+        """Derive display fields, sort tasks and rebuild the occupancy index."""
+        tasks = data.get("tasks", [])
         for t in tasks:
-            cands = t.get("candidate_dates", []) or []
-            if not cands:
-                t["candidate_summary"] = "候補: 0件"
-            else:
-                # choose the first candidate as the "best" for summary (assumes selector orders by best)
-                best = cands[0]
-                # derive a short date (YYYY-MM-DD) for readability
-                date_str = best.get("date", "")
-                if date_str:
-                    short = date_str.split("T")[0]
-                else:
-                    short = ""
-                t["candidate_summary"] = f"候補: {len(cands)}件 (最良: {short})"
-
-        # Sort tasks by due_date (ISO string). Tasks without due_date sort after dated ones.
-        def sort_key(x):
-            d = x.get("due_date")
-            return d or "~"  # tilde sorts after typical ISO dates
-
-        return sorted(tasks, key=sort_key)
-
-    def _write_backup(self, snapshot: dict, op: str, task_id: Optional[int] = None) -> Path:
-        """Write a timestamped backup of the given snapshot and log the op."""
-        from datetime import datetime, timezone
-
-        # use timezone-aware UTC now to avoid deprecation warnings
-        ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-        fname = f"tasks_backup_{ts}.json"
-        path = self.backups_dir / fname
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump({"op": op, "task_id": task_id, "snapshot": snapshot}, f, ensure_ascii=False, indent=2)
-        # append to history log
-        hist = self.backups_dir / "history.log"
-        with open(hist, "a", encoding="utf-8") as h:
-            entry = {"ts": ts, "op": op, "task_id": task_id, "file": str(path)}
-            h.write(json.dumps(entry, ensure_ascii=False) + "\n")
-        return path
+            self._derive(t)
+        tasks.sort(key=self._sort_key)
+        data["tasks"] = tasks
+        data["layout"] = STORE_LAYOUT
+        self._rebuild_occupancy(data)
+
+    # -- derived fields ---------------------------------------------------------
+    #
+    # candidate_summary / best_candidate_date are computed when a task is written,
+    # and data["tasks"] is kept in due-date order, so list_tasks is a plain copy.
+
+    @staticmethod
+    def _sort_key(t: dict) -> str:
+        # Tasks without due_date sort after dated ones (tilde sorts after ISO dates)
+        return t.get("due_date") or "~"
+
+    @staticmethod
+    def _derive(t: dict) -> dict:
+        cands = t.get("candidate_dates", []) or []
+        if not cands:
+            t["candidate_summary"] = "候補: 0件"
+            t["best_candidate_date"] = None
+        else:
+            # choose the first candidate as the "best" for summary (assumes selector orders by best)
+            best = cands[0]
+            # derive a short date (YYYY-MM-DD) for readability
+            date_str = best.get("date", "")
+            short = date_str.split("T")[0] if date_str else ""
+            t["candidate_summary"] = f"候補: {len(cands)}件 (最良: {short})"
+            t["best_candidate_date"] = short or None
+        return t
+
+    def _insert_sorted(self, tasks: List[dict], t: dict) -> None:
+        bisect.insort_right(tasks, t, key=self._sort_key)
+
+    # -- candidate-date occupancy index ---------------------------------------
+    #
+    # data["occupancy"] maps a day (YYYY-MM-DD) to the ids of tasks holding a
+    # candidate on that day. It is kept in the store file and updated per task on
+    # add/update/remove, so conflict checks never walk every task.
+
+    @staticmethod
+    def _day_key(value: Optional[str]) -> Optional[str]:
+        if not value:
+            return None
+        return value.split("T")[0][:10]
+
+    def _rebuild_occupancy(self, data: dict) -> None:
+        data["occupancy"] = {}
+        for t in data.get("tasks", []):
+            self._occupy(data, t)
+
+    def _occupy(self, data: dict, task: dict) -> None:
+        occ = data.setdefault("occupancy", {})
+        tid = task.get("id")
+        for c in task.get("candidate_dates", []) or []:
+            key = self._day_key(c.get("date"))
+            if key is None:
+                continue
+            ids = occ.setdefault(key, [])
+            if tid not in ids:
+                ids.append(tid)
+
+    def _vacate(self, data: dict, task: dict) -> None:
+        occ = data.setdefault("occupancy", {})
+        tid = task.get("id")
+        for c in task.get("candidate_dates", []) or []:
+            key = self._day_key(c.get("date"))
+            ids = occ.get(key)
+            if not ids:
+                continue
+            if tid in ids:
+                ids.remove(tid)
+            if not ids:
+                occ.pop(key, None)
+
+    def tasks_on(self, day: str) -> List[int]:
+        """Return ids of tasks with a candidate on `day` (YYYY-MM-DD)."""
+        data = self._load()
+        return list(data.get("occupancy", {}).get(self._day_key(day), []))
+
+    def occupied_dates(self, start: date, end: date) -> Set[str]:
+        """Return the days in [start, end] that already hold a task's candidate date."""
+        occ = self._load().get("occupancy", {})
+        out = set()
+        d = start
+        while d <= end:
+            key = d.isoformat()
+            if occ.get(key):
+                out.add(key)
+            d += timedelta(days=1)
+        return out
+
+    def _load(self) -> dict:
+        """Return the parsed store, re-reading the file only when its stamp changed."""
+        with self._lock.shared():
+            stamp = self._file_stamp()
+            if self._snapshot is None or stamp != self._stamp:
+                self._set_snapshot(self._decode_file(), stamp)
+        return self._snapshot
+
+    @contextmanager
+    def transaction(self) -> Iterator[dict]:
+        """Hold the exclusive store lock across a whole read-modify-write.
+
+        Yields the current (freshly validated) store data. Mutations made inside,
+        including journal appends, cannot interleave with another process.
+        """
+        with self._lock.exclusive():
+            yield self._load()
+
+    def invalidate(self) -> None:
+        """Drop the in-process snapshot so the next access re-reads the file."""
+        self._snapshot = None
+        self._stamp = None
+        self._index = {}
+        self._max_id = 0
+
+    def list_tasks(self) -> List[dict]:
+        """Return tasks in due-date order (copies; derived fields are precomputed)."""
+        return [dict(t) for t in self._load().get("tasks", [])]
+
+    def _ensure_journal_base(self, data: dict) -> None:
+        # the first journaled mutation anchors replay with one full checkpoint
+        if self.journal.needs_base():
+            self.journal.checkpoint(data)
+
+    def _record(self, data: dict, op: str, task_id: Optional[int], before: Optional[dict], after: Optional[dict], **extra) -> dict:
+        """Append the operation's delta to the journal (after the store write succeeded)."""
+        entry = self.journal.append(op, task_id, before, after, **extra)
+        self.journal.maybe_checkpoint(data, entry["seq"])
+        return entry
+
+    def history(self, limit: Optional[int] = None) -> List[dict]:
+        """Return journal entries, oldest first (optionally only the last `limit`)."""
+        entries = self.journal.entries()
+        if limit:
+            return entries[-limit:]
+        return entries
+
+    def undo(self) -> Optional[dict]:
+        """Revert the most recent operation that has not been undone yet.
+
+        Returns the journal entry that was reverted, or None if there is nothing to undo.
+        """
+        with self.transaction() as data:
+            entries = self.journal.entries()
+            undone = {e.get("undoes") for e in entries if e.get("op") == "undo"}
+            target = None
+            for e in reversed(entries):
+                if e.get("op") == "undo" or e.get("seq") in undone:
+                    continue
+                target = e
+                break
+            if target is None:
+                return None
+            tasks = {t.get("id"): t for t in data.get("tasks", [])}
+            order = [t.get("id") for t in data.get("tasks", [])]
+            inverse = invert_entry(target)
+            apply_entry(tasks, order, inverse)
+            data["tasks"] = [tasks[i] for i in order if i in tasks]
+            # undo is rare; re-deriving and re-sorting is simpler than inverting each change
+            self._normalize(data)
+            self._write_data(data)
+            extra = {k: v for k, v in inverse.items() if k not in ("task_id", "before", "after")}
+            self._record(data, "undo", inverse["task_id"], inverse.get("before"), inverse.get("after"), undoes=target["seq"], **extra)
+            return target
 
     def next_id(self) -> int:
-        tasks = self.list_tasks()
-        if not tasks:
-            return 1
-        return max(t.get("id", 0) for t in tasks) + 1
+        self._load()
+        return self._max_id + 1
+
+    def _claim_id(self, task_dict: dict) -> None:
+        # ids handed out by next_id() before the lock was taken may have been used
+        # by another process meanwhile; allocate a fresh one instead of duplicating it
+        tid = task_dict.get("id")
+        if tid is None or tid in self._index:
+            task_dict["id"] = self._max_id + 1
+        self._max_id = max(self._max_id, task_dict["id"])
 
     def add_task(self, task_dict: dict) -> dict:
-        data = self._read_data()
-        # backup before mutation
-        self._write_backup(data, op="add", task_id=task_dict.get("id"))
-        tasks = data.get("tasks", [])
-        tasks.append(task_dict)
-        data["tasks"] = tasks
-        self._write_data(data)
-        return task_dict
+        """Add a task; its id is reassigned if another writer already took it."""
+        with self.transaction() as data:
+            self._ensure_journal_base(data)
+            self._claim_id(task_dict)
+            self._derive(task_dict)
+            tasks = data.get("tasks", [])
+            self._insert_sorted(tasks, task_dict)
+            data["tasks"] = tasks
+            self._occupy(data, task_dict)
+            self._write_data(data)
+            self._record(data, "add", task_dict.get("id"), None, task_dict)
+            return task_dict
+
+    def add_tasks(self, task_dicts: List[dict], op: str = "import") -> List[dict]:
+        """Add several tasks with a single store write and a single journal entry."""
+        if not task_dicts:
+            return []
+        with self.transaction() as data:
+            self._ensure_journal_base(data)
+            for t in task_dicts:
+                self._claim_id(t)
+                self._index[t["id"]] = t
+            tasks = data.get("tasks", [])
+            for t in task_dicts:
+                self._derive(t)
+            if len(task_dicts) > 64:
+                # large batches: one stable sort beats many list insertions
+                tasks.extend(task_dicts)
+                tasks.sort(key=self._sort_key)
+            else:
+                for t in task_dicts:
+                    self._insert_sorted(tasks, t)
+            data["tasks"] = tasks
+            for t in task_dicts:
+                self._occupy(data, t)
+            self._write_data(data)
+            entries = [{"task_id": t.get("id"), "before": None, "after": t} for t in task_dicts]
+            self._record(data, op, None, None, None, entries=entries)
+            return task_dicts
 
     def get_task(self, id: int) -> Optional[dict]:
-        for t in self.list_tasks():
-            if t.get("id") == id:
-                return t
-        return None
+        self._load()
+        t = self._index.get(id)
+        if t is None:
+            return None
+        return dict(t)
 
     def remove_task(self, id: int) -> bool:
-        data = self._read_data()
-        tasks = data.get("tasks", [])
-        # backup before mutation
-        self._write_backup(data, op="remove", task_id=id)
-        new = [t for t in tasks if t.get("id") != id]
-        if len(new) == len(tasks):
-            return False
-        data["tasks"] = new
-        self._write_data(data)
-        return True
+        with self.transaction() as data:
+            tasks = data.get("tasks", [])
+            removed = self._index.get(id)
+            if removed is None:
+                return False
+            self._ensure_journal_base(data)
+            data["tasks"] = [t for t in tasks if t.get("id") != id]
+            self._vacate(data, removed)
+            self._write_data(data)
+            self._record(data, "remove", id, removed, None)
+            return True
 
     def update_task(self, id: int, updates: dict) -> bool:
         """Update fields of a task by id. Returns True if updated."""
-        data = self._read_data()
-        tasks = data.get("tasks", [])
-        found = False
-        for t in tasks:
-            if t.get("id") == id:
-                found = True
-                break
-        if not found:
-            return False
-        # backup before mutation
-        self._write_backup(data, op="update", task_id=id)
-        for k, v in updates.items():
-            # prevent changing id
-            if k == "id":
-                continue
-            # replace or remove key if value is None
-            if v is None and k in t:
-                t.pop(k, None)
-            else:
-                t[k] = v
-        data["tasks"] = tasks
-        self._write_data(data)
-        return True
+        with self.transaction() as data:
+            tasks = data.get("tasks", [])
+            found = False
+            for t in tasks:
+                if t.get("id") == id:
+                    found = True
+                    break
+            if not found:
+                return False
+            self._ensure_journal_base(data)
+            before = dict(t)
+            self._vacate(data, t)
+            for k, v in updates.items():
+                # prevent changing id
+                if k == "id":
+                    continue
+                # replace or remove key if value is None
+                if v is None and k in t:
+                    t.pop(k, None)
+                else:
+                    t[k] = v
+            self._derive(t)
+            self._occupy(data, t)
+            if self._sort_key(t) != self._sort_key(before):
+                # keep the list in due-date order
+                for i, x in enumerate(tasks):
+                    if x is t:
+                        del tasks[i]
+                        break
+                self._insert_sorted(tasks, t)
+            data["tasks"] = tasks
+            self._write_data(data)
+            self._record(data, "update", id, before, t)
+            return True
@@ -0,0 +1,70 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.storage.codecs import atomic_write_bytes
+from src.storage.store import DEFAULT_PATH
+
+
+_cache_dir: Optional[Path] = None
+
+
+def set_cache_dir(path: Optional[Path]) -> None:
+    """Use `path` for service caches (the CLI passes `cache/` next to the opened store)."""
+    global _cache_dir
+    _cache_dir = Path(path) if path else None
+
+
+def cache_dir() -> Path:
+    """Directory for on-disk service caches (env TODO_CACHE_DIR overrides)."""
+    env = os.environ.get("TODO_CACHE_DIR")
+    if env:
+        return Path(env)
+    return _cache_dir or DEFAULT_PATH.parent / "cache"
+
+
+def env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class JsonFileCache:
+    """Small JSON-file-backed dict, loaded lazily and written atomically on save().
+
+    Caches are best effort: an unreadable file is treated as empty and write
+    failures are ignored, so a broken cache never breaks a command.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._data: Optional[Dict[str, Any]] = None
+        self._dirty = False
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f)
+                if not isinstance(self._data, dict):
+                    self._data = {}
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty or self._data is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            payload = json.dumps(self._data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            atomic_write_bytes(self.path, payload)
+            self._dirty = False
+        except OSError:
+            pass
@@ -1,7 +1,21 @@
 from calendar import monthcalendar, month_name
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
 from zoneinfo import ZoneInfo
-from typing import List, Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+# (year, month) -> day -> labels, built in one pass over the tasks
+DayIndex = Dict[Tuple[int, int], Dict[int, List[str]]]
+
+CANDIDATE_MARK = "(候補)"
+
+
+@lru_cache(maxsize=64)
+def _zone(name: str) -> Optional[ZoneInfo]:
+    try:
+        return ZoneInfo(name)
+    except Exception:
+        return None
 
 
 def _parse_date_iso(dt_str: str, tz: Optional[str] = None) -> Optional[datetime]:
@@ -11,29 +25,58 @@ def _parse_date_iso(dt_str: str, tz: Optional[str] = None) -> Optional[datetime]
         # datetime.fromisoformat supports offsets
         dt = datetime.fromisoformat(dt_str)
         if dt.tzinfo is None and tz:
-            dt = dt.replace(tzinfo=ZoneInfo(tz))
+            zone = _zone(tz)
+            if zone is not None:
+                dt = dt.replace(tzinfo=zone)
         return dt
     except Exception:
         return None
 
 
-def render_month(year: int, month: int, tasks: List[Dict], timezone: Optional[str] = None) -> str:
-    """Render a simple text calendar for the month, annotating days with task titles."""
+def _to_day(value: Optional[str], tz: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    if len(value) == 10:
+        # plain YYYY-MM-DD (candidate dates): no timezone handling needed
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return None
+    dt = _parse_date_iso(value, tz=tz)
+    return dt.date() if dt is not None else None
+
+
+def build_day_index(tasks: List[Dict], timezone: Optional[str] = None, include_candidates: bool = True) -> DayIndex:
+    """Bucket task titles by (year, month) and day from due dates and, optionally, candidate dates."""
+    index: DayIndex = {}
+    for t in tasks:
+        tz = (t.get("location") or {}).get("timezone") or timezone
+        title = t.get("title", "(無題)")
+        d = _to_day(t.get("due_date"), tz)
+        if d is not None:
+            index.setdefault((d.year, d.month), {}).setdefault(d.day, []).append(title)
+        if include_candidates:
+            for c in t.get("candidate_dates", []) or []:
+                cd = _to_day(c.get("date"), tz)
+                if cd is not None and cd != d:
+                    index.setdefault((cd.year, cd.month), {}).setdefault(cd.day, []).append(title + CANDIDATE_MARK)
+    return index
+
+
+def render_month(year: int, month: int, tasks: Optional[List[Dict]] = None, timezone: Optional[str] = None, index: Optional[DayIndex] = None) -> str:
+    """Render a simple text calendar for the month, annotating days with task titles.
+
+    Pass a prebuilt `index` (see build_day_index) to avoid rescanning tasks per month.
+    """
+    if index is None:
+        index = build_day_index(tasks or [], timezone=timezone)
     cal = monthcalendar(year, month)
     title = f"{year}年 {month}月"
     lines = [title]
     lines.append("Mo Tu We Th Fr Sa Su")
 
-    # build mapping day -> list of task titles
-    day_map = {}
-    for t in tasks:
-        due = t.get("due_date")
-        dt = _parse_date_iso(due, tz=(t.get("location", {}).get("timezone") or timezone))
-        if dt is None:
-            continue
-        d = dt.date()
-        if d.year == year and d.month == month:
-            day_map.setdefault(d.day, []).append(t.get("title", "(無題)"))
+    # mapping day -> list of task titles
+    day_map = index.get((year, month), {})
 
     for week in cal:
         week_str = []
@@ -56,3 +99,19 @@ def render_month(year: int, month: int, tasks: List[Dict], timezone: Optional[st
         lines.append(f"{year}-{month:02d}-{day:02d}: {titles}")
 
     return "\n".join(lines)
+
+
+def iter_months(start: Tuple[int, int], end: Tuple[int, int]):
+    """Yield (year, month) from start to end inclusive."""
+    y, m = start
+    while (y, m) <= end:
+        yield y, m
+        m += 1
+        if m > 12:
+            y, m = y + 1, 1
+
+
+def render_range(start: Tuple[int, int], end: Tuple[int, int], tasks: List[Dict], timezone: Optional[str] = None) -> str:
+    """Render every month from `start` to `end` (inclusive) from a single pass over the tasks."""
+    index = build_day_index(tasks, timezone=timezone)
+    return "\n\n".join(render_month(y, m, index=index) for y, m in iter_months(start, end))
@@ -1,41 +1,118 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime, timedelta, tzinfo
+from functools import lru_cache
 from typing import Optional
 
-import dateparser
-from datetime import timedelta
 from zoneinfo import ZoneInfo
 import re
 
 
-def parse_date(text: str, timezone: Optional[str] = None, prefer_future: bool = True) -> Optional[datetime]:
-    """Parse a Japanese (or general) natural-language date/time string into a timezone-aware datetime.
+PARSE_CACHE_SIZE = 512
 
-    Args:
-        text: input natural-language string (e.g. '明日', '来週の月曜', '2026/01/05 14:00')
-        timezone: IANA timezone string (e.g. 'Asia/Tokyo'). If provided, used for interpretation.
-        prefer_future: whether to prefer future dates when ambiguous.
+_WEEKDAYS = {"月": 0, "火": 1, "水": 2, "木": 3, "金": 4, "土": 5, "日": 6}
+_RELATIVE_DAYS = {"今日": 0, "本日": 0, "明日": 1, "明後日": 2}
 
-    Returns:
-        A timezone-aware `datetime` or `None` if parsing failed.
-    """
-    if not text or not text.strip():
+# Fast-path patterns: full matches only, anything else goes to dateparser.
+_TIME = r"(?:[ T　]*(\d{1,2})(?::(\d{2})(?::(\d{2}))?|時(?:(\d{1,2})分)?))?"
+_YMD_RE = re.compile(r"(\d{4})[/\-](\d{1,2})[/\-](\d{1,2})" + _TIME)
+_RELATIVE_RE = re.compile(r"(今日|本日|明日|明後日)" + _TIME)
+_DAYS_LATER_RE = re.compile(r"(\d{1,4})日後" + _TIME)
+_NEXT_WEEK_RE = re.compile(r"来週の?([月火水木金土日])曜日?" + _TIME)
+_NTH_WEEKDAY_RE = re.compile(r"来月第(\d)\s*([月火水木金土日])曜日?" + _TIME)
+
+
+def _resolve_tz(timezone: Optional[str]) -> tzinfo:
+    if timezone:
+        return ZoneInfo(timezone)
+    # same default as dateparser: the machine's local timezone
+    return datetime.now().astimezone().tzinfo
+
+
+def _apply_time(d: datetime, m: re.Match, first: int, default: Optional[tuple] = None) -> Optional[datetime]:
+    """Set the time captured by _TIME groups starting at `first`; None if out of range."""
+    hour = m.group(first)
+    if hour is None:
+        if default is None:
+            return d
+        return d.replace(hour=default[0], minute=default[1], second=0, microsecond=0)
+    minute = m.group(first + 1) or m.group(first + 3) or 0
+    second = m.group(first + 2) or 0
+    try:
+        return d.replace(hour=int(hour), minute=int(minute), second=int(second), microsecond=0)
+    except ValueError:
         return None
+
+
+def _next_week_weekday(today: date, target: int) -> date:
+    # the given weekday 7-13 days from today
+    return today + timedelta(days=7 + (target - today.weekday()) % 7)
+
+
+def _nth_weekday_next_month(today: date, nth: int, target: int) -> Optional[date]:
+    y = today.year + (1 if today.month == 12 else 0)
+    mth = 1 if today.month == 12 else today.month + 1
+    first = date(y, mth, 1)
+    offset = (target - first.weekday() + 7) % 7
+    try:
+        return date(y, mth, 1 + offset + (nth - 1) * 7)
+    except ValueError:
+        return None
+
+
+def _fast_parse(text: str, tz: tzinfo, now: datetime) -> tuple:
+    """Handle the common formats without dateparser.
+
+    Returns (matched, datetime-or-None). matched=False means the text should go to dateparser.
+    """
+    # ISO 8601 (with or without offset)
+    if text[:4].isdigit() and "-" in text[:5]:
+        try:
+            dt = datetime.fromisoformat(text)
+        except ValueError:
+            dt = None
+        if dt is not None:
+            if dt.tzinfo is None:
+                return True, dt.replace(tzinfo=tz)
+            return True, dt.astimezone(tz)
+
+    m = _YMD_RE.fullmatch(text)
+    if m:
+        try:
+            d = datetime(int(m.group(1)), int(m.group(2)), int(m.group(3)), tzinfo=tz)
+        except ValueError:
+            return True, None
+        return True, _apply_time(d, m, 4)
+
+    m = _RELATIVE_RE.fullmatch(text)
+    if m:
+        return True, _apply_time(now + timedelta(days=_RELATIVE_DAYS[m.group(1)]), m, 2)
+
+    m = _DAYS_LATER_RE.fullmatch(text)
+    if m:
+        return True, _apply_time(now + timedelta(days=int(m.group(1))), m, 2)
+
+    m = _NEXT_WEEK_RE.fullmatch(text)
+    if m:
+        d = _next_week_weekday(now.date(), _WEEKDAYS[m.group(1)])
+        return True, _apply_time(datetime(d.year, d.month, d.day, tzinfo=tz), m, 2, default=(9, 0))
+
+    m = _NTH_WEEKDAY_RE.fullmatch(text)
+    if m:
+        d = _nth_weekday_next_month(now.date(), int(m.group(1)), _WEEKDAYS[m.group(2)])
+        if d is None:
+            return True, None
+        return True, _apply_time(datetime(d.year, d.month, d.day, tzinfo=tz), m, 3, default=(9, 0))
+
+    return False, None
+
+
+def _slow_parse(text: str, timezone: Optional[str], prefer_future: bool) -> Optional[datetime]:
+    """dateparser plus the regex heuristics for phrases embedded in longer text."""
+    import dateparser
+
     # Basic normalization for common Japanese weekday abbreviations
-    text = text.strip()
-    replacements = {
-        "月曜": "月曜日",
-        "火曜": "火曜日",
-        "水曜": "水曜日",
-        "木曜": "木曜日",
-        "金曜": "金曜日",
-        "土曜": "土曜日",
-        "日曜": "日曜日",
-    }
-    for k, v in replacements.items():
-        if k in text:
-            text = text.replace(k, v)
+    text = re.sub(r"([月火水木金土日])曜(?!日)", r"\1曜日", text)
 
     settings = {
         "RETURN_AS_TIMEZONE_AWARE": True,
@@ -60,54 +137,22 @@ def parse_date(text: str, timezone: Optional[str] = None, prefer_future: bool =
 
     # Additional heuristic fallbacks for common Japanese patterns
     if dt is None:
-        today = datetime.now()
+        today = datetime.now().date()
 
         # 来週の月曜日 等
-        m = re.search(r"来週の?(月曜日|火曜日|水曜日|木曜日|金曜日|土曜日|日曜日)", text)
+        m = re.search(r"来週の?([月火水木金土日])曜日", text)
         if m:
-            name = m.group(1)
-            mapping = {
-                "月曜日": 0,
-                "火曜日": 1,
-                "水曜日": 2,
-                "木曜日": 3,
-                "金曜日": 4,
-                "土曜日": 5,
-                "日曜日": 6,
-            }
-            target = mapping.get(name)
-            if target is not None:
-                days_ahead = (target - today.weekday() + 7) % 7
-                if days_ahead == 0:
-                    days_ahead = 7
-                days = days_ahead + 7
-                d = today + timedelta(days=days)
-                # set a default time of 09:00
-                dt = datetime(d.year, d.month, d.day, 9, 0)
+            d = _next_week_weekday(today, _WEEKDAYS[m.group(1)])
+            # set a default time of 09:00
+            dt = datetime(d.year, d.month, d.day, 9, 0)
 
         # 来月第2金曜 のような表現
         if dt is None:
-            m2 = re.search(r"来月第(\d+)\s*(日|月|火|水|木|金|土)曜", text)
+            m2 = re.search(r"来月第(\d+)\s*([月火水木金土日])曜", text)
             if m2:
-                try:
-                    nth = int(m2.group(1))
-                    w = m2.group(2)
-                    mapping2 = {"日": 6, "月": 0, "火": 1, "水": 2, "木": 3, "金": 4, "土": 5}
-                    target = mapping2.get(w)
-                    if target is not None:
-                        # compute next month
-                        y = today.year + (1 if today.month == 12 else 0)
-                        mth = 1 if today.month == 12 else today.month + 1
-                        first = datetime(y, mth, 1)
-                        # find first target weekday in month
-                        offset = (target - first.weekday() + 7) % 7
-                        day = 1 + offset + (nth - 1) * 7
-                        try:
-                            dt = datetime(y, mth, day, 9, 0)
-                        except Exception:
-                            dt = None
-                except Exception:
-                    dt = None
+                d = _nth_weekday_next_month(today, int(m2.group(1)), _WEEKDAYS[m2.group(2)])
+                if d is not None:
+                    dt = datetime(d.year, d.month, d.day, 9, 0)
 
     # If we constructed a naive datetime and a timezone was requested, make it timezone-aware
     if dt is not None and timezone and dt.tzinfo is None:
@@ -120,6 +165,45 @@ def parse_date(text: str, timezone: Optional[str] = None, prefer_future: bool =
     return dt
 
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_cached(text: str, timezone: Optional[str], prefer_future: bool, ref_day: date) -> Optional[datetime]:
+    try:
+        tz = _resolve_tz(timezone)
+    except Exception:
+        tz = None
+    if tz is not None:
+        matched, dt = _fast_parse(text, tz, datetime.now(tz))
+        if matched:
+            return dt
+    return _slow_parse(text, timezone, prefer_future)
+
+
+def parse_date(text: str, timezone: Optional[str] = None, prefer_future: bool = True) -> Optional[datetime]:
+    """Parse a Japanese (or general) natural-language date/time string into a timezone-aware datetime.
+
+    ISO dates, `YYYY/MM/DD HH:MM`, 今日/明日/明後日, N日後, 来週X曜 and 来月第N X曜 are
+    handled by a compiled fast path; only other input loads and calls dateparser.
+    Results are memoised per (text, timezone, reference day), so relative
+    expressions keep the time of day of their first parse on that day.
+
+    Args:
+        text: input natural-language string (e.g. '明日', '来週の月曜', '2026/01/05 14:00')
+        timezone: IANA timezone string (e.g. 'Asia/Tokyo'). If provided, used for interpretation.
+        prefer_future: whether to prefer future dates when ambiguous.
+
+    Returns:
+        A timezone-aware `datetime` or `None` if parsing failed.
+    """
+    if not text or not text.strip():
+        return None
+    text = text.strip()
+    try:
+        ref_day = datetime.now(_resolve_tz(timezone)).date()
+    except Exception:
+        ref_day = date.today()
+    return _parse_cached(text, timezone, prefer_future, ref_day)
+
+
 def to_iso(dt: Optional[datetime]) -> Optional[str]:
     if dt is None:
         return None
@@ -17,7 +17,7 @@ def test_add_command_end_to_end(monkeypatch, tmp_path):
         return "Asia/Tokyo"
 
     # Mock candidate selector to return deterministic candidate
-    def mock_select_candidate_dates(due_iso, location, max_candidates=1):
+    def mock_select_candidate_dates(due_iso, location, max_candidates=1, store=None):
         return [{"date": "2026-01-05T09:00:00+09:00", "precipitation_probability": 5, "temperature": 10, "reason": "low_precip"}]
 
     # Patch the functions referenced by the CLI module directly
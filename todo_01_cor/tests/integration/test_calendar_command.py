@@ -27,3 +27,21 @@ def test_calendar_shows_tasks(tmp_path):
     assert "会議" in out
     assert "2026-01-15" in out
     assert "買い物" in out
+
+
+def test_calendar_year_and_range(tmp_path, capsys):
+    from src.cli.cli import main
+
+    store_path = tmp_path / "tasks.json"
+    store = Store(store_path)
+    store.add_task({"id": 1, "title": "会議", "due_date": "2026-03-05T09:00:00+09:00", "candidate_dates": []})
+
+    main(["--store", str(store_path), "calendar", "--year", "2026"])
+    out = capsys.readouterr().out
+    assert out.count("タスク一覧:") == 12
+    assert "2026-03-05: 会議" in out
+
+    main(["--store", str(store_path), "calendar", "--from", "2026-02", "--to", "2026-04"])
+    out = capsys.readouterr().out
+    assert out.count("タスク一覧:") == 3
+    assert "2026年 2月" in out and "2026年 4月" in out
@@ -0,0 +1,108 @@
+import json
+from datetime import date, timedelta
+
+from src.cli.cli import main
+from src.storage.store import Store
+
+
+def test_import_groups_locations_and_commits_once(tmp_path, monkeypatch, capsys):
+    today = date.today()
+    store_file = tmp_path / "tasks.json"
+    csv_file = tmp_path / "tasks.csv"
+    rows = [
+        ("会議", (today + timedelta(days=2)).isoformat(), "高", "東京都"),
+        ("買い物", (today + timedelta(days=3)).isoformat(), "中", "東京"),
+        ("散歩", (today + timedelta(days=1)).isoformat(), "低", "大阪"),
+        ("", "", "中", ""),
+        ("メモ", "", "", ""),
+    ]
+    csv_file.write_text("title,due,priority,location\n" + "\n".join(",".join(r) for r in rows) + "\n", encoding="utf-8")
+
+    geocoded, forecasts = [], []
+
+    def fake_geocode(name):
+        geocoded.append(name)
+        return [{"name": name, "latitude": 35.0 if "東京" in name else 34.7, "longitude": 139.0}]
+
+    def fake_weather(lat, lon, start, end, timezone="UTC"):
+        forecasts.append((lat, start, end))
+        out = {}
+        d = start
+        while d <= end:
+            out[d.isoformat()] = {"precipitation_probability": 10, "temperature": 15.0}
+            d += timedelta(days=1)
+        return out
+
+    monkeypatch.setattr("src.services.importer.geocode_place", fake_geocode)
+    monkeypatch.setattr("src.services.importer.timezone_for", lambda lat, lon: "Asia/Tokyo")
+    monkeypatch.setattr("src.services.importer.get_daily_weather", fake_weather)
+
+    main(["--store", str(store_file), "import", str(csv_file)])
+    out = capsys.readouterr().out
+    assert "4 件のタスクを追加しました (ID: 1-4)" in out
+    assert "4 件目をスキップしました" in out
+
+    assert sorted(geocoded) == ["大阪", "東京都"]
+    assert len(forecasts) == 2
+
+    store = Store(store_file)
+    tasks = {t["id"]: t for t in store.list_tasks()}
+    tokyo_days = [tasks[i]["candidate_dates"][0]["date"] for i in (1, 2)]
+    # tasks in the same batch do not share a candidate day
+    assert len(set(tokyo_days)) == 2
+    assert tasks[4]["candidate_dates"] == []
+
+    history = store.history()
+    assert len(history) == 1
+    assert history[0]["op"] == "import" and len(history[0]["entries"]) == 4
+
+    # the whole import is undone as one operation
+    store.undo()
+    assert store.list_tasks() == []
+
+
+def test_import_jsonl(tmp_path, capsys):
+    store_file = tmp_path / "tasks.json"
+    src = tmp_path / "tasks.jsonl"
+    src.write_text("\n".join(json.dumps(r, ensure_ascii=False) for r in [{"title": "a"}, {"title": "b", "priority": "高"}]), encoding="utf-8")
+    main(["--store", str(store_file), "import", str(src)])
+    assert "2 件のタスクを追加しました" in capsys.readouterr().out
+    assert [t["priority"] for t in Store(store_file).list_tasks()] == ["中", "高"]
+
+
+def test_import_keeps_forecast_range_inside_api_horizon(tmp_path, monkeypatch, capsys):
+    from src.services.weather import FORECAST_HORIZON_DAYS
+
+    today = date.today()
+    horizon = today + timedelta(days=FORECAST_HORIZON_DAYS - 1)
+    store_file = tmp_path / "tasks.json"
+    src = tmp_path / "tasks.jsonl"
+    src.write_text(json.dumps({"title": "遠足", "due": (today + timedelta(days=10)).isoformat(), "location": "札幌"}, ensure_ascii=False), encoding="utf-8")
+
+    def fake_weather(lat, lon, start, end, timezone="UTC"):
+        if end > horizon:
+            raise RuntimeError("range exceeds forecast horizon")
+        return {start.isoformat(): {"precipitation_probability": 10, "temperature": 15.0}}
+
+    monkeypatch.setattr("src.services.importer.geocode_place", lambda name: [{"name": name, "latitude": 43.0, "longitude": 141.3}])
+    monkeypatch.setattr("src.services.importer.timezone_for", lambda lat, lon: "Asia/Tokyo")
+    monkeypatch.setattr("src.services.importer.get_daily_weather", fake_weather)
+
+    main(["--store", str(store_file), "import", str(src)])
+    assert "天気予報を取得できませんでした" not in capsys.readouterr().out
+    assert Store(store_file).list_tasks()[0]["candidate_dates"][0]["date"] == today.isoformat()
+
+
+def test_import_jsonl_rejects_non_objects_and_stringifies_values(tmp_path, capsys):
+    store_file = tmp_path / "tasks.json"
+    src = tmp_path / "tasks.jsonl"
+    src.write_text('{"title": "a"}\n["x"]\n', encoding="utf-8")
+    main(["--store", str(store_file), "import", str(src)])
+    assert "入力エラー: 2 行目は JSON オブジェクトではありません。" in capsys.readouterr().out
+    assert Store(store_file).list_tasks() == []
+
+    src.write_text('{"title": 123, "priority": null}\n', encoding="utf-8")
+    main(["--store", str(store_file), "import", str(src)])
+    assert "1 件のタスクを追加しました" in capsys.readouterr().out
+    t = Store(store_file).list_tasks()[0]
+    assert (t["title"], t["priority"]) == ("123", "中")
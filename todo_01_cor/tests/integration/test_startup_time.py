@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+HEAVY = ("requests", "geopy", "dateparser", "timezonefinder")
+# cumulative import time budget for src.cli.cli, in milliseconds
+BUDGET_MS = float(os.environ.get("TODO_IMPORT_BUDGET_MS", "400"))
+
+
+def _importtime(argv):
+    code = "import sys; from src.cli.cli import main; main(sys.argv[1:])"
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code] + argv,
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    assert res.returncode == 0, res.stderr
+    modules = {}
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            modules[name.strip()] = int(cumulative.strip())
+        except ValueError:
+            continue
+    return modules
+
+
+@pytest.mark.parametrize("argv", [["list"], ["show", "1"]])
+def test_read_only_commands_skip_heavy_imports(tmp_path, argv):
+    store = tmp_path / "tasks.json"
+    modules = _importtime(["--store", str(store)] + argv)
+    loaded = sorted(m for m in modules if m.split(".")[0] in HEAVY)
+    assert loaded == [], f"read-only command imported {loaded}"
+    assert modules["src.cli.cli"] / 1000 < BUDGET_MS
@@ -0,0 +1,29 @@
+import json
+
+from benchmarks import bench_store
+from benchmarks.synthetic import make_store
+
+
+def test_synthetic_store_has_requested_size(tmp_path):
+    store = make_store(tmp_path / "tasks.json", 50)
+    tasks = store.list_tasks()
+    assert len(tasks) == 50
+    assert store.next_id() == 51
+    assert any(t["candidate_dates"] for t in tasks)
+
+
+def test_benchmark_emits_json_for_every_scenario(tmp_path):
+    out = tmp_path / "bench.json"
+    bench_store.main(["--sizes", "30", "--repeat", "1", "--out", str(out)])
+    report = json.loads(out.read_text(encoding="utf-8"))
+    assert {r["scenario"] for r in report["results"]} == set(bench_store.SCENARIOS)
+    assert all(r["size"] == 30 and r["median_ms"] >= 0 for r in report["results"])
+    assert "python" in report["meta"]
+
+
+def test_benchmark_reports_concurrent_write_throughput(tmp_path):
+    out = tmp_path / "bench.json"
+    bench_store.main(["--sizes", "10", "--repeat", "1", "--scenarios", "list", "--writers", "2", "--writes", "3", "--out", str(out)])
+    report = json.loads(out.read_text(encoding="utf-8"))
+    assert report["concurrency"]["stored"] == report["concurrency"]["adds"] == 6
+    assert report["concurrency"]["adds_per_s"] > 0
@@ -12,4 +12,21 @@ def test_render_month_shows_task_days():
     assert "15*" in out or "15*" in out
     assert "2026-01-05" in out
     assert "会議" in out
-        # Removed stray end-patch marker
\ No newline at end of file
+
+
+def test_day_index_includes_candidates_and_range_renders_each_month():
+    from src.utils.calendar_renderer import build_day_index, render_range
+
+    tasks = [
+        {"id": 1, "title": "会議", "due_date": "2026-01-31T09:00:00+09:00", "candidate_dates": [{"date": "2026-02-02"}]},
+        {"id": 2, "title": "旅行", "due_date": "2026-03-10", "location": {"timezone": "Asia/Tokyo"}},
+    ]
+    index = build_day_index(tasks)
+    assert index[(2026, 1)] == {31: ["会議"]}
+    assert index[(2026, 2)] == {2: ["会議(候補)"]}
+
+    out = render_range((2025, 12), (2026, 3), tasks, timezone="Asia/Tokyo")
+    assert out.count("タスク一覧:") == 4
+    assert "2025年 12月" in out and "2026年 3月" in out
+    assert "2026-02-02: 会議(候補)" in out
+    assert "2026-03-10: 旅行" in out
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from src.storage.codecs import detect_codec, get_codec
+from src.storage.store import Store
+from src.utils.errors import StorageError
+
+
+def _sample_tasks(n=50):
+    return [{"id": i, "title": f"タスク{i}", "candidate_dates": [{"date": "2026-01-05"}]} for i in range(1, n + 1)]
+
+
+def test_default_codec_stays_human_readable(tmp_path):
+    fp = tmp_path / "tasks.json"
+    store = Store(fp)
+    store.add_task({"id": 1, "title": "会議"})
+    text = fp.read_text(encoding="utf-8")
+    assert "\n  " in text
+    assert "会議" in text
+
+
+def test_compact_codec_is_smaller_and_round_trips(tmp_path):
+    pretty = get_codec("json").encode({"tasks": _sample_tasks()})
+    compact = get_codec("compact").encode({"tasks": _sample_tasks()})
+    assert len(compact) < len(pretty)
+    assert json.loads(compact) == {"tasks": _sample_tasks()}
+
+
+def test_store_reads_file_written_in_another_format(tmp_path):
+    fp = tmp_path / "tasks.json"
+    Store(fp, codec="compact").add_task({"id": 1, "title": "a"})
+    assert "\n" not in fp.read_text(encoding="utf-8")
+
+    # a pretty store opens the compact file and rewrites it in its own format
+    store = Store(fp, codec="json")
+    assert store.get_task(1)["title"] == "a"
+    store.update_task(1, {"title": "b"})
+    assert "\n  " in fp.read_text(encoding="utf-8")
+
+
+def test_store_keeps_detected_format_without_explicit_codec(tmp_path, monkeypatch):
+    monkeypatch.delenv("TODO_STORE_CODEC", raising=False)
+    fp = tmp_path / "tasks.json"
+    Store(fp, codec="compact").add_task({"id": 1, "title": "a"})
+    assert detect_codec(fp.read_bytes()).name == "compact"
+
+    Store(fp).add_task({"id": 2, "title": "b"})
+    assert "\n" not in fp.read_text(encoding="utf-8")
+    assert detect_codec(fp.read_bytes()).name == "compact"
+
+    Store(tmp_path / "pretty.json").add_task({"id": 1, "title": "a"})
+    assert detect_codec((tmp_path / "pretty.json").read_bytes()).name == "json"
+
+
+def test_msgpack_codec_round_trip(tmp_path):
+    pytest.importorskip("msgpack")
+    fp = tmp_path / "tasks.json"
+    Store(fp, codec="msgpack").add_task({"id": 1, "title": "会議"})
+    raw = fp.read_bytes()
+    assert detect_codec(raw).name == "msgpack"
+    assert Store(fp).get_task(1)["title"] == "会議"
+
+
+def test_unknown_codec_raises(tmp_path):
+    with pytest.raises(StorageError):
+        Store(tmp_path / "tasks.json", codec="yaml")
+
+
+def test_atomic_write_leaves_no_temp_files(tmp_path):
+    store = Store(tmp_path / "tasks.json", codec="compact")
+    for i in range(1, 4):
+        store.add_task({"id": i, "title": str(i)})
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,91 @@
+from src.services import geocoding
+from src.utils import cache as cache_module
+from src.services.geocoding import GeocodeCache, geocode_place, normalize_query
+
+
+class _Loc:
+    def __init__(self, name):
+        self.raw = {"display_name": name}
+        self.address = name
+        self.latitude = "35.6895"
+        self.longitude = "139.6917"
+
+
+class _FakeGeolocator:
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    def geocode(self, name, **kw):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("offline")
+        return [_Loc("東京都, 日本")]
+
+
+def test_normalize_query_folds_width_case_space_and_aliases():
+    assert normalize_query("東京都") == normalize_query(" 東京 ") == "東京"
+    assert normalize_query("ＴＯＫＹＯ") == normalize_query("to kyo") == "tokyo"
+    assert normalize_query("港区") == "港区"
+    assert normalize_query("北海道") == "北海道"
+
+
+def test_prefecture_and_city_of_same_name_stay_apart():
+    assert normalize_query("京都府") != normalize_query("京都市")
+    assert normalize_query("大阪府") != normalize_query("大阪市")
+
+
+def test_prefecture_lookup_does_not_answer_city_lookup(tmp_path, monkeypatch):
+    fake = _FakeGeolocator()
+    monkeypatch.setattr(geocoding, "_geolocator", fake)
+    cache = GeocodeCache(tmp_path / "geocode.json")
+    geocode_place("京都府", cache=cache)
+    geocode_place("京都市", cache=cache)
+    assert fake.calls == 2
+
+
+def test_repeat_queries_hit_cache(tmp_path, monkeypatch):
+    fake = _FakeGeolocator()
+    monkeypatch.setattr(geocoding, "_geolocator", fake)
+    cache = GeocodeCache(tmp_path / "geocode.json")
+
+    first = geocode_place("東京都", cache=cache)
+    second = geocode_place("東京", cache=cache)
+    assert first == second and first[0]["latitude"] == 35.6895
+    assert fake.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # persisted across instances, including counters
+    again = GeocodeCache(tmp_path / "geocode.json")
+    geocode_place(" 東京 ", cache=again)
+    assert fake.calls == 1
+    assert again.stats == {"hits": 2, "misses": 1}
+
+
+def test_expired_and_failed_lookups(tmp_path, monkeypatch):
+    cache = GeocodeCache(tmp_path / "geocode.json", ttl=-1)
+    monkeypatch.setattr(geocoding, "_geolocator", _FakeGeolocator(fail=True))
+    assert geocode_place("東京", cache=cache) == []
+    assert cache.data.get("entries", {}) == {}
+
+    fake = _FakeGeolocator()
+    monkeypatch.setattr(geocoding, "_geolocator", fake)
+    geocode_place("東京", cache=cache)
+    geocode_place("東京", cache=cache)
+    assert fake.calls == 2
+
+
+def test_cli_caches_live_next_to_the_store(tmp_path, monkeypatch):
+    from src.cli.cli import main
+
+    monkeypatch.delenv("TODO_CACHE_DIR", raising=False)
+    monkeypatch.setattr(cache_module, "_cache_dir", None)
+    monkeypatch.setattr(geocoding, "_geolocator", _FakeGeolocator())
+    monkeypatch.setattr("src.cli.cli.timezone_for", lambda lat, lon: "Asia/Tokyo")
+    monkeypatch.chdir(tmp_path)
+    store_dir = tmp_path / "data"
+
+    main(["--store", str(store_dir / "tasks.json"), "add", "--title", "散歩", "--location", "東京"])
+
+    assert (store_dir / "cache" / "geocode.json").exists()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["data"]
@@ -0,0 +1,81 @@
+import json
+
+from src.storage.journal import Journal
+from src.storage.store import Store
+
+
+def test_update_records_only_changed_fields(tmp_path):
+    store = Store(tmp_path / "tasks.json")
+    store.add_task({"id": 1, "title": "a", "priority": "中", "candidate_dates": []})
+    store.update_task(1, {"title": "b", "priority": "中"})
+
+    last = store.history(limit=1)[0]
+    assert last["op"] == "update"
+    assert last["fields"] == ["title"]
+    assert last["before"] == {"title": "a"}
+    assert last["after"] == {"title": "b"}
+
+
+def test_ops_in_same_second_do_not_overwrite(tmp_path):
+    store = Store(tmp_path / "tasks.json")
+    for i in range(1, 6):
+        store.add_task({"id": i, "title": str(i)})
+    seqs = [e["seq"] for e in store.history()]
+    assert seqs == [1, 2, 3, 4, 5]
+
+
+def test_undo_reverts_update_remove_and_add(tmp_path):
+    store = Store(tmp_path / "tasks.json")
+    store.add_task({"id": 1, "title": "a"})
+    store.add_task({"id": 2, "title": "b"})
+    store.update_task(1, {"title": "changed", "due_date": "2026-01-05"})
+    store.remove_task(2)
+
+    assert store.undo()["op"] == "remove"
+    assert store.get_task(2)["title"] == "b"
+    assert store.undo()["op"] == "update"
+    t1 = store.get_task(1)
+    assert t1["title"] == "a" and "due_date" not in t1
+    assert store.undo()["op"] == "add"
+    assert store.get_task(2) is None
+    assert store.undo()["op"] == "add"
+    assert store.list_tasks() == []
+    assert store.undo() is None
+
+
+def test_replay_matches_store_and_compaction_bounds_files(tmp_path):
+    fp = tmp_path / "tasks.json"
+    store = Store(fp)
+    store.journal = Journal(store.journal_dir, checkpoint_every=5, keep_checkpoints=2)
+    for i in range(1, 16):
+        store.add_task({"id": i, "title": str(i)})
+        if i % 3 == 0:
+            store.update_task(i, {"title": f"u{i}"})
+        if i % 4 == 0:
+            store.remove_task(i - 1)
+
+    on_disk = json.loads(fp.read_text(encoding="utf-8"))
+    replayed = store.journal.state_at()
+    assert sorted(t["id"] for t in replayed["tasks"]) == sorted(t["id"] for t in on_disk["tasks"])
+    assert {t["id"]: t["title"] for t in replayed["tasks"]} == {t["id"]: t["title"] for t in on_disk["tasks"]}
+
+    cps = store.journal.checkpoints()
+    assert len(cps) == 2
+    assert all(e["seq"] > cps[0][0] for e in store.journal.entries())
+
+
+def test_stores_in_same_directory_keep_separate_journals(tmp_path):
+    a = Store(tmp_path / "a.json")
+    b = Store(tmp_path / "b.json")
+    a.add_task({"id": 1, "title": "a1"})
+    b.add_task({"id": 1, "title": "b1"})
+    b.update_task(1, {"title": "b1'"})
+
+    assert [e["op"] for e in a.history()] == ["add"]
+    assert a.undo()["after"]["title"] == "a1"
+    assert a.list_tasks() == []
+    assert b.get_task(1)["title"] == "b1'"
+
+    assert [t["title"] for t in b.journal.state_at(1)["tasks"]] == ["b1"]
+    assert a.journal.state_at()["tasks"] == []
+    assert a.journal_dir != b.journal_dir
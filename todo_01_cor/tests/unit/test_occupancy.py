@@ -0,0 +1,46 @@
+import json
+from datetime import date, timedelta
+
+from src.scheduler import candidate_selector
+from src.scheduler.candidate_selector import select_candidate_dates
+from src.storage.store import Store
+
+
+def test_occupancy_index_tracks_mutations(tmp_path):
+    fp = tmp_path / "tasks.json"
+    store = Store(fp)
+    store.add_task({"id": 1, "title": "a", "candidate_dates": [{"date": "2026-01-05"}]})
+    store.add_task({"id": 2, "title": "b", "candidate_dates": [{"date": "2026-01-05T09:00:00+09:00"}, {"date": "2026-01-06"}]})
+    assert store.tasks_on("2026-01-05") == [1, 2]
+    assert store.occupied_dates(date(2026, 1, 1), date(2026, 1, 31)) == {"2026-01-05", "2026-01-06"}
+
+    store.update_task(2, {"candidate_dates": [{"date": "2026-01-07"}]})
+    assert store.tasks_on("2026-01-05") == [1]
+    assert store.tasks_on("2026-01-06") == []
+    store.remove_task(1)
+    assert store.occupied_dates(date(2026, 1, 1), date(2026, 1, 31)) == {"2026-01-07"}
+
+    # persisted alongside the tasks
+    assert json.loads(fp.read_text(encoding="utf-8"))["occupancy"] == {"2026-01-07": [2]}
+
+
+def test_occupancy_built_for_legacy_file(tmp_path):
+    fp = tmp_path / "tasks.json"
+    fp.write_text(json.dumps({"tasks": [{"id": 3, "title": "x", "candidate_dates": [{"date": "2026-02-01"}]}]}), encoding="utf-8")
+    assert Store(fp).tasks_on("2026-02-01") == [3]
+
+
+def test_selector_uses_given_store(tmp_path, monkeypatch):
+    today = date.today()
+    days = [(today + timedelta(days=i)).isoformat() for i in range(3)]
+
+    def fake_weather(lat, lon, start, end, timezone="UTC"):
+        return {d: {"precipitation_probability": p, "temperature": 10.0} for d, p in zip(days, [0, 10, 20])}
+
+    monkeypatch.setattr(candidate_selector, "get_daily_weather", fake_weather)
+    store = Store(tmp_path / "tasks.json")
+    store.add_task({"id": 1, "title": "a", "candidate_dates": [{"date": days[0]}]})
+
+    due = (today + timedelta(days=2)).isoformat() + "T09:00:00"
+    out = select_candidate_dates(due, {"latitude": 35.0, "longitude": 139.0, "timezone": "Asia/Tokyo"}, store=store)
+    assert [c["date"] for c in out] == [days[1]]
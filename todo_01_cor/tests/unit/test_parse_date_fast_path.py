@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from src.utils import parse_date as pd
+from src.utils.parse_date import parse_date
+
+
+@pytest.fixture
+def no_dateparser(monkeypatch):
+    pd._parse_cached.cache_clear()
+
+    def boom(*a, **kw):
+        raise AssertionError("dateparser path should not be used")
+
+    monkeypatch.setattr(pd, "_slow_parse", boom)
+    yield
+    pd._parse_cached.cache_clear()
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("2026-01-05", "2026-01-05T00:00:00+09:00"),
+    ("2026-01-05T09:00", "2026-01-05T09:00:00+09:00"),
+    ("2026-01-05T09:00:00+00:00", "2026-01-05T18:00:00+09:00"),
+    ("2026/01/05 14:00", "2026-01-05T14:00:00+09:00"),
+    ("2026/1/5 9:00", "2026-01-05T09:00:00+09:00"),
+])
+def test_absolute_formats_use_fast_path(no_dateparser, text, expected):
+    assert parse_date(text, timezone="Asia/Tokyo").isoformat() == expected
+
+
+def test_relative_formats_use_fast_path(no_dateparser):
+    tz = ZoneInfo("Asia/Tokyo")
+    today = datetime.now(tz).date()
+    assert parse_date("明後日", timezone="Asia/Tokyo").date() == today + timedelta(days=2)
+    assert parse_date("10日後", timezone="Asia/Tokyo").date() == today + timedelta(days=10)
+    d = parse_date("明日 9時30分", timezone="Asia/Tokyo")
+    assert (d.date(), d.hour, d.minute) == (today + timedelta(days=1), 9, 30)
+    nxt = parse_date("来週の金曜", timezone="Asia/Tokyo")
+    assert nxt.weekday() == 4 and 7 <= (nxt.date() - today).days <= 13 and nxt.hour == 9
+
+
+def test_invalid_dates_are_rejected_without_dateparser(no_dateparser):
+    assert parse_date("2026/13/40", timezone="Asia/Tokyo") is None
+
+
+def test_other_text_falls_back_and_results_are_cached():
+    pd._parse_cached.cache_clear()
+    first = parse_date("tomorrow", timezone="Asia/Tokyo")
+    second = parse_date("tomorrow", timezone="Asia/Tokyo")
+    assert first is not None and first is second
+    assert pd._parse_cached.cache_info().hits == 1
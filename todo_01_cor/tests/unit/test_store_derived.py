@@ -0,0 +1,36 @@
+import json
+
+from src.storage.store import Store
+
+
+def test_derived_fields_and_order_are_stored_on_write(tmp_path):
+    fp = tmp_path / "tasks.json"
+    store = Store(fp)
+    store.add_task({"id": 1, "title": "late", "due_date": "2026-03-01T09:00:00+09:00"})
+    store.add_task({"id": 2, "title": "none"})
+    store.add_task({"id": 3, "title": "early", "due_date": "2026-01-01T09:00:00+09:00", "candidate_dates": [{"date": "2025-12-30"}]})
+
+    raw = json.loads(fp.read_text(encoding="utf-8"))["tasks"]
+    assert [t["id"] for t in raw] == [3, 1, 2]
+    assert raw[0]["candidate_summary"] == "候補: 1件 (最良: 2025-12-30)"
+    assert raw[0]["best_candidate_date"] == "2025-12-30"
+    assert raw[1]["candidate_summary"] == "候補: 0件"
+
+    # moving a due date re-positions the task and refreshes derived fields
+    store.update_task(2, {"due_date": "2026-02-01T09:00:00+09:00", "candidate_dates": [{"date": "2026-01-31"}, {"date": "2026-02-01"}]})
+    tasks = store.list_tasks()
+    assert [t["id"] for t in tasks] == [3, 2, 1]
+    assert tasks[1]["candidate_summary"] == "候補: 2件 (最良: 2026-01-31)"
+
+
+def test_unsorted_legacy_file_is_normalised(tmp_path):
+    fp = tmp_path / "tasks.json"
+    fp.write_text(json.dumps({"tasks": [
+        {"id": 1, "title": "b", "due_date": "2026-02-01"},
+        {"id": 2, "title": "a", "due_date": "2026-01-01"},
+    ]}), encoding="utf-8")
+    store = Store(fp)
+    assert [t["id"] for t in store.list_tasks()] == [2, 1]
+    assert store.get_task(1)["candidate_summary"] == "候補: 0件"
+    store.add_task({"id": 3, "title": "c", "due_date": "2026-01-15"})
+    assert [t["id"] for t in json.loads(fp.read_text(encoding="utf-8"))["tasks"]] == [2, 3, 1]
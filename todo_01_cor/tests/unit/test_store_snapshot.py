@@ -0,0 +1,58 @@
+import json
+import os
+
+from src.storage.store import Store
+
+
+def test_snapshot_reused_until_file_changes(tmp_path, monkeypatch):
+    fp = tmp_path / "tasks.json"
+    store = Store(fp)
+    store.add_task({"id": 1, "title": "a", "candidate_dates": []})
+    store.add_task({"id": 2, "title": "b", "candidate_dates": []})
+
+    loads = []
+    real_decode = Store._decode_file
+
+    def counting_decode(self):
+        loads.append(1)
+        return real_decode(self)
+
+    monkeypatch.setattr(Store, "_decode_file", counting_decode)
+
+    # our own writes keep the snapshot warm: no re-parse
+    assert store.get_task(2)["title"] == "b"
+    assert store.next_id() == 3
+    assert len(store.list_tasks()) == 2
+    assert loads == []
+
+    # an external writer changes the file -> the next access reloads it
+    fp.write_text(json.dumps({"tasks": [{"id": 7, "title": "ext", "candidate_dates": []}]}), encoding="utf-8")
+    st = os.stat(fp)
+    os.utime(fp, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert store.get_task(1) is None
+    assert store.get_task(7)["title"] == "ext"
+    assert store.next_id() == 8
+    assert len(loads) == 1
+
+
+def test_returned_copies_do_not_leak_into_file(tmp_path):
+    fp = tmp_path / "tasks.json"
+    store = Store(fp)
+    store.add_task({"id": 1, "title": "a", "candidate_dates": [{"date": "2026-01-05"}]})
+    assert store.get_task(1)["candidate_summary"] == "候補: 1件 (最良: 2026-01-05)"
+    store.list_tasks()[0]["title"] = "mutated"
+    store.get_task(1)["title"] = "mutated"
+    store.update_task(1, {"priority": "高"})
+
+    raw = json.loads(fp.read_text(encoding="utf-8"))["tasks"][0]
+    assert raw["title"] == "a"
+    assert raw["priority"] == "高"
+
+
+def test_next_id_after_removing_max(tmp_path):
+    store = Store(tmp_path / "tasks.json")
+    assert store.next_id() == 1
+    store.add_task({"id": 1, "title": "a"})
+    store.add_task({"id": 2, "title": "b"})
+    store.remove_task(2)
+    assert store.next_id() == 2
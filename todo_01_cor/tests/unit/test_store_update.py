@@ -25,18 +25,18 @@ def test_add_update_remove_flow(tmp_path):
     assert t2["title"] == "買い物"
     assert t2["priority"] == "高"
 
-    # ensure backup files created
-    backups = list((store_path.parent / "backups").glob("tasks_backup_*.json"))
-    assert len(backups) >= 1
+    # ensure a base checkpoint and journal were created
+    checkpoints = list((store_path.parent / "backups" / "tasks").glob("checkpoint_*.json"))
+    assert len(checkpoints) >= 1
 
     # complete (remove)
     ok2 = store.remove_task(1)
     assert ok2
     assert store.get_task(1) is None
 
-    # history log exists
-    hist = store_path.parent / "backups" / "history.log"
+    # journal exists
+    hist = store_path.parent / "backups" / "tasks" / "journal.jsonl"
     assert hist.exists()
     with open(hist, "r", encoding="utf-8") as f:
         lines = [l.strip() for l in f.readlines() if l.strip()]
-    assert any('"op": "remove"' in l or '"op": "update"' in l for l in lines)
+    assert any('"op":"remove"' in l or '"op":"update"' in l for l in lines)
@@ -0,0 +1,37 @@
+from dataclasses import asdict
+
+import pytest
+
+from src.models.task import CandidateDate, Location, Task
+
+
+def _task():
+    return Task(
+        id=1,
+        title="公園清掃",
+        location=Location(name="東京", latitude=35.6895, longitude=139.6917, timezone="Asia/Tokyo"),
+        due_date="2026-01-05T09:00:00+09:00",
+        candidate_dates=[CandidateDate(date="2026-01-04", precipitation_probability=5, temperature=10.0, reason="low")],
+    )
+
+
+def test_to_dict_matches_asdict_and_round_trips():
+    t = _task()
+    d = t.to_dict()
+    assert d == asdict(t)
+    assert Task.from_dict(d) == t
+    assert Task(id=2, title="x").to_dict()["location"] is None
+
+
+def test_models_are_slotted():
+    t = _task()
+    with pytest.raises(AttributeError):
+        t.extra = 1
+    assert not hasattr(t, "__dict__")
+    assert not hasattr(t.location, "__dict__")
+
+
+def test_from_dict_fills_missing_timestamps_once():
+    t = Task.from_dict({"id": 3, "title": "a"})
+    assert t.created_at == t.updated_at
+    assert t.location is None and t.candidate_dates == []
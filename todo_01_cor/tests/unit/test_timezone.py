@@ -0,0 +1,37 @@
+from src.services import timezone as tzmod
+
+
+class _CountingFinder:
+    def __init__(self):
+        self.calls = 0
+
+    def timezone_at(self, lng, lat):
+        self.calls += 1
+        return "Asia/Tokyo"
+
+
+def test_finder_shared_and_lookups_memoised(monkeypatch):
+    fake = _CountingFinder()
+    monkeypatch.setattr(tzmod, "_finder", fake)
+    tzmod.clear_cache()
+
+    assert tzmod.timezone_for(35.68951, 139.69171) == "Asia/Tokyo"
+    # same point after rounding -> memo hit
+    assert tzmod.timezone_for(35.689512, 139.691708) == "Asia/Tokyo"
+    assert fake.calls == 1
+    assert tzmod.get_finder() is fake
+
+    tzmod.timezone_for(34.0, 135.0)
+    assert fake.calls == 2
+    tzmod.clear_cache()
+
+
+def test_memo_is_bounded(monkeypatch):
+    fake = _CountingFinder()
+    monkeypatch.setattr(tzmod, "_finder", fake)
+    monkeypatch.setenv("TODO_TZ_MEMO_SIZE", "3")
+    tzmod.clear_cache()
+    for i in range(10):
+        tzmod.timezone_for(float(i), 0.0)
+    assert len(tzmod._memo) == 3
+    tzmod.clear_cache()
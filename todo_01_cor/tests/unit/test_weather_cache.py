@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+
+from src.services import weather
+from src.services.weather import ForecastCache, get_daily_weather
+
+
+class _Resp:
+    def __init__(self, params):
+        start = date.fromisoformat(params["start_date"])
+        end = date.fromisoformat(params["end_date"])
+        self.days = []
+        d = start
+        while d <= end:
+            self.days.append(d.isoformat())
+            d += timedelta(days=1)
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        n = len(self.days)
+        return {"daily": {
+            "time": self.days,
+            "precipitation_probability_max": [10] * n,
+            "temperature_2m_max": [20.0] * n,
+            "temperature_2m_min": [10.0] * n,
+        }}
+
+
+def _fake_requests(monkeypatch):
+    calls = []
+
+    def fake_get(url, params=None, timeout=None):
+        calls.append(params)
+        return _Resp(params)
+
+    monkeypatch.setattr(weather.requests, "get", fake_get)
+    return calls
+
+
+def test_same_city_batch_makes_one_request(tmp_path, monkeypatch):
+    calls = _fake_requests(monkeypatch)
+    cache = ForecastCache(tmp_path / "forecast.json", ttl=3600)
+    today = date.today()
+    for i in range(5):
+        # nearby coordinates quantize to the same cache key
+        out = get_daily_weather(35.6895 + i * 0.0001, 139.6917, today, today + timedelta(days=3 + i), timezone="Asia/Tokyo", cache=cache)
+        assert len(out) == 4 + i
+        assert out[today.isoformat()] == {"precipitation_probability": 10, "temperature": 15.0}
+    assert len(calls) == 1
+
+    # persisted: a fresh cache instance on the same file still hits
+    again = ForecastCache(tmp_path / "forecast.json", ttl=3600)
+    get_daily_weather(35.69, 139.69, today, today + timedelta(days=2), timezone="Asia/Tokyo", cache=again)
+    assert len(calls) == 1
+
+
+def test_only_missing_days_are_fetched(tmp_path, monkeypatch):
+    calls = _fake_requests(monkeypatch)
+    cache = ForecastCache(tmp_path / "forecast.json", ttl=3600)
+    start = date.today() + timedelta(days=30)
+    get_daily_weather(1.0, 2.0, start, start + timedelta(days=2), cache=cache)
+    get_daily_weather(1.0, 2.0, start, start + timedelta(days=5), cache=cache)
+    assert len(calls) == 2
+    assert calls[1]["start_date"] == (start + timedelta(days=3)).isoformat()
+    assert calls[1]["end_date"] == (start + timedelta(days=5)).isoformat()
+
+
+def test_expired_entries_are_refetched(tmp_path, monkeypatch):
+    calls = _fake_requests(monkeypatch)
+    cache = ForecastCache(tmp_path / "forecast.json", ttl=0)
+    today = date.today()
+    get_daily_weather(1.0, 2.0, today, today, cache=cache)
+    cache.ttl = -1
+    get_daily_weather(1.0, 2.0, today, today, cache=cache)
+    assert len(calls) == 2
@@ -0,0 +1,70 @@
+"""Compare commit-heavy workloads on a default sqlite3 connection and the tuned one.
+
+baseline: sqlite3 defaults (rollback journal, synchronous=FULL) and one commit
+          per helper call, as every command did before the connection factory.
+tuned:    db.connect() pragmas (WAL, synchronous=NORMAL, ...) and each add flow
+          (ensure_location, forecast upserts, insert_task) in one transaction,
+          as `todo add` writes it once the forecasts have been fetched.
+
+Usage: python scripts/bench_db.py [--tasks N] [--days D]
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.db import db
+from src.services import weather
+
+
+def _baseline_connection(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    db.ensure_migrations(conn)
+    return conn
+
+
+def _add_flow(conn, i, days):
+    loc = {"name": f"場所{i % 20}", "latitude": 35.0 + i % 20, "longitude": 139.0, "timezone": "Asia/Tokyo"}
+    start = date.today()
+    forecasts = [
+        {"date": (start + timedelta(days=d)).isoformat(), "precipitation_prob": 10.0, "temp_min": 0.0, "temp_max": 5.0}
+        for d in range(days)
+    ]
+    with db.transaction(conn):
+        loc_id = db.ensure_location(conn, loc)
+        weather.store_forecasts(conn, loc_id, forecasts)
+        db.insert_task(conn, f"タスク{i}", "medium", loc_id, start + timedelta(days=days), forecasts[0]["date"])
+
+
+def run(label, open_conn, tasks, days):
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = open_conn(str(Path(tmp) / "bench.db"))
+        t0 = time.perf_counter()
+        for i in range(tasks):
+            _add_flow(conn, i, days)
+        elapsed = time.perf_counter() - t0
+        conn.close()
+    print(f"{label:<9} {tasks} adds: {elapsed * 1000:9.1f} ms  ({elapsed / tasks * 1000:.3f} ms/add)")
+    return elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--tasks", type=int, default=500)
+    ap.add_argument("--days", type=int, default=14, help="forecast days upserted per add")
+    args = ap.parse_args()
+
+    base = run("baseline", _baseline_connection, args.tasks, args.days)
+    tuned = run("tuned", db.connect, args.tasks, args.days)
+    print(f"speedup   {base / tuned:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
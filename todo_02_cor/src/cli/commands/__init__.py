@@ -3,5 +3,5 @@ import typer
 # Shared Typer app for all `todo` subcommands
 app = typer.Typer()
 # Eagerly import subcommand modules so they register with `app`
-from . import add, list, show, update, delete, calendar  # noqa: F401
+from . import add, list, show, update, delete, calendar, search, serve, maintenance  # noqa: F401
 
@@ -3,7 +3,7 @@ import typer
 
 from src.cli.commands import app
 from src.services import parser as date_parser
-from src.services import geocode, scheduler
+from src.services import geocode, scheduler, weather
 from src.db import db
 from src.lib.errors import UserError
 
@@ -22,23 +22,32 @@ def add_task(
         due_dt = date_parser.parse_natural_date(due, timezone=loc.get("timezone"))
     except Exception as e:
         raise UserError(f"日付解析に失敗しました: {e}")
-    # create location in DB or get existing
-    conn = db.connect()
-    loc_id = db.ensure_location(conn, loc)
+    conn = db.get_connection()
+    # Fetch the forecasts missing from the cache first, without writing, so the
+    # write lock is never held while waiting on Open-Meteo.
+    start, end = scheduler.search_span(due_dt)
+    pending = weather.PendingForecasts()
+    forecasts = scheduler.prefetch_forecasts(conn, loc, db.find_location(conn, loc), start, end, pending)
 
-    # scheduler selects candidate date
-    candidate = scheduler.select_candidate_for_location(conn, loc_id, due_dt)
-    candidate_label = "候補日"
-    if candidate is None:
-        # try proposing an alternative after due date
-        alt = scheduler.propose_alternative_date(conn, loc_id, due_dt)
-        if alt:
-            candidate = alt
-            candidate_label = "予備日"
-        else:
-            # fallback to due date itself
-            candidate = due_dt.date().isoformat()
+    # location, forecast cache upserts and the task are written in one transaction
+    with db.transaction(conn):
+        # create location in DB or get existing
+        loc_id = db.ensure_location(conn, loc)
+        pending.write(conn, loc_id)
 
-    task_id = db.insert_task(conn, title, priority, loc_id, due_dt, candidate)
+        # scheduler selects candidate date
+        candidate = scheduler.select_candidate_for_location(conn, loc_id, due_dt, forecasts=forecasts)
+        candidate_label = "候補日"
+        if candidate is None:
+            # try proposing an alternative after due date
+            alt = scheduler.propose_alternative_date(conn, loc_id, due_dt, forecasts=forecasts)
+            if alt:
+                candidate = alt
+                candidate_label = "予備日"
+            else:
+                # fallback to due date itself
+                candidate = due_dt.date().isoformat()
+
+        task_id = db.insert_task(conn, title, priority, loc_id, due_dt, candidate)
 
     typer.echo(f"タスク作成: ID={task_id}\nタイトル: {title}\n{candidate_label}: {candidate}")
@@ -4,6 +4,14 @@ import typer
 from src.cli.commands import app
 from src.db import db
 
+# The OR is answered by two expression-index range scans (idx_tasks_candidate_day,
+# idx_tasks_due_day); the date(...) expressions must match those indexes exactly.
+MONTH_TASKS_SQL = """
+    SELECT * FROM tasks
+    WHERE (date(candidate_date) BETWEEN ? AND ?) OR (date(due_date) BETWEEN ? AND ?)
+    ORDER BY date(candidate_date) ASC, created_at ASC
+"""
+
 
 @app.command("calendar")
 def calendar_view(month: str = typer.Option(None, help="Month in YYYY-MM format. Default: current month")):
@@ -28,14 +36,10 @@ def calendar_view(month: str = typer.Option(None, help="Month in YYYY-MM format.
         next_month = date(start.year, start.month + 1, 1)
     end = next_month - timedelta(days=1)
 
-    conn = db.connect()
+    conn = db.get_connection()
     cur = conn.cursor()
     cur.execute(
-        """
-        SELECT * FROM tasks
-        WHERE (date(candidate_date) BETWEEN ? AND ?) OR (date(due_date) BETWEEN ? AND ?)
-        ORDER BY date(candidate_date) ASC, created_at ASC
-        """,
+        MONTH_TASKS_SQL,
         (start.isoformat(), end.isoformat(), start.isoformat(), end.isoformat()),
     )
     rows = cur.fetchall()
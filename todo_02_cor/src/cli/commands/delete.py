@@ -6,7 +6,7 @@ from src.db import db
 @app.command("delete")
 def delete_task(task_id: int):
     """タスクを削除する"""
-    conn = db.connect()
+    conn = db.get_connection()
     row = db.get_task(conn, task_id)
     if not row:
         typer.echo("タスクが見つかりません。")
@@ -1,16 +1,55 @@
+from datetime import date
 from typing import Optional
 import typer
 from src.cli.commands import app
 from src.db import db
 
 
+def _parse_day(value: Optional[str], option: str) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        typer.echo(f"{option} の日付が不正です。例: 2025-12-01")
+        raise typer.Exit(code=1)
+
+
 @app.command("list")
-def list_tasks(sort: Optional[str] = typer.Option("date", help="date|priority|created")):
+def list_tasks(
+    sort: Optional[str] = typer.Option("date", help="date|priority|created"),
+    limit: Optional[int] = typer.Option(None, min=1, help="表示する最大件数"),
+    after: Optional[str] = typer.Option(None, help="前ページ末尾に表示されたカーソル（続きから表示）"),
+    location: Optional[str] = typer.Option(None, help="場所名で絞り込み（部分一致）"),
+    date_from: Optional[str] = typer.Option(None, "--from", help="締切がこの日以降 (YYYY-MM-DD)"),
+    date_to: Optional[str] = typer.Option(None, "--to", help="締切がこの日以前 (YYYY-MM-DD)"),
+    completed: Optional[bool] = typer.Option(None, "--completed/--pending", help="完了状態で絞り込み"),
+):
     """タスク一覧を表示する"""
-    conn = db.connect()
-    rows = db.list_tasks(conn, sort)
-    if not rows:
+    conn = db.get_connection()
+    try:
+        rows = db.iter_tasks(
+            conn,
+            sort,
+            limit=limit,
+            after=after,
+            location=location,
+            date_from=_parse_day(date_from, "--from"),
+            date_to=_parse_day(date_to, "--to"),
+            completed=completed,
+        )
+        # rows stream from the cursor: print as they arrive instead of collecting the table
+        shown = 0
+        last = None
+        for r in rows:
+            typer.echo(f"ID={r['id']} | {r['title']} | 候補日={r['candidate_date']} | 締切={r['due_date']} | 優先度={r['priority']}")
+            shown += 1
+            last = r
+    except ValueError as e:
+        typer.echo(str(e))
+        raise typer.Exit(code=1)
+    if not shown:
         typer.echo("タスクはありません。")
         return
-    for r in rows:
-        typer.echo(f"ID={r['id']} | {r['title']} | 候補日={r['candidate_date']} | 締切={r['due_date']} | 優先度={r['priority']}")
+    if limit is not None and shown == limit:
+        typer.echo(f"次のページ: --after {db.encode_cursor(last, sort)}")
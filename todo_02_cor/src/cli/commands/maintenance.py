@@ -0,0 +1,57 @@
+from datetime import timedelta
+from typing import Optional
+import typer
+
+from src.cli.commands import app
+from src.db import db, maintenance
+from src.services import weather
+
+# `todo db ...`: database maintenance
+db_app = typer.Typer(help="データベースの保守（統計・ANALYZE・VACUUM・予報キャッシュ削除）")
+app.add_typer(db_app, name="db")
+
+
+@db_app.command("stats")
+def stats():
+    """テーブルの行数・ページ数と予報キャッシュのヒット率を表示する"""
+    conn = db.get_connection()
+    s = maintenance.stats(conn)
+    typer.echo("テーブル:")
+    for name, t in s["tables"].items():
+        pages = f", {t['pages']} ページ" if t["pages"] is not None else ""
+        typer.echo(f"  {name}: {t['rows']} 行{pages}")
+    size_kib = s["page_count"] * s["page_size"] / 1024
+    typer.echo(f"ページ: {s['page_count']} × {s['page_size']} バイト ({size_kib:.0f} KiB), 空きページ {s['freelist_count']}")
+    typer.echo(f"auto_vacuum: {s['auto_vacuum']}")
+    cache = s["forecast_cache"]
+    ratio = f"{cache['hit_ratio'] * 100:.1f}%" if cache["hit_ratio"] is not None else "-"
+    typer.echo(f"予報キャッシュ: ヒット {cache['hits']} 日 / ミス {cache['misses']} 日 (ヒット率 {ratio})")
+
+
+@db_app.command("analyze")
+def analyze():
+    """ANALYZE と PRAGMA optimize でクエリプランナーの統計を更新する"""
+    conn = db.get_connection()
+    maintenance.analyze(conn)
+    typer.echo("統計情報を更新しました。")
+
+
+@db_app.command("vacuum")
+def vacuum(pages: Optional[int] = typer.Option(None, min=1, help="解放する最大ページ数（既定: すべて）")):
+    """空きページをファイルから解放する（incremental vacuum）"""
+    conn = db.get_connection()
+    result = maintenance.vacuum(conn, pages)
+    if result["full"]:
+        typer.echo("auto_vacuum を incremental に切り替えるため、全体を VACUUM しました。")
+    typer.echo(f"{result['freed_pages']} ページを解放しました（残りの空きページ {result['free_after']}）。")
+
+
+@db_app.command("prune")
+def prune(
+    max_age_hours: float = typer.Option(None, "--max-age-hours", help="この時間より古い予報キャッシュを削除（既定: TODO_FORECAST_MAX_AGE_HOURS または 6）"),
+):
+    """期限切れ・過去日の予報キャッシュを削除する"""
+    max_age = timedelta(hours=max_age_hours) if max_age_hours is not None else None
+    conn = db.get_connection()
+    removed = weather.prune_forecasts(conn, max_age=max_age)
+    typer.echo(f"予報キャッシュを {removed} 件削除しました。")
@@ -0,0 +1,22 @@
+import typer
+from src.cli.commands import app
+from src.db import db
+
+
+@app.command("search")
+def search_tasks(
+    query: str = typer.Argument(..., help="検索語（空白区切りはすべて含むものを検索）"),
+    limit: int = typer.Option(20, min=1, help="表示する最大件数"),
+):
+    """タイトルと場所名からタスクを全文検索する（関連度順）"""
+    conn = db.get_connection()
+    try:
+        rows = db.search_tasks(conn, query, limit=limit)
+    except ValueError as e:
+        typer.echo(str(e))
+        raise typer.Exit(code=1)
+    if not rows:
+        typer.echo("一致するタスクはありません。")
+        return
+    for r in rows:
+        typer.echo(f"ID={r['id']} | {r['title']} | 場所={r['location_name']} | 候補日={r['candidate_date']} | 締切={r['due_date']}")
@@ -0,0 +1,25 @@
+import socket
+from typing import Optional
+import typer
+
+from src.cli import daemon
+from src.cli.commands import app
+
+
+@app.command("serve")
+def serve(
+    socket_path: Optional[str] = typer.Option(None, "--socket", help="ソケットのパス（既定: TODO_SOCKET または <DB>.sock）"),
+):
+    """常駐デーモンを起動する。起動中は他の todo コマンドがデーモン経由で実行される（Unix のみ）"""
+    if not hasattr(socket, "AF_UNIX"):
+        typer.echo("この環境では Unix ソケットが使えないため、デーモンは起動できません。")
+        raise typer.Exit(code=1)
+    path = socket_path or daemon.socket_path()
+    try:
+        server = daemon.bind(path)
+    except RuntimeError as e:
+        typer.echo(str(e))
+        raise typer.Exit(code=1)
+    typer.echo(f"デーモンを起動しました: {path} （Ctrl+C で停止）")
+    daemon.serve(path, server)
+    typer.echo("デーモンを停止しました。")
@@ -14,7 +14,7 @@ def update_task(
     complete: bool = typer.Option(False),
 ):
     """タスクを更新する。--complete true で完了（削除）。"""
-    conn = db.connect()
+    conn = db.get_connection()
     task = db.get_task(conn, task_id)
     if not task:
         typer.echo("タスクが見つかりません。")
@@ -33,13 +33,14 @@ def update_task(
     if due:
         due_dt = date_parser.parse_natural_date(due)
         updates['due_date'] = due_dt
-    if location:
-        loc = geocode.geocode_location(location)
-        loc_id = db.ensure_location(conn, loc)
-        updates['location_id'] = loc_id
 
-    if updates:
-        db.update_task(conn, task_id, updates)
-        typer.echo(f"タスク {task_id} を更新しました。")
-    else:
+    if not (updates or location):
         typer.echo("更新項目が指定されていません。")
+        return
+
+    loc = geocode.geocode_location(location) if location else None
+    with db.transaction(conn):
+        if loc:
+            updates['location_id'] = db.ensure_location(conn, loc)
+        db.update_task(conn, task_id, updates)
+    typer.echo(f"タスク {task_id} を更新しました。")
@@ -0,0 +1,202 @@
+"""Optional `todo serve` daemon.
+
+The daemon listens on a Unix socket next to the database and runs CLI commands
+in its own process, which keeps Typer/dateparser imported, the SQLite connection
+open (migrations checked once) and the HTTP session and geocode memo warm.
+`src.cli.main` forwards commands to it when it is running and otherwise runs
+them in-process, so the daemon is never required.
+
+Protocol: one JSON line per connection each way.
+    request:  {"argv": ["todo", "list", ...], "prog": "todo"}
+    response: {"exit_code": 0, "output": "..."}
+
+This module is imported on every CLI start, so only the standard library (and
+src.db, which is stdlib-only) may be imported at module level.
+"""
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import traceback
+from typing import List, Optional, Tuple
+
+from src.db import db
+
+# Client-side wait for the daemon's reply; commands that call the weather API
+# can take a while, so this is generous.
+REPLY_TIMEOUT = float(os.environ.get("TODO_DAEMON_TIMEOUT", "60"))
+
+
+def socket_path() -> str:
+    """TODO_SOCKET, or `<database path>.sock` so each database gets its own daemon."""
+    path = os.environ.get("TODO_SOCKET")
+    if path:
+        return path
+    return os.path.abspath(db.DB_PATH) + ".sock"
+
+
+def daemon_disabled() -> bool:
+    return os.environ.get("TODO_NO_DAEMON", "") not in ("", "0")
+
+
+def forward(argv: List[str], prog: str = "todo", path: Optional[str] = None) -> Optional[Tuple[int, str]]:
+    """Run `argv` in the daemon. Returns (exit_code, output), or None if no daemon is listening.
+
+    Once the request is sent, a missing or late reply raises OSError (including
+    socket.timeout) and a malformed one raises ValueError.
+    """
+    path = path or socket_path()
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(path)
+        except OSError:
+            # stale socket file left by a daemon that did not shut down cleanly
+            return None
+        sock.settimeout(REPLY_TIMEOUT)
+        request = json.dumps({"argv": argv, "prog": prog}, ensure_ascii=False) + "\n"
+        sock.sendall(request.encode("utf-8"))
+        with sock.makefile("rb") as reply:
+            line = reply.readline()
+        if not line:
+            raise ConnectionError("デーモンが応答せずに接続を閉じました")
+        response = json.loads(line.decode("utf-8"))
+    finally:
+        sock.close()
+    try:
+        return int(response["exit_code"]), response["output"]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"デーモンの応答が不正です: {e!r}") from e
+
+
+def run_command(argv: List[str], prog: str = "todo") -> Tuple[int, str]:
+    """Run one CLI invocation in this process, capturing its output and exit code."""
+    from src.cli.main import app
+
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(out):
+        try:
+            app(args=argv, prog_name=prog)
+            code = 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception as e:
+            # the in-process CLI would crash with a traceback; report the error instead
+            out.write("".join(traceback.format_exception_only(type(e), e)))
+            code = 1
+        finally:
+            # the connection outlives the command; never keep its write lock
+            db.rollback_connections()
+    return code, out.getvalue()
+
+
+def _warm_up():
+    # pay the one-off costs before the first request
+    from src.lib import http
+    from src.services import parser
+
+    db.get_connection()
+    http.session()
+    parser.parse_natural_date("明日")
+
+
+def _handle(conn: socket.socket):
+    with conn, conn.makefile("rb") as requests_in:
+        line = requests_in.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line.decode("utf-8"))
+            code, output = run_command(list(request["argv"]), request.get("prog") or "todo")
+        except (ValueError, KeyError, TypeError) as e:
+            code, output = 2, f"不正なリクエストです: {e}\n"
+        reply = json.dumps({"exit_code": code, "output": output}, ensure_ascii=False) + "\n"
+        conn.sendall(reply.encode("utf-8"))
+
+
+def bind(path: Optional[str] = None) -> socket.socket:
+    """Create the listening socket, refusing to start when another daemon owns `path`."""
+    path = path or socket_path()
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)  # stale
+        else:
+            raise RuntimeError(f"デーモンは既に起動しています: {path}")
+        finally:
+            probe.close()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)  # socket is readable/writable by the owner only
+    try:
+        server.bind(path)
+    finally:
+        os.umask(old_umask)
+    server.listen()
+    return server
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(path: Optional[str] = None, server: Optional[socket.socket] = None):
+    """Serve requests one at a time until interrupted; removes the socket file on exit.
+
+    Requests are handled sequentially on purpose: they share one SQLite
+    connection, and a single-user CLI never has enough concurrent calls to need more.
+    """
+    path = path or socket_path()
+    server = server or bind(path)
+    # the daemon serves the database it was started for, whatever its cwd later
+    db.DB_PATH = os.path.abspath(db.DB_PATH)
+    if threading.current_thread() is threading.main_thread():
+        # `kill` stops the daemon as cleanly as Ctrl+C, removing the socket file
+        signal.signal(signal.SIGTERM, _interrupt)
+    _warm_up()
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                break  # listening socket closed (shutdown)
+            try:
+                _handle(conn)
+            except OSError:
+                pass  # client went away mid-request
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+        db.close_connections()
+
+
+def main_forwarding(argv: List[str], prog: str) -> Optional[int]:
+    """Entry-point hook: forward to a running daemon and return its exit code, else None."""
+    if daemon_disabled() or not argv or argv[0] != "todo" or "serve" in argv[1:2]:
+        return None
+    try:
+        result = forward(argv, prog)
+    except (OSError, ValueError) as e:
+        # the daemon received the command and may already have applied it, so
+        # running it again in-process could repeat a write; report and stop
+        sys.stderr.write(
+            f"todo serve デーモンとの通信に失敗しました: {e}\n"
+            "コマンドが実行済みの可能性があります。結果を確認してから再実行してください。\n"
+        )
+        return 1
+    if result is None:
+        return None
+    code, output = result
+    sys.stdout.write(output)
+    sys.stdout.flush()
+    return code
@@ -1,13 +1,35 @@
-import typer
-from src.cli import commands
+import os
+import sys
 
-app = typer.Typer()
+from src.cli import daemon
 
-app.add_typer(commands.app, name="todo")
+_app = None
+
+
+def _build_app():
+    global _app
+    if _app is None:
+        import typer
+        from src.cli import commands
+
+        _app = typer.Typer()
+        _app.add_typer(commands.app, name="todo")
+    return _app
+
+
+def __getattr__(name):
+    # `app` is built on first access, so a call forwarded to the daemon never
+    # imports Typer or the command modules (and their dependencies)
+    if name == "app":
+        return _build_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def main():
-    app()
+    code = daemon.main_forwarding(sys.argv[1:], os.path.basename(sys.argv[0]))
+    if code is not None:
+        sys.exit(code)
+    _build_app()()
 
 
 if __name__ == "__main__":
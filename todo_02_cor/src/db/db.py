@@ -1,9 +1,85 @@
+import base64
+import json
+import os
+import re
 import sqlite3
-from datetime import datetime, timezone
-from typing import Optional
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterator, Optional, Tuple
 
 DB_PATH = "todo.db"
 
+# Connection tuning, each overridable with TODO_SQLITE_<NAME> (an empty value
+# keeps SQLite's own default). WAL + synchronous=NORMAL makes a commit an append
+# to the WAL without an fsync; durability is only lost for the last commits on
+# power failure, never consistency.
+PRAGMA_DEFAULTS = {
+    # only takes effect on a new database (or after a full VACUUM, see
+    # maintenance.vacuum); lets `todo db vacuum` return free pages incrementally
+    "auto_vacuum": "INCREMENTAL",
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": str(256 * 1024 * 1024),
+    "temp_store": "MEMORY",
+    "cache_size": "-16000",  # negative: KiB, i.e. ~16 MB of page cache
+}
+STATEMENT_CACHE_SIZE = int(os.environ.get("TODO_SQLITE_STATEMENT_CACHE", "256"))
+
+_PRAGMA_VALUE = re.compile(r"-?\w+")
+
+
+class Connection(sqlite3.Connection):
+    """sqlite3 connection whose commit() is deferred while inside `transaction()`.
+
+    The helpers below (and weather.store_forecasts) commit after each write so
+    they are safe to call on their own; grouping them in `transaction()` turns
+    those commits into one.
+    """
+
+    _tx_depth = 0
+
+    def commit(self):
+        if not self._tx_depth:
+            super().commit()
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection):
+    """Run the enclosed writes as one transaction: commit on success, roll back on error.
+
+    Nested blocks join the outermost one.
+    """
+    if not isinstance(conn, Connection):
+        # plain sqlite3 connections cannot defer commits; keep per-call commits
+        yield conn
+        return
+    conn._tx_depth += 1
+    try:
+        yield conn
+    except BaseException:
+        conn._tx_depth -= 1
+        if not conn._tx_depth:
+            conn.rollback()
+        raise
+    conn._tx_depth -= 1
+    if not conn._tx_depth:
+        conn.commit()
+
+
+def pragma_settings() -> Dict[str, str]:
+    settings = {}
+    for name, default in PRAGMA_DEFAULTS.items():
+        value = os.environ.get(f"TODO_SQLITE_{name.upper()}", default).strip()
+        if not value:
+            continue
+        # PRAGMA values cannot be bound as parameters, so only accept plain words/numbers
+        if not _PRAGMA_VALUE.fullmatch(value):
+            raise ValueError(f"TODO_SQLITE_{name.upper()} の値が不正です: {value!r}")
+        settings[name] = value
+    return settings
+
+
 def connect(path: Optional[str] = None):
     # Use the current DB_PATH when no explicit path is provided. We avoid
     # binding DB_PATH at function-definition time so tests can override the
@@ -13,14 +89,109 @@ def connect(path: Optional[str] = None):
 
     # Do not enable PARSE_DECLTYPES to avoid sqlite3 attempting to convert
     # timestamp-like strings (which may be date-only) into datetime objects.
-    conn = sqlite3.connect(path)
+    conn = sqlite3.connect(path, factory=Connection, cached_statements=STATEMENT_CACHE_SIZE)
     conn.row_factory = sqlite3.Row
+    for name, value in pragma_settings().items():
+        conn.execute(f"PRAGMA {name} = {value}")
     ensure_migrations(conn)
     return conn
 
-def ensure_migrations(conn: sqlite3.Connection):
-    cur = conn.cursor()
-    cur.execute(
+
+# (pid, thread, path) -> connection. sqlite3 connections may only be used by the
+# thread that opened them, and a forked child must not reuse its parent's.
+_connections: Dict[Tuple[int, int, str], Connection] = {}
+
+
+def _owner() -> Tuple[int, int]:
+    return os.getpid(), threading.get_ident()
+
+
+def get_connection(path: Optional[str] = None):
+    """Return this process's shared connection to `path` (default DB_PATH), opening it once.
+
+    CLI commands use this instead of connect() so tuning and the migration check
+    happen once per process. Use connect() when an independent connection is
+    needed, e.g. for a fresh ':memory:' database.
+    """
+    if path is None:
+        path = DB_PATH
+    key = _owner() + (str(path),)
+    conn = _connections.get(key)
+    if conn is None:
+        conn = _connections[key] = connect(path)
+    return conn
+
+
+def close_connections():
+    """Close the shared connections opened by the calling thread."""
+    owner = _owner()
+    for key in [k for k in _connections if k[:2] == owner]:
+        _connections.pop(key).close()
+
+
+def rollback_connections():
+    """Roll back a transaction a failed command left open on the calling thread's shared connections."""
+    owner = _owner()
+    for key, conn in _connections.items():
+        if key[:2] == owner and conn.in_transaction:
+            conn.rollback()
+
+
+def _create_task_search(conn: sqlite3.Connection):
+    """Full-text index over task titles and location names (see search_tasks).
+
+    The trigram tokenizer matches any substring of 3+ characters, which suits
+    Japanese text without word boundaries. Triggers keep it in sync with tasks
+    and locations; rowid is the task id. SQLite builds without FTS5 or trigram
+    (< 3.34) get no index and search_tasks scans with LIKE instead.
+    """
+    try:
+        conn.execute("CREATE VIRTUAL TABLE task_search USING fts5(title, location, tokenize = 'trigram')")
+    except sqlite3.OperationalError:
+        return
+    # rank = bm25 with title matches weighted above location matches
+    conn.execute("INSERT INTO task_search (task_search, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+    for statement in (
+        """
+        CREATE TRIGGER task_search_ai AFTER INSERT ON tasks BEGIN
+            INSERT INTO task_search (rowid, title, location)
+            VALUES (new.id, new.title, (SELECT name FROM locations WHERE id = new.location_id));
+        END
+        """,
+        """
+        CREATE TRIGGER task_search_ad AFTER DELETE ON tasks BEGIN
+            DELETE FROM task_search WHERE rowid = old.id;
+        END
+        """,
+        """
+        CREATE TRIGGER task_search_au AFTER UPDATE OF title, location_id ON tasks BEGIN
+            UPDATE task_search
+            SET title = new.title, location = (SELECT name FROM locations WHERE id = new.location_id)
+            WHERE rowid = old.id;
+        END
+        """,
+        """
+        CREATE TRIGGER task_search_location_au AFTER UPDATE OF name ON locations BEGIN
+            UPDATE task_search SET location = new.name
+            WHERE rowid IN (SELECT id FROM tasks WHERE location_id = new.id);
+        END
+        """,
+        """
+        INSERT INTO task_search (rowid, title, location)
+        SELECT t.id, t.title, l.name FROM tasks t LEFT JOIN locations l ON l.id = t.location_id
+        """,
+    ):
+        conn.execute(statement)
+
+
+# Numbered schema migrations. `PRAGMA user_version` records the last one applied,
+# so an up-to-date database costs a single PRAGMA read per connection. Never edit
+# a released migration; append a new one instead. A step is an SQL string or, when
+# it needs to branch, a callable taking the connection.
+MIGRATIONS = [
+    # 1: initial schema. IF NOT EXISTS so databases created before versioning
+    # (user_version 0 with the tables already present) are adopted as-is.
+    (
         """
         CREATE TABLE IF NOT EXISTS locations (
             id INTEGER PRIMARY KEY,
@@ -29,9 +200,7 @@ def ensure_migrations(conn: sqlite3.Connection):
             longitude REAL,
             timezone TEXT
         )
-        """
-    )
-    cur.execute(
+        """,
         """
         CREATE TABLE IF NOT EXISTS tasks (
             id INTEGER PRIMARY KEY,
@@ -44,9 +213,7 @@ def ensure_migrations(conn: sqlite3.Connection):
             created_at TIMESTAMP,
             updated_at TIMESTAMP
         )
-        """
-    )
-    cur.execute(
+        """,
         """
         CREATE TABLE IF NOT EXISTS forecasts (
             id INTEGER PRIMARY KEY,
@@ -57,20 +224,132 @@ def ensure_migrations(conn: sqlite3.Connection):
             temp_max REAL,
             fetched_at TIMESTAMP
         )
+        """,
+    ),
+    # 2: lookup indexes for the hot paths: ensure_location, the scheduler's
+    # per-location occupancy check, the forecast cache read and date ordering.
+    (
+        "CREATE INDEX IF NOT EXISTS idx_locations_name_coords ON locations (name, latitude, longitude)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_location_candidate ON tasks (location_id, candidate_date)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date)",
+        "CREATE INDEX IF NOT EXISTS idx_forecasts_location_date ON forecasts (location_id, date)",
+    ),
+    # 3: indexes shaped around the hot queries. The scheduler and calendar compare
+    # date(candidate_date)/date(due_date), which a plain column index cannot serve,
+    # so these are expression indexes (the expressions must match the queries
+    # verbatim). The forecast index covers the cache read so it never touches the
+    # table. Together they make the two migration-2 indexes below redundant.
+    (
+        "DROP INDEX IF EXISTS idx_tasks_location_candidate",
+        "DROP INDEX IF EXISTS idx_forecasts_location_date",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_location_candidate_day ON tasks (location_id, date(candidate_date))",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_candidate_day ON tasks (date(candidate_date))",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_due_day ON tasks (date(due_date))",
         """
-    )
+        CREATE INDEX IF NOT EXISTS idx_forecasts_location_date_cover
+        ON forecasts (location_id, date, precipitation_prob, temp_min, temp_max, fetched_at)
+        """,
+    ),
+    # 4: one forecast row per (location_id, date). The cache used to append a row
+    # per day on every API call; the table is rebuilt keyed on (location_id, date)
+    # WITHOUT ROWID, keeping the most recently fetched duplicate. The primary key
+    # now clusters rows exactly as the cache reads them, so the covering index
+    # from migration 3 is dropped along with the old table.
+    (
+        """
+        CREATE TABLE forecasts_keyed (
+            location_id INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            precipitation_prob REAL,
+            temp_min REAL,
+            temp_max REAL,
+            fetched_at TIMESTAMP,
+            PRIMARY KEY (location_id, date)
+        ) WITHOUT ROWID
+        """,
+        """
+        INSERT OR REPLACE INTO forecasts_keyed (location_id, date, precipitation_prob, temp_min, temp_max, fetched_at)
+        SELECT location_id, date, precipitation_prob, temp_min, temp_max, fetched_at FROM forecasts
+        WHERE location_id IS NOT NULL AND date IS NOT NULL
+        ORDER BY fetched_at ASC, id ASC
+        """,
+        "DROP TABLE forecasts",
+        "ALTER TABLE forecasts_keyed RENAME TO forecasts",
+    ),
+    # 5: `todo list` pages through tasks ordered by (sort column, id). An index on
+    # the column is ordered by (column, rowid) already, so each sort key gets one
+    # and a page is a short index range scan. due_date is covered by migration 2.
+    (
+        "CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks (created_at)",
+    ),
+    # 6: hit/miss counters for the caches (per cached day for forecasts), shown by
+    # `todo db stats`.
+    (
+        """
+        CREATE TABLE IF NOT EXISTS cache_stats (
+            name TEXT PRIMARY KEY,
+            hits INTEGER NOT NULL DEFAULT 0,
+            misses INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+    ),
+    # 7: FTS5 search over task titles and location names for `todo search`.
+    (_create_task_search,),
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def ensure_migrations(conn: sqlite3.Connection):
+    """Apply any migrations newer than the database's `user_version`.
+
+    Pending migrations and their version bumps run in a single transaction, so a
+    failure leaves the database at the version it started from. BEGIN IMMEDIATE
+    takes the write lock before re-reading the version, so two processes opening
+    a fresh database do not both apply the same migration.
+    """
+    if schema_version(conn) >= SCHEMA_VERSION:
+        return
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        current = schema_version(conn)
+        for version in range(current + 1, SCHEMA_VERSION + 1):
+            for statement in MIGRATIONS[version - 1]:
+                if callable(statement):
+                    statement(conn)
+                else:
+                    conn.execute(statement)
+            # PRAGMA does not accept bound parameters; version is an int we control
+            conn.execute(f"PRAGMA user_version = {version}")
+    except Exception:
+        conn.rollback()
+        raise
     conn.commit()
 
-def ensure_location(conn: sqlite3.Connection, loc: dict) -> int:
+def find_location(conn: sqlite3.Connection, loc: dict) -> Optional[int]:
+    """Return the id of a stored location with the same name and coordinates, if any."""
     cur = conn.cursor()
-    # check existing by name and coords
     cur.execute(
         "SELECT id FROM locations WHERE name = ? AND latitude = ? AND longitude = ?",
         (loc.get("name"), loc.get("latitude"), loc.get("longitude")),
     )
     row = cur.fetchone()
-    if row:
-        return int(row["id"])
+    return int(row["id"]) if row else None
+
+
+def ensure_location(conn: sqlite3.Connection, loc: dict) -> int:
+    # check existing by name and coords
+    loc_id = find_location(conn, loc)
+    if loc_id is not None:
+        return loc_id
+    cur = conn.cursor()
     cur.execute(
         "INSERT INTO locations (name, latitude, longitude, timezone) VALUES (?, ?, ?, ?)",
         (loc.get("name"), loc.get("latitude"), loc.get("longitude"), loc.get("timezone")),
@@ -108,15 +387,129 @@ def get_task(conn: sqlite3.Connection, task_id: int):
     cur.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
     return cur.fetchone()
 
+# `--sort` value -> column; the list is ordered by (column, id) so it can be paged
+SORT_COLUMNS = {"date": "due_date", "priority": "priority", "created": "created_at"}
+
+
+def encode_cursor(row, sort: str = "date") -> str:
+    """Opaque `--after` cursor for continuing a listing after `row`."""
+    col = SORT_COLUMNS.get(sort, "due_date")
+    raw = json.dumps([row[col], row["id"]], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[str], int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key, last_id = json.loads(raw.decode("utf-8"))
+        if key is not None and not isinstance(key, str):
+            raise TypeError(key)
+        return key, int(last_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"不正なカーソルです: {cursor}") from e
+
+
+def iter_tasks(
+    conn: sqlite3.Connection,
+    sort: str = "date",
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
+    location: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    completed: Optional[bool] = None,
+) -> Iterator[sqlite3.Row]:
+    """Yield tasks ordered by the sort key (then id), streaming from the SQLite cursor.
+
+    `after` is a cursor from encode_cursor(): keyset pagination resumes right after
+    that row with an index range scan, so every page costs the same however deep it
+    is. Filters run in SQL: `location` matches location names (substring), and
+    `date_from`/`date_to` bound the due date inclusively on the date as stored.
+    """
+    col = SORT_COLUMNS.get(sort, "due_date")
+    where = []
+    params: list = []
+    if location:
+        where.append("location_id IN (SELECT id FROM locations WHERE name LIKE ? ESCAPE '\\')")
+        params.append(_like_pattern(location))
+    if date_from is not None:
+        where.append("due_date >= ?")
+        params.append(date_from.isoformat())
+    if date_to is not None:
+        # stored values carry a time part, so compare against the start of the next day
+        where.append("due_date < ?")
+        params.append((date_to + timedelta(days=1)).isoformat())
+    if completed is not None:
+        where.append("completed = ?")
+        params.append(int(completed))
+    if after:
+        key, last_id = decode_cursor(after)
+        if key is None:
+            # NULLs sort first: the rest of the NULL run, then every non-NULL key
+            where.append(f"({col} IS NOT NULL OR id > ?)")
+            params.append(last_id)
+        else:
+            where.append(f"({col}, id) > (?, ?)")
+            params.extend([key, last_id])
+
+    sql = "SELECT * FROM tasks"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {col} ASC, id ASC"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    cur = conn.execute(sql, params)
+    for row in cur:
+        yield row
+
+
 def list_tasks(conn: sqlite3.Connection, sort: str = "date"):
-    cur = conn.cursor()
-    order = "due_date"
-    if sort == "priority":
-        order = "priority"
-    elif sort == "created":
-        order = "created_at"
-    cur.execute(f"SELECT * FROM tasks ORDER BY {order} ASC")
-    return cur.fetchall()
+    return list(iter_tasks(conn, sort))
+
+def _like_pattern(term: str) -> str:
+    return "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def has_task_search(conn: sqlite3.Connection) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'task_search'").fetchone() is not None
+
+
+def search_tasks(conn: sqlite3.Connection, query: str, limit: int = 20):
+    """Tasks whose title or location name contains every whitespace-separated term.
+
+    Terms of 3+ characters go through the task_search FTS5 index and results are
+    ranked by bm25; shorter terms (trigrams cannot index them) and databases
+    without the index fall back to LIKE filters. Rows carry the task columns plus
+    `location_name`.
+    """
+    terms = query.split()
+    if not terms:
+        raise ValueError("検索語を指定してください。")
+    use_fts = has_task_search(conn)
+    indexed = [t for t in terms if len(t) >= 3] if use_fts else []
+    scanned = [t for t in terms if t not in indexed]
+
+    sql = "SELECT t.*, l.name AS location_name FROM tasks t LEFT JOIN locations l ON l.id = t.location_id"
+    where = []
+    params: list = []
+    if indexed:
+        sql = (
+            "SELECT t.*, l.name AS location_name FROM task_search s "
+            "JOIN tasks t ON t.id = s.rowid LEFT JOIN locations l ON l.id = t.location_id"
+        )
+        # each term as a quoted phrase, so user input cannot form FTS5 query syntax
+        where.append("task_search MATCH ?")
+        params.append(" ".join('"' + t.replace('"', '""') + '"' for t in indexed))
+    for term in scanned:
+        where.append("(t.title LIKE ? ESCAPE '\\' OR l.name LIKE ? ESCAPE '\\')")
+        params.extend([_like_pattern(term)] * 2)
+    sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY s.rank, t.id" if indexed else " ORDER BY t.id"
+    sql += " LIMIT ?"
+    params.append(limit)
+    return conn.execute(sql, params).fetchall()
+
 
 def update_task(conn: sqlite3.Connection, task_id: int, updates: dict):
     cur = conn.cursor()
@@ -0,0 +1,84 @@
+import sqlite3
+from typing import Dict, Optional
+
+# tables reported by `todo db stats`, in display order
+TABLES = ("tasks", "locations", "forecasts")
+
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+
+def _pragma(conn: sqlite3.Connection, name: str):
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def table_pages(conn: sqlite3.Connection) -> Optional[Dict[str, int]]:
+    """Pages used per table, including its indexes; None if SQLite lacks the dbstat table."""
+    try:
+        rows = conn.execute(
+            "SELECT m.tbl_name, COUNT(*) FROM dbstat AS s "
+            "JOIN sqlite_master AS m ON m.name = s.name GROUP BY m.tbl_name"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    return {r[0]: r[1] for r in rows}
+
+
+def stats(conn: sqlite3.Connection) -> Dict:
+    """Row/page counts and cache counters for `todo db stats`."""
+    pages = table_pages(conn) or {}
+    tables = {}
+    for name in TABLES:
+        # name comes from TABLES, not user input
+        count = conn.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+        tables[name] = {"rows": count, "pages": pages.get(name)}
+
+    row = conn.execute("SELECT hits, misses FROM cache_stats WHERE name = 'forecasts'").fetchone()
+    hits, misses = (row[0], row[1]) if row else (0, 0)
+    lookups = hits + misses
+    return {
+        "tables": tables,
+        "page_size": _pragma(conn, "page_size"),
+        "page_count": _pragma(conn, "page_count"),
+        "freelist_count": _pragma(conn, "freelist_count"),
+        "auto_vacuum": AUTO_VACUUM_MODES.get(_pragma(conn, "auto_vacuum"), "unknown"),
+        "forecast_cache": {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / lookups if lookups else None,
+        },
+    }
+
+
+def analyze(conn: sqlite3.Connection) -> None:
+    """Refresh the planner statistics (sqlite_stat1) and let SQLite apply its own optimisations."""
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA optimize")
+    conn.commit()
+
+
+def vacuum(conn: sqlite3.Connection, pages: Optional[int] = None) -> Dict:
+    """Return free pages to the filesystem.
+
+    With auto_vacuum=INCREMENTAL (the default for databases created since it was
+    enabled) this frees up to `pages` pages (all when None) without rewriting the
+    file. Older databases are switched over with one full VACUUM, after which later
+    runs are incremental.
+    """
+    if conn.in_transaction:
+        conn.commit()
+    before = _pragma(conn, "freelist_count")
+    page_count = _pragma(conn, "page_count")
+    full = _pragma(conn, "auto_vacuum") != 2
+    if full:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+    else:
+        # executescript steps the pragma to completion; execute() would free a single page
+        limit = "" if pages is None else f"({int(pages)})"
+        conn.executescript(f"PRAGMA incremental_vacuum{limit};")
+    return {
+        "full": full,
+        "freed_pages": page_count - _pragma(conn, "page_count"),
+        "free_before": before,
+        "free_after": _pragma(conn, "freelist_count"),
+    }
@@ -0,0 +1,11 @@
+import requests
+
+_session = None
+
+
+def session() -> requests.Session:
+    """Process-wide HTTP session, so repeated API calls reuse pooled keep-alive connections."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
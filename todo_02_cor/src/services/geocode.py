@@ -1,10 +1,20 @@
-import requests
+from functools import lru_cache
+
+from src.lib import http
 
 GEOCODE_URL = "https://geocoding-api.open-meteo.com/v1/search"
 
 def geocode_location(name: str) -> dict:
+    # copy so callers cannot modify the memoised result
+    return dict(_lookup(name))
+
+
+# Results are memoised for the life of the process, which matters for the
+# long-running `todo serve` daemon. Failed lookups raise and are not cached.
+@lru_cache(maxsize=256)
+def _lookup(name: str) -> dict:
     params = {"name": name, "count": 1, "language": "ja"}
-    r = requests.get(GEOCODE_URL, params=params, timeout=10)
+    r = http.session().get(GEOCODE_URL, params=params, timeout=10)
     r.raise_for_status()
     data = r.json()
     results = data.get("results") or []
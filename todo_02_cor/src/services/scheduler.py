@@ -1,16 +1,32 @@
 from datetime import datetime, timedelta, date
-from typing import Optional
+from typing import Dict, List, Optional, Set, Tuple
 from src.services import weather
 
+# Served by idx_tasks_location_candidate_day; keep date(candidate_date) in sync with it.
+OCCUPIED_DAYS_SQL = (
+    "SELECT DISTINCT date(candidate_date) AS day FROM tasks "
+    "WHERE location_id = ? AND date(candidate_date) BETWEEN ? AND ?"
+)
 
-def select_candidate_for_location(conn, location_id: int, due_dt: datetime) -> Optional[str]:
-    """Select a candidate date (ISO YYYY-MM-DD) for the given location and due datetime.
 
-    Policy (T025):
-    - Within the window from today..due_date, pick the day with lowest precipitation probability
-      that does NOT already have a task assigned for the same `location_id` (先着順).
-    - If all good days are occupied, return None to signal no available candidate inside the window
-      (caller may then ask for a post-due alternative — T026).
+def occupied_days(conn, location_id: int, forecasts: List[Dict]) -> Set[str]:
+    """Return the days (ISO YYYY-MM-DD) within the forecast span already taken at `location_id`.
+
+    One indexed range query for the whole window instead of a COUNT(*) per day.
+    """
+    days = [f["date"] for f in forecasts if f.get("date")]
+    if not days:
+        return set()
+    cur = conn.cursor()
+    cur.execute(OCCUPIED_DAYS_SQL, (location_id, min(days), max(days)))
+    return {r["day"] for r in cur.fetchall()}
+
+
+def location_forecasts(conn, location_id: int, start: date, end: date) -> List[Dict]:
+    """Daily forecasts for a stored location, read through the `forecasts` cache.
+
+    Every scheduler entry point goes through here so they share the cache and
+    only fetch the days it is missing.
     """
     cur = conn.cursor()
     cur.execute("SELECT latitude, longitude, timezone FROM locations WHERE id = ?", (location_id,))
@@ -21,22 +37,86 @@ def select_candidate_for_location(conn, location_id: int, due_dt: datetime) -> O
     lon = row["longitude"]
     tz = row["timezone"] or "UTC"
 
-    # Search window: from today up to and including the due date
+    # Some tests monkeypatch `fetch_daily_forecast` without the `conn`/`location_id`
+    # kwargs, so attempt a call with caching and fall back to a plain call if the
+    # target doesn't accept those parameters. The timezone is passed positionally
+    # because such replacements name that parameter `timezone`.
+    # timezoneという引数名をtz_nameに変更した。ライブラリ側のtimezoneと被るため。
+    try:
+        return weather.fetch_daily_forecast(lat, lon, start, end, tz, conn=conn, location_id=location_id)
+    except TypeError:
+        return weather.fetch_daily_forecast(lat, lon, start, end, tz)
+
+
+def prefetch_forecasts(conn, loc: Dict, location_id: Optional[int], start: date, end: date, pending) -> List[Dict]:
+    """Like location_forecasts, but for a location that may not be stored yet and without writing.
+
+    Cached days are read, missing ones requested, and the new rows are left in
+    `pending` (weather.PendingForecasts) for the caller to write in its transaction.
+    """
+    tz = loc.get("timezone") or "UTC"
+    # same fallback as location_forecasts for replacements without the extra kwargs
+    try:
+        return weather.fetch_daily_forecast(loc["latitude"], loc["longitude"], start, end, tz, conn=conn, location_id=location_id, pending=pending)
+    except TypeError:
+        return weather.fetch_daily_forecast(loc["latitude"], loc["longitude"], start, end, tz)
+
+
+def due_window(due_dt: datetime) -> Tuple[date, date]:
+    """Days searched by select_candidate_for_location: today up to and including the due date."""
     start = date.today()
     end = due_dt.date()
     if start > end:
         # If due date is in the past relative to today, just use due_date as single-day window
         start = end
+    return start, end
 
-    # Use weather service with caching support when available. Some tests monkeypatch
-    # `fetch_daily_forecast` without the `conn`/`location_id` kwargs, so attempt a
-    # call with caching and fall back to a plain call if the target doesn't accept
-    # those parameters.
-    # timezoneという引数名をtz_nameに変更した。ライブラリ側のtimezoneと被るため。
-    try:
-        forecasts = weather.fetch_daily_forecast(lat, lon, start, end, tz_name=tz, conn=conn, location_id=location_id)
-    except TypeError:
-        forecasts = weather.fetch_daily_forecast(lat, lon, start, end, tz_name=tz)
+
+def alternative_window(due_dt: datetime, max_days: int = 14) -> Optional[Tuple[date, date]]:
+    """Days searched by propose_alternative_date, or None when there are none."""
+    start = due_dt.date() + timedelta(days=1)
+    today = date.today()
+    api_limit_date = today + timedelta(days=14)
+    target_end = due_dt.date() + timedelta(days=max_days)
+    end = min(target_end, api_limit_date)
+    if start > end:
+        return None
+    return start, end
+
+
+def search_span(due_dt: datetime, max_days: int = 14) -> Tuple[date, date]:
+    """One range covering both windows, so a single prefetch serves the whole add flow."""
+    start, end = due_window(due_dt)
+    alt = alternative_window(due_dt, max_days)
+    if alt:
+        end = max(end, alt[1])
+    return start, end
+
+
+def _within(forecasts: List[Dict], start: date, end: date) -> List[Dict]:
+    lo, hi = start.isoformat(), end.isoformat()
+    return [f for f in forecasts if f.get("date") and lo <= f["date"] <= hi]
+
+
+def select_candidate_for_location(conn, location_id: int, due_dt: datetime, forecasts: Optional[List[Dict]] = None) -> Optional[str]:
+    """Select a candidate date (ISO YYYY-MM-DD) for the given location and due datetime.
+
+    Policy (T025):
+    - Within the window from today..due_date, pick the day with lowest precipitation probability
+      that does NOT already have a task assigned for the same `location_id` (先着順).
+    - If all good days are occupied, return None to signal no available candidate inside the window
+      (caller may then ask for a post-due alternative — T026).
+
+    `forecasts` may be passed when they were fetched beforehand (see search_span);
+    only the days inside the window are considered.
+    """
+    # Search window: from today up to and including the due date
+    start, end = due_window(due_dt)
+
+    if forecasts is None:
+        forecasts = location_forecasts(conn, location_id, start, end)
+    else:
+        forecasts = _within(forecasts, start, end)
     if not forecasts:
         return None
 
@@ -49,67 +129,42 @@ def select_candidate_for_location(conn, location_id: int, due_dt: datetime) -> O
 
     sorted_forecasts = sorted(forecasts, key=sort_key)
 
+    # Days already assigned to a task for the same location (first come, first served)
+    taken = occupied_days(conn, location_id, forecasts)
     for f in sorted_forecasts:
         cand_date = f.get("date")  # ISO string like 'YYYY-MM-DD'
-        if not cand_date:
-            continue
-
-        # Check whether any task already has this candidate_date for the same location
-        # Use SQLite date(...) wrapper to compare date portion safely
-        cur.execute(
-            "SELECT COUNT(*) as cnt FROM tasks WHERE date(candidate_date) = ? AND location_id = ?",
-            (cand_date, location_id),
-        )
-        row = cur.fetchone()
-        taken = int(row["cnt"]) if row else 0
-        if taken == 0:
+        if cand_date and cand_date not in taken:
             return cand_date
 
     # No free day found within the due-date window
     return None
 
 
-def propose_alternative_date(conn, location_id: int, due_dt: datetime, max_days: int = 14) -> Optional[str]:
+def propose_alternative_date(conn, location_id: int, due_dt: datetime, max_days: int = 14, forecasts: Optional[List[Dict]] = None) -> Optional[str]:
     """When no free candidate exists before or on the due date, search after the due date
     for the earliest available day (up to `max_days` after due date).
 
     Returns ISO date string or None if no free day found within the window.
     """
-    cur = conn.cursor()
-    cur.execute("SELECT latitude, longitude, timezone FROM locations WHERE id = ?", (location_id,))
-    row = cur.fetchone()
-    if not row:
-        raise ValueError("Location not found")
-    lat = row["latitude"]
-    lon = row["longitude"]
-    tz = row["timezone"] or "UTC"
-
-    start = due_dt.date() + timedelta(days=1)
-    today = date.today()
-    api_limit_date = today + timedelta(days=14)
-    target_end = due_dt.date() + timedelta(days=max_days)
-    end = min(target_end, api_limit_date)
-    if start > end:
+    window = alternative_window(due_dt, max_days)
+    if window is None:
         return None
+    start, end = window
 
-    forecasts = weather.fetch_daily_forecast(lat, lon, start, end, tz_name=tz)
+    if forecasts is None:
+        forecasts = location_forecasts(conn, location_id, start, end)
+    else:
+        forecasts = _within(forecasts, start, end)
     if not forecasts:
         return None
 
     # Prefer earliest date that is not taken (first-come availability)
     # We'll iterate by ascending date
     sorted_by_date = sorted(forecasts, key=lambda f: f.get("date"))
+    taken = occupied_days(conn, location_id, forecasts)
     for f in sorted_by_date:
         cand_date = f.get("date")
-        if not cand_date:
-            continue
-        cur.execute(
-            "SELECT COUNT(*) as cnt FROM tasks WHERE date(candidate_date) = ? AND location_id = ?",
-            (cand_date, location_id),
-        )
-        r = cur.fetchone()
-        taken = int(r["cnt"]) if r else 0
-        if taken == 0:
+        if cand_date and cand_date not in taken:
             return cand_date
 
     return None
@@ -1,10 +1,43 @@
-import requests
-from datetime import date, datetime, timezone
-from typing import List, Dict, Optional
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Dict, Optional, Tuple
 import sqlite3
 
+from src.lib import http
+
 WEATHER_URL = "https://api.open-meteo.com/v1/forecast"
 
+# Cached forecasts older than this are refetched (data-model.md: 6 hours).
+FORECAST_MAX_AGE = timedelta(hours=float(os.environ.get("TODO_FORECAST_MAX_AGE_HOURS", "6")))
+
+# Cached days between two missing runs that are refetched rather than paying
+# for a second request.
+MERGE_GAP_DAYS = 3
+
+# Answered from the forecasts primary key (location_id, date); only rows fetched
+# after the cutoff count as cached.
+CACHED_FORECASTS_SQL = (
+    "SELECT date, precipitation_prob, temp_min, temp_max FROM forecasts "
+    "WHERE location_id = ? AND date BETWEEN ? AND ? AND fetched_at >= ? ORDER BY date ASC"
+)
+
+UPSERT_FORECAST_SQL = """
+    INSERT INTO forecasts (location_id, date, precipitation_prob, temp_min, temp_max, fetched_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (location_id, date) DO UPDATE SET
+        precipitation_prob = excluded.precipitation_prob,
+        temp_min = excluded.temp_min,
+        temp_max = excluded.temp_max,
+        fetched_at = excluded.fetched_at
+"""
+
+
+def _cutoff(max_age: Optional[timedelta] = None) -> str:
+    if max_age is None:
+        max_age = FORECAST_MAX_AGE
+    # same isoformat as the stored fetched_at values, so they compare as strings
+    return (datetime.now(timezone.utc) - max_age).isoformat()
+
 
 def _rows_to_forecasts(rows):
     out = []
@@ -18,22 +51,91 @@ def _rows_to_forecasts(rows):
     return out
 
  # timezoneという引数名をtz_nameに変更した。ライブラリ側のtimezoneと被るため。
-def fetch_daily_forecast(lat: float, lon: float, start_date: date, end_date: date, tz_name: str = "UTC", conn: Optional[sqlite3.Connection] = None, location_id: Optional[int] = None) -> List[Dict]:
+def fetch_daily_forecast(lat: float, lon: float, start_date: date, end_date: date, tz_name: str = "UTC", conn: Optional[sqlite3.Connection] = None, location_id: Optional[int] = None, max_age: Optional[timedelta] = None, pending: Optional["PendingForecasts"] = None) -> List[Dict]:
     """Fetch daily forecast for range. If `conn` and `location_id` are provided, attempt to read cached forecasts
     from the `forecasts` table; otherwise call the external API and persist results when possible.
+
+    Cached rows fetched more than `max_age` ago (default FORECAST_MAX_AGE) are ignored
+    and overwritten by the next fetch, so each day has exactly one current row.
+    Only the days that are missing or stale are requested from the API (see
+    missing_ranges), and the result is stitched together with the cached days.
+
+    With `pending`, nothing is written: fetched rows and cache counters are
+    collected there and written later by `pending.write()`, typically inside a
+    transaction once the network requests are done. `location_id` may then be
+    None for a location that is not stored yet.
     """
-    # If DB caching available, try to retrieve cached rows
-    if conn is not None and location_id is not None:
+    if conn is None or (location_id is None and pending is None):
+        return _request_daily(lat, lon, start_date, end_date, tz_name)
+
+    by_date = {}
+    if location_id is not None:
         cur = conn.cursor()
-        cur.execute(
-            "SELECT date, precipitation_prob, temp_min, temp_max FROM forecasts WHERE location_id = ? AND date BETWEEN ? AND ? ORDER BY date ASC",
-            (location_id, start_date.isoformat(), end_date.isoformat()),
-        )
-        rows = cur.fetchall()
-        if rows and len(rows) >= ((end_date - start_date).days + 1):
-            return _rows_to_forecasts(rows)
-
-    # Fallback to API request
+        cur.execute(CACHED_FORECASTS_SQL, (location_id, start_date.isoformat(), end_date.isoformat(), _cutoff(max_age)))
+        by_date = {f["date"]: f for f in _rows_to_forecasts(cur.fetchall())}
+
+    hits = len(by_date)
+    misses = (end_date - start_date).days + 1 - hits
+    for first, last in missing_ranges(start_date, end_date, by_date):
+        fetched = _request_daily(lat, lon, first, last, tz_name)
+        if pending is not None:
+            pending.rows.extend(fetched)
+        else:
+            store_forecasts(conn, location_id, fetched)
+        for f in fetched:
+            by_date[f["date"]] = f
+    if pending is not None:
+        pending.hits += hits
+        pending.misses += misses
+    else:
+        record_cache_use(conn, hits, misses)
+
+    return [by_date[d] for d in sorted(by_date)]
+
+
+class PendingForecasts:
+    """Forecast rows and cache counters collected by fetch_daily_forecast(pending=...)."""
+
+    def __init__(self):
+        self.rows: List[Dict] = []
+        self.hits = 0
+        self.misses = 0
+
+    def write(self, conn: sqlite3.Connection, location_id: int) -> None:
+        store_forecasts(conn, location_id, self.rows)
+        if self.hits or self.misses:
+            record_cache_use(conn, self.hits, self.misses)
+
+
+def record_cache_use(conn: sqlite3.Connection, hits: int, misses: int) -> None:
+    """Add to the per-day forecast cache counters reported by `todo db stats`."""
+    conn.execute(
+        "INSERT INTO cache_stats (name, hits, misses) VALUES ('forecasts', ?, ?) "
+        "ON CONFLICT (name) DO UPDATE SET hits = hits + excluded.hits, misses = misses + excluded.misses",
+        (hits, max(misses, 0)),
+    )
+    conn.commit()
+
+
+def missing_ranges(start_date: date, end_date: date, cached: Dict[str, Dict], merge_gap: int = MERGE_GAP_DAYS) -> List[Tuple[date, date]]:
+    """Return the (first, last) date ranges in start_date..end_date not present in `cached`.
+
+    Runs separated by at most `merge_gap` cached days are merged so they can be
+    fetched in one request.
+    """
+    ranges: List[Tuple[date, date]] = []
+    day = start_date
+    while day <= end_date:
+        if day.isoformat() not in cached:
+            if ranges and (day - ranges[-1][1]).days <= merge_gap + 1:
+                ranges[-1] = (ranges[-1][0], day)
+            else:
+                ranges.append((day, day))
+        day += timedelta(days=1)
+    return ranges
+
+
+def _request_daily(lat: float, lon: float, start_date: date, end_date: date, tz_name: str) -> List[Dict]:
     params = {
         "latitude": lat,
         "longitude": lon,
@@ -42,7 +144,7 @@ def fetch_daily_forecast(lat: float, lon: float, start_date: date, end_date: dat
         "end_date": end_date.isoformat(),
         "timezone": tz_name,
     }
-    r = requests.get(WEATHER_URL, params=params, timeout=10)
+    r = http.session().get(WEATHER_URL, params=params, timeout=10)
     r.raise_for_status()
     data = r.json()
     daily = data.get("daily", {})
@@ -54,20 +156,39 @@ def fetch_daily_forecast(lat: float, lon: float, start_date: date, end_date: dat
     for i, d in enumerate(dates):
         entry = {
             "date": d,
-            "precipitation_prob": float(prec[i]) if i < len(prec) else None,
-            "temp_min": float(tmin[i]) if i < len(tmin) else None,
-            "temp_max": float(tmax[i]) if i < len(tmax) else None,
+            "precipitation_prob": float(prec[i]) if i < len(prec) and prec[i] is not None else None,
+            "temp_min": float(tmin[i]) if i < len(tmin) and tmin[i] is not None else None,
+            "temp_max": float(tmax[i]) if i < len(tmax) and tmax[i] is not None else None,
         }
         out.append(entry)
+    return out
 
-        # persist to DB cache if possible
-        if conn is not None and location_id is not None:
-            cur = conn.cursor()
-            cur.execute(
-                "INSERT INTO forecasts (location_id, date, precipitation_prob, temp_min, temp_max, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
-                (location_id, d, entry["precipitation_prob"], entry["temp_min"], entry["temp_max"], datetime.now(timezone.utc).isoformat()),
-            )
-    if conn is not None and location_id is not None:
-        conn.commit()
 
-    return out
+def store_forecasts(conn: sqlite3.Connection, location_id: int, forecasts: List[Dict]) -> None:
+    if not forecasts:
+        return
+    fetched_at = datetime.now(timezone.utc).isoformat()
+    conn.executemany(
+        UPSERT_FORECAST_SQL,
+        [
+            (location_id, f["date"], f.get("precipitation_prob"), f.get("temp_min"), f.get("temp_max"), fetched_at)
+            for f in forecasts
+        ],
+    )
+    conn.commit()
+
+
+def prune_forecasts(conn: sqlite3.Connection, max_age: Optional[timedelta] = None, today: Optional[date] = None) -> int:
+    """Delete cached forecasts that can no longer be served.
+
+    That is rows older than `max_age` (default FORECAST_MAX_AGE) and rows for days
+    before `today`. Returns the number of rows removed.
+    """
+    if today is None:
+        today = date.today()
+    cur = conn.execute(
+        "DELETE FROM forecasts WHERE fetched_at < ? OR date < ?",
+        (_cutoff(max_age), today.isoformat()),
+    )
+    conn.commit()
+    return cur.rowcount
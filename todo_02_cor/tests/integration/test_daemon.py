@@ -0,0 +1,123 @@
+import socket
+import sqlite3
+import threading
+
+import pytest
+from typer.testing import CliRunner
+
+from src.cli import daemon, main as cli_main
+from src.db import db
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="daemon needs Unix sockets")
+
+
+@pytest.fixture
+def running_daemon(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "todo.db"))
+    path = str(tmp_path / "todo.sock")
+    server = daemon.bind(path)
+    thread = threading.Thread(target=daemon.serve, args=(path, server), daemon=True)
+    thread.start()
+    yield path
+    server.shutdown(socket.SHUT_RDWR)
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+
+def test_forwarded_command_matches_in_process(running_daemon):
+    conn = db.connect(db.DB_PATH)
+    loc_id = db.ensure_location(conn, {"name": "札幌", "latitude": 43.06, "longitude": 141.34, "timezone": "Asia/Tokyo"})
+    db.insert_task(conn, "常駐テスト", "medium", loc_id, "2025-12-05T10:00:00+09:00", "2025-12-04")
+
+    code, output = daemon.forward(["todo", "list"], path=running_daemon)
+    local = CliRunner().invoke(cli_main.app, ["todo", "list"])
+    assert code == 0
+    assert output == local.output
+    assert "常駐テスト" in output
+
+    code, output = daemon.forward(["todo", "show", "999"], path=running_daemon)
+    assert code == 1
+    assert "タスクが見つかりません" in output
+
+
+def test_second_daemon_on_same_socket_is_refused(running_daemon):
+    with pytest.raises(RuntimeError):
+        daemon.bind(running_daemon)
+
+
+def test_forward_falls_back_without_daemon(tmp_path):
+    path = tmp_path / "todo.sock"
+    assert daemon.forward(["todo", "list"], path=str(path)) is None
+
+    # a socket file nobody listens on (daemon killed without cleanup)
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+    assert daemon.forward(["todo", "list"], path=str(path)) is None
+    # and a new daemon can take over the stale path
+    daemon.bind(str(path)).close()
+
+
+def test_entry_point_does_not_forward_serve_or_when_disabled(monkeypatch):
+    monkeypatch.setattr(daemon, "forward", lambda *a, **k: pytest.fail("should not forward"))
+    assert daemon.main_forwarding(["todo", "serve"], "todo") is None
+    monkeypatch.setenv("TODO_NO_DAEMON", "1")
+    assert daemon.main_forwarding(["todo", "list"], "todo") is None
+
+
+def _silent_server(path, close):
+    """A listener that reads the request and then closes (or just holds) the connection."""
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen()
+
+    def run():
+        conn, _ = server.accept()
+        conn.makefile("rb").readline()
+        if close:
+            conn.close()
+        else:
+            threading.Event().wait(2)
+
+    threading.Thread(target=run, daemon=True).start()
+    return server
+
+
+@pytest.mark.parametrize("close", [True, False], ids=["closed", "timeout"])
+def test_daemon_without_reply_reports_error(tmp_path, monkeypatch, capsys, close):
+    path = str(tmp_path / "todo.sock")
+    monkeypatch.setenv("TODO_SOCKET", path)
+    monkeypatch.delenv("TODO_NO_DAEMON", raising=False)
+    monkeypatch.setattr(daemon, "REPLY_TIMEOUT", 0.2)
+    monkeypatch.setattr(daemon, "run_command", lambda *a, **k: pytest.fail("must not re-run in-process"))
+    server = _silent_server(path, close)
+    try:
+        assert daemon.main_forwarding(["todo", "add", "--title", "x"], "todo") == 1
+    finally:
+        server.close()
+    assert "デーモンとの通信に失敗しました" in capsys.readouterr().err
+
+
+def test_failed_command_does_not_leave_a_transaction_open(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "todo.db"))
+    conn = db.get_connection()
+    loc_id = db.ensure_location(conn, {"name": "札幌", "latitude": 43.06, "longitude": 141.34, "timezone": "Asia/Tokyo"})
+    task_id = db.insert_task(conn, "失敗", "medium", loc_id, "2025-12-05T10:00:00+09:00", None)
+
+    def failing_delete(conn, task_id):
+        conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(db, "delete_task", failing_delete)
+    try:
+        code, output = daemon.run_command(["todo", "update", str(task_id), "--complete"])
+        assert code == 1 and "boom" in output
+        assert not conn.in_transaction
+        # other processes can write again, and the half-done delete was undone
+        other = sqlite3.connect(db.DB_PATH, timeout=0)
+        other.execute("BEGIN IMMEDIATE")
+        other.rollback()
+        assert other.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 1
+        other.close()
+    finally:
+        db.close_connections()
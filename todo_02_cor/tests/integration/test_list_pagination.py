@@ -0,0 +1,84 @@
+import datetime
+from typer.testing import CliRunner
+
+from src.cli import main as cli_main
+from src.db import db
+
+
+def _seed(conn, n):
+    sapporo = db.ensure_location(conn, {"name": "札幌", "latitude": 43.06, "longitude": 141.34, "timezone": "Asia/Tokyo"})
+    tokyo = db.ensure_location(conn, {"name": "東京", "latitude": 35.68, "longitude": 139.76, "timezone": "Asia/Tokyo"})
+    base = datetime.datetime(2025, 12, 1, 9, 0, tzinfo=datetime.timezone(datetime.timedelta(hours=9)))
+    for i in range(n):
+        # every due date appears twice, so pages must break ties on id
+        due = base + datetime.timedelta(days=i // 2)
+        db.insert_task(conn, f"タスク{i}", "medium", sapporo if i % 3 else tokyo, due, None)
+    db.insert_task(conn, "期限なし", "low", sapporo, None, None)
+
+
+def test_keyset_pages_cover_every_row_once(tmp_path):
+    conn = db.connect(str(tmp_path / "todo.db"))
+    _seed(conn, 25)
+    expected = [r["id"] for r in db.list_tasks(conn)]
+
+    for sort in ("date", "priority", "created"):
+        seen, after = [], None
+        while True:
+            page = list(db.iter_tasks(conn, sort, limit=4, after=after))
+            if not page:
+                break
+            seen.extend(r["id"] for r in page)
+            after = db.encode_cursor(page[-1], sort)
+        assert sorted(seen) == sorted(expected)
+        assert len(seen) == len(set(seen))
+    assert expected[0] == max(expected)  # NULL due date sorts first
+
+
+def test_filters_run_in_sql(tmp_path):
+    conn = db.connect(str(tmp_path / "todo.db"))
+    _seed(conn, 12)
+    tokyo = [r["title"] for r in db.iter_tasks(conn, location="東京")]
+    assert tokyo == ["タスク0", "タスク3", "タスク6", "タスク9"]
+    # LIKE wildcards in the user's input match literally
+    assert list(db.iter_tasks(conn, location="_")) == []
+    assert list(db.iter_tasks(conn, location="%")) == []
+
+    window = list(db.iter_tasks(conn, date_from=datetime.date(2025, 12, 2), date_to=datetime.date(2025, 12, 3)))
+    assert [r["title"] for r in window] == ["タスク2", "タスク3", "タスク4", "タスク5"]
+    assert list(db.iter_tasks(conn, completed=True)) == []
+
+
+def test_list_pages_sort_keys_from_index(tmp_path):
+    conn = db.connect(str(tmp_path / "todo.db"))
+    for sort, col in db.SORT_COLUMNS.items():
+        plan = [r["detail"] for r in conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT * FROM tasks WHERE ({col}, id) > (?, ?) ORDER BY {col} ASC, id ASC LIMIT 50", ("x", 1)
+        )]
+        assert not any("TEMP B-TREE" in step for step in plan), (sort, plan)
+        assert any("USING INDEX" in step for step in plan), (sort, plan)
+
+
+def test_list_command_prints_next_cursor(tmp_path):
+    db_file = str(tmp_path / "todo.db")
+    db.DB_PATH = db_file
+    conn = db.connect(db_file)
+    _seed(conn, 6)
+
+    runner = CliRunner()
+    res = runner.invoke(cli_main.app, ["todo", "list", "--limit", "3"])
+    assert res.exit_code == 0, res.output
+    lines = res.output.strip().splitlines()
+    assert len(lines) == 4
+    cursor = lines[-1].split("--after ")[1]
+
+    res2 = runner.invoke(cli_main.app, ["todo", "list", "--limit", "3", "--after", cursor])
+    assert res2.exit_code == 0, res2.output
+    assert "タスク2" in res2.output and "タスク4" in res2.output
+    cursor = res2.output.strip().splitlines()[-1].split("--after ")[1]
+
+    res3 = runner.invoke(cli_main.app, ["todo", "list", "--limit", "3", "--after", cursor])
+    lines3 = res3.output.strip().splitlines()
+    assert len(lines3) == 1 and "タスク5" in lines3[0]
+
+    bad = runner.invoke(cli_main.app, ["todo", "list", "--after", "not-a-cursor"])
+    assert bad.exit_code == 1
@@ -0,0 +1,104 @@
+import sqlite3
+
+import pytest
+
+from src.db import db
+
+
+def test_connect_applies_tuning_pragmas(tmp_path):
+    conn = db.connect(str(tmp_path / "todo.db"))
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -16000
+
+
+def test_pragmas_are_configurable_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("TODO_SQLITE_SYNCHRONOUS", "FULL")
+    monkeypatch.setenv("TODO_SQLITE_JOURNAL_MODE", "")
+    conn = db.connect(str(tmp_path / "todo.db"))
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+    monkeypatch.setenv("TODO_SQLITE_CACHE_SIZE", "1; DROP TABLE tasks")
+    with pytest.raises(ValueError):
+        db.connect(str(tmp_path / "todo.db"))
+
+
+def test_get_connection_is_shared_per_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "a.db"))
+    try:
+        assert db.get_connection() is db.get_connection()
+        assert db.get_connection(str(tmp_path / "b.db")) is not db.get_connection()
+    finally:
+        db.close_connections()
+
+
+def _titles(path):
+    other = sqlite3.connect(path)
+    try:
+        return [r[0] for r in other.execute("SELECT title FROM tasks")]
+    finally:
+        other.close()
+
+
+def test_transaction_defers_helper_commits(tmp_path):
+    path = str(tmp_path / "todo.db")
+    conn = db.connect(path)
+    with db.transaction(conn):
+        loc_id = db.ensure_location(conn, {"name": "札幌", "latitude": 43.06, "longitude": 141.34, "timezone": "Asia/Tokyo"})
+        db.insert_task(conn, "一括", "medium", loc_id, "2025-12-05", "2025-12-04")
+        # helpers committed nothing yet: another connection cannot see the task
+        assert _titles(path) == []
+    assert _titles(path) == ["一括"]
+
+
+def test_transaction_rolls_back_on_error(tmp_path):
+    path = str(tmp_path / "todo.db")
+    conn = db.connect(path)
+    with pytest.raises(RuntimeError):
+        with db.transaction(conn):
+            db.insert_task(conn, "失敗", "medium", 1, "2025-12-05", None)
+            raise RuntimeError("boom")
+    assert _titles(path) == []
+    assert db.list_tasks(conn) == []
+
+
+def test_add_fetches_forecasts_before_its_transaction(tmp_path, monkeypatch):
+    from typer.testing import CliRunner
+
+    from src.cli import main as cli_main
+    from src.services import geocode, weather
+
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "todo.db"))
+    monkeypatch.setattr(geocode, "geocode_location", lambda name: {"name": name, "latitude": 35.0, "longitude": 139.0, "timezone": "Asia/Tokyo"})
+    in_tx = []
+    commits = []
+
+    def fake_request(lat, lon, start, end, tz_name="UTC"):
+        in_tx.append(db.get_connection().in_transaction)
+        return [{"date": start.isoformat(), "precipitation_prob": 10.0, "temp_min": 0.0, "temp_max": 5.0}]
+
+    monkeypatch.setattr(weather, "_request_daily", fake_request)
+    db.get_connection()  # migrations commit on their own
+    commit = db.Connection.commit
+
+    def counting_commit(self):
+        if not self._tx_depth:
+            commits.append(self.in_transaction)
+        commit(self)
+
+    monkeypatch.setattr(db.Connection, "commit", counting_commit)
+    try:
+        res = CliRunner().invoke(cli_main.app, ["todo", "add", "--title", "a", "--location", "東京", "--due", "明日"])
+        assert res.exit_code == 0, res.output
+        # no write lock while waiting on the API ...
+        assert in_tx and not any(in_tx)
+        # ... and location, forecasts, counters and task land in a single commit
+        assert commits.count(True) == 1
+        other = sqlite3.connect(str(tmp_path / "todo.db"))
+        assert other.execute("SELECT COUNT(*) FROM forecasts").fetchone()[0] == 1
+        other.close()
+        assert _titles(str(tmp_path / "todo.db")) == ["a"]
+    finally:
+        db.close_connections()
@@ -0,0 +1,84 @@
+import datetime
+
+from typer.testing import CliRunner
+
+from src.cli import main as cli_main
+from src.db import db, maintenance
+from src.services import weather
+
+
+def _fill(conn, n):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    loc_id = db.ensure_location(conn, {"name": "札幌", "latitude": 43.06, "longitude": 141.34, "timezone": "Asia/Tokyo"})
+    with db.transaction(conn):
+        for i in range(n):
+            db.insert_task(conn, "x" * 200 + str(i), "medium", loc_id, now, None)
+    return loc_id
+
+
+def test_stats_reports_rows_pages_and_hit_ratio(tmp_path):
+    conn = db.connect(str(tmp_path / "todo.db"))
+    _fill(conn, 3)
+    weather.record_cache_use(conn, 3, 1)
+    weather.record_cache_use(conn, 5, 1)
+
+    s = maintenance.stats(conn)
+    assert s["tables"]["tasks"]["rows"] == 3
+    assert s["tables"]["forecasts"]["rows"] == 0
+    assert s["tables"]["tasks"]["pages"] >= 1
+    assert s["auto_vacuum"] == "incremental"
+    assert s["forecast_cache"] == {"hits": 8, "misses": 2, "hit_ratio": 0.8}
+
+
+def test_incremental_vacuum_returns_free_pages(tmp_path):
+    conn = db.connect(str(tmp_path / "todo.db"))
+    _fill(conn, 2000)
+    conn.execute("DELETE FROM tasks")
+    conn.commit()
+    assert maintenance.stats(conn)["freelist_count"] > 0
+
+    result = maintenance.vacuum(conn, pages=5)
+    assert not result["full"]
+    assert result["freed_pages"] == 5
+    result = maintenance.vacuum(conn)
+    assert result["free_after"] == 0
+
+
+def test_vacuum_converts_legacy_database(tmp_path, monkeypatch):
+    monkeypatch.setenv("TODO_SQLITE_AUTO_VACUUM", "")
+    conn = db.connect(str(tmp_path / "todo.db"))
+    assert maintenance.stats(conn)["auto_vacuum"] == "none"
+
+    assert maintenance.vacuum(conn)["full"]
+    assert maintenance.stats(conn)["auto_vacuum"] == "incremental"
+    assert not maintenance.vacuum(conn)["full"]
+
+
+def test_analyze_collects_planner_statistics(tmp_path):
+    conn = db.connect(str(tmp_path / "todo.db"))
+    _fill(conn, 10)
+    maintenance.analyze(conn)
+    tables = {r[0] for r in conn.execute("SELECT tbl FROM sqlite_stat1")}
+    assert "tasks" in tables
+
+
+def test_db_command_group(tmp_path):
+    db_file = str(tmp_path / "todo.db")
+    db.DB_PATH = db_file
+    conn = db.connect(db_file)
+    _fill(conn, 2)
+    yesterday = (datetime.date.today() - datetime.timedelta(days=1)).isoformat()
+    weather.store_forecasts(conn, 1, [{"date": yesterday}])
+
+    runner = CliRunner()
+    res = runner.invoke(cli_main.app, ["todo", "db", "stats"])
+    assert res.exit_code == 0, res.output
+    assert "tasks: 2 行" in res.output
+    assert "ヒット率 -" in res.output
+
+    res = runner.invoke(cli_main.app, ["todo", "db", "prune"])
+    assert res.exit_code == 0, res.output
+    assert "1 件削除" in res.output
+    for command in ("analyze", "vacuum"):
+        res = runner.invoke(cli_main.app, ["todo", "db", command])
+        assert res.exit_code == 0, res.output
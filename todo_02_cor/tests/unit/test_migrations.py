@@ -0,0 +1,55 @@
+import sqlite3
+
+import pytest
+
+from src.db import db
+
+
+def test_fresh_database_is_migrated_to_latest(tmp_path):
+    conn = db.connect(str(tmp_path / "fresh.db"))
+    assert db.schema_version(conn) == db.SCHEMA_VERSION
+    tables = {r["name"] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {"locations", "tasks", "forecasts"} <= tables
+    indexes = {r["name"] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "idx_tasks_location_candidate_day" in indexes
+
+
+def test_connect_skips_ddl_when_up_to_date(tmp_path):
+    path = str(tmp_path / "todo.db")
+    db.connect(path).close()
+
+    statements = []
+    conn = sqlite3.connect(path)
+    conn.set_trace_callback(statements.append)
+    db.ensure_migrations(conn)
+    assert statements == ["PRAGMA user_version"]
+
+
+def test_unversioned_database_is_adopted(tmp_path):
+    # a database created before migrations were versioned: tables but user_version 0
+    path = str(tmp_path / "legacy.db")
+    legacy = sqlite3.connect(path)
+    for statement in db.MIGRATIONS[0]:
+        legacy.execute(statement)
+    legacy.execute(
+        "INSERT INTO tasks (title, completed, priority, location_id, due_date) VALUES ('既存', 0, 'medium', 1, '2025-12-01')"
+    )
+    legacy.commit()
+    legacy.close()
+
+    conn = db.connect(path)
+    assert db.schema_version(conn) == db.SCHEMA_VERSION
+    assert [r["title"] for r in db.list_tasks(conn)] == ["既存"]
+
+
+def test_failed_migration_rolls_back(tmp_path, monkeypatch):
+    path = str(tmp_path / "todo.db")
+    conn = sqlite3.connect(path)
+    broken = db.MIGRATIONS + [("CREATE TABLE extra (id INTEGER)", "THIS IS NOT SQL")]
+    monkeypatch.setattr(db, "MIGRATIONS", broken)
+    monkeypatch.setattr(db, "SCHEMA_VERSION", len(broken))
+    with pytest.raises(sqlite3.OperationalError):
+        db.ensure_migrations(conn)
+    assert db.schema_version(conn) == 0
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "extra" not in tables
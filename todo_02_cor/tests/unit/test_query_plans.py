@@ -0,0 +1,32 @@
+from src.db import db
+from src.services import scheduler, weather
+from src.cli.commands import calendar
+
+
+def _plan(conn, sql, params):
+    return [row["detail"] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+
+def _assert_indexed(plan, index_names):
+    assert not [step for step in plan if step.startswith("SCAN")], plan
+    for name in index_names:
+        assert any(f"INDEX {name}" in step for step in plan), plan
+
+
+def test_scheduler_occupancy_check_uses_expression_index():
+    conn = db.connect(":memory:")
+    plan = _plan(conn, scheduler.OCCUPIED_DAYS_SQL, (1, "2025-12-01", "2025-12-14"))
+    _assert_indexed(plan, ["idx_tasks_location_candidate_day"])
+
+
+def test_forecast_cache_read_uses_primary_key():
+    conn = db.connect(":memory:")
+    plan = _plan(conn, weather.CACHED_FORECASTS_SQL, (1, "2025-12-01", "2025-12-14", "2025-12-01T00:00:00+00:00"))
+    _assert_indexed(plan, [])
+    assert any("USING PRIMARY KEY (location_id=? AND date>? AND date<?)" in step for step in plan), plan
+
+
+def test_calendar_month_query_uses_both_day_indexes():
+    conn = db.connect(":memory:")
+    plan = _plan(conn, calendar.MONTH_TASKS_SQL, ("2025-12-01", "2025-12-31", "2025-12-01", "2025-12-31"))
+    _assert_indexed(plan, ["idx_tasks_candidate_day", "idx_tasks_due_day"])
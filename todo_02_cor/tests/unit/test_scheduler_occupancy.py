@@ -0,0 +1,48 @@
+import datetime
+
+from src.db import db
+from src.services import scheduler, weather
+
+
+def _setup(monkeypatch, days):
+    conn = db.connect(":memory:")
+    loc_id = db.ensure_location(conn, {"name": "札幌", "latitude": 43.06, "longitude": 141.34, "timezone": "Asia/Tokyo"})
+    today = datetime.date.today()
+    dates = [(today + datetime.timedelta(days=i)).isoformat() for i in range(days)]
+    forecasts = [{"date": d, "precipitation_prob": 10.0} for d in dates]
+    monkeypatch.setattr(weather, "fetch_daily_forecast", lambda *args, **kwargs: forecasts)
+    return conn, loc_id, dates
+
+
+def _task_queries(conn, call):
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        result = call()
+    finally:
+        conn.set_trace_callback(None)
+    return result, [s for s in statements if "FROM tasks" in s]
+
+
+def test_occupancy_is_one_query_regardless_of_window(monkeypatch):
+    conn, loc_id, dates = _setup(monkeypatch, 14)
+    # every day but the last is taken, so a per-day loop would issue 14 queries
+    for d in dates[:-1]:
+        db.insert_task(conn, "既存", "medium", loc_id, datetime.datetime.now(datetime.timezone.utc), d)
+
+    due_dt = datetime.datetime.combine(datetime.date.fromisoformat(dates[-1]), datetime.time())
+    chosen, queries = _task_queries(conn, lambda: scheduler.select_candidate_for_location(conn, loc_id, due_dt))
+    assert chosen == dates[-1]
+    assert len(queries) == 1
+
+
+def test_occupied_days_ignores_other_locations_and_time_of_day(monkeypatch):
+    conn, loc_id, dates = _setup(monkeypatch, 3)
+    other = db.ensure_location(conn, {"name": "東京", "latitude": 35.68, "longitude": 139.76, "timezone": "Asia/Tokyo"})
+    now = datetime.datetime.now(datetime.timezone.utc)
+    db.insert_task(conn, "同じ場所", "medium", loc_id, now, dates[0] + "T09:00:00")
+    db.insert_task(conn, "別の場所", "medium", other, now, dates[1])
+
+    forecasts = [{"date": d} for d in dates]
+    assert scheduler.occupied_days(conn, loc_id, forecasts) == {dates[0]}
+    assert scheduler.occupied_days(conn, loc_id, []) == set()
@@ -0,0 +1,88 @@
+import datetime
+
+from typer.testing import CliRunner
+
+from src.cli import main as cli_main
+from src.db import db
+
+
+def _setup(conn):
+    sapporo = db.ensure_location(conn, {"name": "札幌市", "latitude": 43.06, "longitude": 141.34, "timezone": "Asia/Tokyo"})
+    tokyo = db.ensure_location(conn, {"name": "東京都", "latitude": 35.68, "longitude": 139.76, "timezone": "Asia/Tokyo"})
+    now = datetime.datetime.now(datetime.timezone.utc)
+    ids = {
+        "shopping": db.insert_task(conn, "買い物リストを作る", "medium", tokyo, now, None),
+        "trip": db.insert_task(conn, "札幌市で買い物", "medium", sapporo, now, None),
+        "milk": db.insert_task(conn, "Buy milk 100%", "low", tokyo, now, None),
+    }
+    return ids, sapporo, tokyo
+
+
+def _ids(rows):
+    return [r["id"] for r in rows]
+
+
+def test_search_matches_titles_and_locations(tmp_path):
+    conn = db.connect(str(tmp_path / "todo.db"))
+    assert db.has_task_search(conn)
+    ids, _, _ = _setup(conn)
+
+    assert sorted(_ids(db.search_tasks(conn, "買い物"))) == sorted([ids["shopping"], ids["trip"]])
+    assert _ids(db.search_tasks(conn, "MILK")) == [ids["milk"]]
+    # title hits rank above location-only hits
+    assert _ids(db.search_tasks(conn, "札幌市")) == [ids["trip"]]
+    assert _ids(db.search_tasks(conn, "東京都")) == [ids["shopping"], ids["milk"]]
+    # every term must match; short terms are filtered with LIKE
+    assert _ids(db.search_tasks(conn, "買い物 札幌")) == [ids["trip"]]
+    assert _ids(db.search_tasks(conn, "0%")) == [ids["milk"]]
+    assert db.search_tasks(conn, '"買い物" OR') == []
+    assert len(db.search_tasks(conn, "買い物", limit=1)) == 1
+
+
+def test_triggers_keep_index_in_sync(tmp_path):
+    conn = db.connect(str(tmp_path / "todo.db"))
+    ids, sapporo, _ = _setup(conn)
+
+    db.update_task(conn, ids["milk"], {"title": "牛乳を買う", "location_id": sapporo})
+    assert _ids(db.search_tasks(conn, "牛乳を")) == [ids["milk"]]
+    assert db.search_tasks(conn, "milk") == []
+    assert ids["milk"] in _ids(db.search_tasks(conn, "札幌市"))
+
+    conn.execute("UPDATE locations SET name = '旭川市' WHERE id = ?", (sapporo,))
+    assert _ids(db.search_tasks(conn, "札幌市")) == [ids["trip"]]  # title still matches
+    assert sorted(_ids(db.search_tasks(conn, "旭川市"))) == sorted([ids["trip"], ids["milk"]])
+
+    db.delete_task(conn, ids["trip"])
+    assert _ids(db.search_tasks(conn, "旭川市")) == [ids["milk"]]
+
+
+def test_existing_tasks_are_indexed_by_migration(tmp_path, monkeypatch):
+    path = str(tmp_path / "todo.db")
+    monkeypatch.setattr(db, "MIGRATIONS", db.MIGRATIONS[:6])
+    monkeypatch.setattr(db, "SCHEMA_VERSION", 6)
+    conn = db.connect(path)
+    loc_id = db.ensure_location(conn, {"name": "札幌市", "latitude": 43.06, "longitude": 141.34, "timezone": "Asia/Tokyo"})
+    task_id = db.insert_task(conn, "移行前のタスク", "medium", loc_id, None, None)
+    conn.close()
+
+    monkeypatch.undo()
+    conn = db.connect(path)
+    assert _ids(db.search_tasks(conn, "移行前")) == [task_id]
+
+
+def test_search_command(tmp_path):
+    db_file = str(tmp_path / "todo.db")
+    db.DB_PATH = db_file
+    _setup(db.connect(db_file))
+
+    runner = CliRunner()
+    res = runner.invoke(cli_main.app, ["todo", "search", "買い物", "--limit", "5"])
+    assert res.exit_code == 0, res.output
+    assert "札幌市で買い物" in res.output and "場所=東京都" in res.output
+
+    res = runner.invoke(cli_main.app, ["todo", "search", "存在しない語"])
+    assert res.exit_code == 0
+    assert "一致するタスクはありません" in res.output
+
+    res = runner.invoke(cli_main.app, ["todo", "search", " "])
+    assert res.exit_code == 1
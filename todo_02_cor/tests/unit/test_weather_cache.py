@@ -0,0 +1,153 @@
+import datetime
+import sqlite3
+
+from src.db import db
+from src.lib import http
+from src.services import scheduler, weather
+
+
+class _Response:
+    def __init__(self, params):
+        start = datetime.date.fromisoformat(params["start_date"])
+        end = datetime.date.fromisoformat(params["end_date"])
+        days = [(start + datetime.timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+        self._data = {
+            "daily": {
+                "time": days,
+                "precipitation_probability_mean": [10.0] * len(days),
+                "temperature_2m_min": [0.0] * len(days),
+                "temperature_2m_max": [5.0] * len(days),
+            }
+        }
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+def _fake_api(monkeypatch):
+    calls = []
+
+    class _Session:
+        def get(self, url, params=None, timeout=None):
+            calls.append(params)
+            return _Response(params)
+
+    monkeypatch.setattr(http, "session", _Session)
+    return calls
+
+
+def _setup():
+    conn = db.connect(":memory:")
+    loc_id = db.ensure_location(conn, {"name": "札幌", "latitude": 43.06, "longitude": 141.34, "timezone": "Asia/Tokyo"})
+    return conn, loc_id
+
+
+def _row_count(conn):
+    return conn.execute("SELECT COUNT(*) FROM forecasts").fetchone()[0]
+
+
+def test_refetch_upserts_one_row_per_day(monkeypatch):
+    calls = _fake_api(monkeypatch)
+    conn, loc_id = _setup()
+    start = datetime.date.today()
+    end = start + datetime.timedelta(days=4)
+
+    weather.fetch_daily_forecast(43.06, 141.34, start, end, conn=conn, location_id=loc_id)
+    # everything stale: the second call refetches and overwrites in place
+    weather.fetch_daily_forecast(43.06, 141.34, start, end, conn=conn, location_id=loc_id, max_age=datetime.timedelta(0))
+    assert len(calls) == 2
+    assert _row_count(conn) == 5
+
+    cached = weather.fetch_daily_forecast(43.06, 141.34, start, end, conn=conn, location_id=loc_id)
+    assert len(calls) == 2
+    assert [f["date"] for f in cached] == [(start + datetime.timedelta(days=i)).isoformat() for i in range(5)]
+
+
+def test_stale_rows_are_not_served(monkeypatch):
+    calls = _fake_api(monkeypatch)
+    conn, loc_id = _setup()
+    day = datetime.date.today()
+    old = (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=2)).isoformat()
+    conn.execute(
+        "INSERT INTO forecasts (location_id, date, precipitation_prob, temp_min, temp_max, fetched_at) VALUES (?, ?, 99.0, 0, 0, ?)",
+        (loc_id, day.isoformat(), old),
+    )
+
+    result = weather.fetch_daily_forecast(43.06, 141.34, day, day, conn=conn, location_id=loc_id)
+    assert len(calls) == 1
+    assert result[0]["precipitation_prob"] == 10.0
+    assert _row_count(conn) == 1
+
+
+def test_prune_removes_stale_and_past_days():
+    conn, loc_id = _setup()
+    today = datetime.date.today()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    rows = [
+        (today, now),  # fresh: kept
+        (today + datetime.timedelta(days=1), now - datetime.timedelta(days=1)),  # stale
+        (today - datetime.timedelta(days=1), now),  # in the past
+    ]
+    weather_rows = [(loc_id, d.isoformat(), 0.0, 0.0, 0.0, f.isoformat()) for d, f in rows]
+    conn.executemany(weather.UPSERT_FORECAST_SQL, weather_rows)
+
+    assert weather.prune_forecasts(conn, today=today) == 2
+    assert [r[0] for r in conn.execute("SELECT date FROM forecasts")] == [today.isoformat()]
+
+
+def test_migration_keeps_latest_duplicate(tmp_path, monkeypatch):
+    path = str(tmp_path / "legacy.db")
+    legacy = sqlite3.connect(path)
+    for statement in db.MIGRATIONS[0]:
+        legacy.execute(statement)
+    legacy.executemany(
+        "INSERT INTO forecasts (location_id, date, precipitation_prob, fetched_at) VALUES (1, '2025-12-05', ?, ?)",
+        [(30.0, "2025-12-01T00:00:00+00:00"), (20.0, "2025-12-03T00:00:00+00:00"), (40.0, "2025-12-02T00:00:00+00:00")],
+    )
+    legacy.commit()
+    legacy.close()
+
+    conn = db.connect(path)
+    rows = conn.execute("SELECT precipitation_prob, fetched_at FROM forecasts").fetchall()
+    assert [tuple(r) for r in rows] == [(20.0, "2025-12-03T00:00:00+00:00")]
+
+
+def test_partial_cache_fetches_only_missing_days(monkeypatch):
+    calls = _fake_api(monkeypatch)
+    conn, loc_id = _setup()
+    start = datetime.date.today()
+    weather.fetch_daily_forecast(43.06, 141.34, start, start + datetime.timedelta(days=2), conn=conn, location_id=loc_id)
+
+    end = start + datetime.timedelta(days=6)
+    result = weather.fetch_daily_forecast(43.06, 141.34, start, end, conn=conn, location_id=loc_id)
+    assert calls[-1]["start_date"] == (start + datetime.timedelta(days=3)).isoformat()
+    assert calls[-1]["end_date"] == end.isoformat()
+    assert [f["date"] for f in result] == [(start + datetime.timedelta(days=i)).isoformat() for i in range(7)]
+    assert _row_count(conn) == 7
+
+
+def test_missing_ranges_merges_short_gaps():
+    start = datetime.date(2025, 12, 1)
+    cached = {f"2025-12-{d:02d}": {} for d in (2, 3, 8, 9, 10, 11, 12)}
+    ranges = weather.missing_ranges(start, datetime.date(2025, 12, 14), cached, merge_gap=2)
+    # 12/1 and 12/4-7 are 2 cached days apart: one request; 12/13-14 is 5 away: another
+    assert ranges == [
+        (datetime.date(2025, 12, 1), datetime.date(2025, 12, 7)),
+        (datetime.date(2025, 12, 13), datetime.date(2025, 12, 14)),
+    ]
+    assert weather.missing_ranges(start, start, {"2025-12-01": {}}) == []
+
+
+def test_alternative_date_reads_through_cache(monkeypatch):
+    calls = _fake_api(monkeypatch)
+    conn, loc_id = _setup()
+    today = datetime.date.today()
+    due_dt = datetime.datetime.combine(today + datetime.timedelta(days=2), datetime.time())
+
+    first = scheduler.propose_alternative_date(conn, loc_id, due_dt, max_days=5)
+    second = scheduler.propose_alternative_date(conn, loc_id, due_dt, max_days=5)
+    assert first == second == (today + datetime.timedelta(days=3)).isoformat()
+    assert len(calls) == 1